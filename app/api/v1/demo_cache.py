@@ -1,14 +1,14 @@
 """
 演示 Redis 缓存的 API 路由
-- 详情缓存：优先读取缓存，未命中则回源数据库，并写入缓存
-- 列表缓存：演示读取/写入/清理
+- 详情缓存：优先读取缓存，未命中则回源数据库（防击穿），并写入缓存
+- 列表缓存：按查询参数分键、按标签失效，演示读取/写入/清理
 """
 from typing import Optional, Literal
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
-from app.services.item_service import ItemService
+from app.db.session import AsyncSessionLocal, get_async_db
+from app.services.item_service import AsyncItemService
 from app.services.cache_service import cache_service
 from app.schemas.item import ItemResponse
 
@@ -16,32 +16,35 @@ router = APIRouter()
 
 
 @router.get("/item/{item_id}", response_model=ItemResponse)
-async def get_item_with_cache(item_id: int, db: Session = Depends(get_db)):
+async def get_item_with_cache(item_id: int):
     """
     优先读取 Item 详情缓存，未命中则查询数据库并写入缓存
+    热点 Item 的缓存过期时，并发请求只有一个回源，其余请求等待其结果或继续使用旧值
     """
-    cached = await cache_service.get_item_cache(item_id)
-    if cached:
-        return ItemResponse.model_validate(cached)
 
-    item = ItemService.get(db, item_id)
-    if not item:
-        raise HTTPException(status_code=404, detail="Item not found")
+    async def load():
+        # 回源可能被其他请求合并等待，并在本请求结束后继续执行，不能使用请求的会话
+        async with AsyncSessionLocal() as db:
+            item = await AsyncItemService.get(db, item_id)
+            if item is None:
+                return None
+            return ItemResponse.model_validate(item).model_dump(mode="json")
 
-    data = ItemResponse.model_validate(item).model_dump()
-    await cache_service.set_item_cache(item_id, data, expire_seconds=300)
+    data = await cache_service.get_item_or_load(item_id, load, expire_seconds=300)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Item not found")
     return ItemResponse.model_validate(data)
 
 
 @router.post("/item/{item_id}/cache")
-async def set_item_cache(item_id: int, db: Session = Depends(get_db)):
+async def set_item_cache(item_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     主动写入 Item 详情缓存（从数据库读取并写入缓存）
     """
-    item = ItemService.get(db, item_id)
+    item = await AsyncItemService.get(db, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    data = ItemResponse.model_validate(item).model_dump()
+    data = ItemResponse.model_validate(item).model_dump(mode="json")
     await cache_service.set_item_cache(item_id, data, expire_seconds=300)
     return {"success": True, "message": "Item 缓存已写入"}
 
@@ -62,44 +65,39 @@ async def get_items_with_cache(
     status: Optional[str] = None,
     is_active: Optional[bool] = None,
     order: Literal["asc", "desc"] = Query("desc", description="排序方式，asc/desc"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     读取 Item 列表缓存，如果未命中则回源数据库，并写入缓存
-    注意：为了演示，列表缓存 key 固定为所有列表的一个缓存，实际项目应按查询条件维度拆分 key
+    缓存按查询参数分键，Item 写操作提交后只使受影响条件（status / is_active）的列表失效
     """
-    cached_list = await cache_service.get_item_list_cache()
-    if cached_list:
+    query = {"skip": skip, "limit": limit, "status": status, "is_active": is_active, "order": order}
+    cached_list, versions = await cache_service.get_item_list_cache(query)
+    if cached_list is not None:
         return {"from_cache": True, "data": cached_list}
 
-    items = ItemService.get_multi_filtered(
-        db,
-        skip=skip,
-        limit=limit,
-        status=status,
-        is_active=is_active,
-        order=order,
-    )
-    data = [ItemResponse.model_validate(item).model_dump() for item in items]
-    await cache_service.set_item_list_cache(data, expire_seconds=60)
+    items = await AsyncItemService.get_multi_filtered(db, **query)
+    data = [ItemResponse.model_validate(item).model_dump(mode="json") for item in items]
+    await cache_service.set_item_list_cache(query, data, versions, expire_seconds=60)
     return {"from_cache": False, "data": data}
 
 
 @router.post("/items/cache")
-async def set_items_cache(db: Session = Depends(get_db)):
+async def set_items_cache(db: AsyncSession = Depends(get_async_db)):
     """
     主动写入一个 Item 列表缓存（示例：读取前 10 条 active=true 的数据）
     """
-    items = ItemService.get_multi_filtered(db, skip=0, limit=10, status="active", is_active=True, order="desc")
-    data = [ItemResponse.model_validate(item).model_dump() for item in items]
-    await cache_service.set_item_list_cache(data, expire_seconds=60)
+    query = {"skip": 0, "limit": 10, "status": "active", "is_active": True, "order": "desc"}
+    items = await AsyncItemService.get_multi_filtered(db, **query)
+    data = [ItemResponse.model_validate(item).model_dump(mode="json") for item in items]
+    await cache_service.set_item_list_cache(query, data, expire_seconds=60)
     return {"success": True, "message": "Item 列表缓存已写入", "count": len(data)}
 
 
 @router.delete("/items/cache")
 async def delete_items_cache():
     """
-    删除 Item 列表缓存
+    使全部 Item 列表缓存失效
     """
     await cache_service.delete_item_list_cache()
-    return {"success": True}
\ No newline at end of file
+    return {"success": True}
@@ -1,99 +1,433 @@
 """Item 相关 API 路由"""
-from typing import List, Optional, Literal
+from datetime import datetime
+from typing import Any, Iterable, List, Literal, Optional, Sequence, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.db.session import get_async_db
 from app.schemas.item import (
+    ItemBulkCreateRequest,
+    ItemBulkDeleteRequest,
+    ItemBulkResult,
+    ItemBulkUpdateRequest,
     ItemCreate,
     ItemUpdate,
     ItemResponse,
     ItemListResponse,
+    ItemPartialListResponse,
+    ItemPartialResponse,
+    ItemStatsResponse,
 )
-from app.services.item_service import ItemService
+from app.services.cache_service import cache_service
+from app.services.item_bulk_service import ItemBulkService
+from app.services.item_counter_service import BUCKET_STEPS, item_counter_service, utc_naive
+from app.services.item_export_service import MEDIA_TYPES, ItemExportService
+from app.services.item_search_service import ItemSearchService
+from app.services.item_service import AsyncItemService
+from app.services.item_version_service import item_version_service
+from app.utils.http_cache import body_etag, is_not_modified, validator_headers
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.serialization import FastJSONResponse, row_dict, schema_fields
 
 router = APIRouter()
 
+# 读取路由直接由 ORM 对象编码为 JSON（见 app/utils/serialization.py），
+# response_model 仅用于 OpenAPI 文档，不会再做一次校验
+ITEM_FIELDS = schema_fields(ItemResponse)
+
+FIELDS_QUERY_DESCRIPTION = "只返回指定字段（逗号分隔），例如 id,title,status；不传返回全部字段"
+INCLUDE_ARCHIVED_DESCRIPTION = "是否同时查询已归档的 Item（items_archive），默认只查询 items 表"
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    解析 fields 参数
+
+    Returns:
+        按 Schema 顺序排列的字段名；未传入时返回 None（返回全部字段）
+    """
+    if fields is None:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    if not requested:
+        raise HTTPException(status_code=400, detail="fields must not be empty")
+    unknown = requested.difference(ITEM_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(field for field in ITEM_FIELDS if field in requested)
+
+
+def _query_fields(
+    fields: Optional[Tuple[str, ...]], required: Sequence[str] = ()
+) -> Optional[Tuple[str, ...]]:
+    """需要查询的列：请求的字段加上生成游标所需的字段"""
+    if fields is None:
+        return None
+    return tuple(field for field in ITEM_FIELDS if field in fields or field in required)
+
+
+def _items_payload(rows: Iterable[Any], fields: Optional[Tuple[str, ...]]) -> List[dict]:
+    """按请求的字段生成响应数据"""
+    output = fields or ITEM_FIELDS
+    return [row_dict(row, output) for row in rows]
+
+
+def _list_response(content: Any, if_none_match: Optional[str]) -> Response:
+    """
+    列表响应：以响应体哈希作为 ETag，If-None-Match 命中时返回 304（省去传输）
+    """
+    response = FastJSONResponse(content)
+    headers = validator_headers(body_etag(response.body))
+    if is_not_modified(headers["ETag"], None, if_none_match, None):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return response
+
+
+NOT_MODIFIED_RESPONSE = {304: {"description": "Not Modified（ETag / Last-Modified 未变化）"}}
+
 
 @router.post("/", response_model=ItemResponse)
-async def create_item(item_in: ItemCreate, db: Session = Depends(get_db)):
+async def create_item(item_in: ItemCreate, db: AsyncSession = Depends(get_async_db)):
     """创建 Item"""
-    item = ItemService.create(db, item_in)
-    return ItemResponse.model_validate(item)
+    item = await AsyncItemService.create(db, item_in)
+    return FastJSONResponse(row_dict(item, ITEM_FIELDS))
+
+
+# --- 批量写入：需注册在 /{item_id} 之前，避免 /bulk 被当作 item_id 匹配 ---
+def _check_bulk_size(rows: int) -> None:
+    """校验批量请求的行数上限"""
+    if rows > settings.ITEM_BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many rows, at most {settings.ITEM_BULK_MAX_ROWS} per request",
+        )
+
+
+@router.post("/bulk", response_model=ItemBulkResult)
+async def bulk_create_items(
+    body: ItemBulkCreateRequest,
+    chunk_size: Optional[int] = Query(None, ge=1, le=5000, description="每条 INSERT 的行数"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """批量创建 Item（单个事务，多行 INSERT，逐行返回错误）"""
+    _check_bulk_size(len(body.items))
+    return await ItemBulkService.create(
+        db, body.items, chunk_size or settings.ITEM_BULK_CHUNK_SIZE
+    )
+
+
+@router.patch("/bulk", response_model=ItemBulkResult)
+async def bulk_update_items(
+    body: ItemBulkUpdateRequest,
+    chunk_size: Optional[int] = Query(None, ge=1, le=5000, description="每次 executemany 的行数"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """批量更新 Item（单个事务，按主键 executemany，逐行返回错误）"""
+    _check_bulk_size(len(body.items))
+    return await ItemBulkService.update(
+        db, body.items, chunk_size or settings.ITEM_BULK_CHUNK_SIZE
+    )
+
+
+@router.delete("/bulk", response_model=ItemBulkResult)
+async def bulk_delete_items(
+    body: ItemBulkDeleteRequest,
+    chunk_size: Optional[int] = Query(None, ge=1, le=5000, description="每条 DELETE 的 ID 数"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """批量删除 Item（单个事务，WHERE id IN (...)，逐行返回错误）"""
+    _check_bulk_size(len(body.ids))
+    return await ItemBulkService.delete(db, body.ids, chunk_size or settings.ITEM_BULK_CHUNK_SIZE)
+
+
+@router.get("/export")
+async def export_items(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="导出格式 ndjson/csv"),
+    status: Optional[str] = Query(None, description="按状态过滤，例如: pending/done"),
+    is_active: Optional[bool] = Query(None, description="按是否启用过滤"),
+    include_archived: bool = Query(False, description=INCLUDE_ARCHIVED_DESCRIPTION),
+):
+    """流式导出 Item（服务端游标逐批读取，内存占用与导出行数无关）"""
+    return StreamingResponse(
+        ItemExportService.stream(
+            format, status=status, is_active=is_active, include_archived=include_archived
+        ),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{ItemExportService.filename(format)}"'
+        },
+    )
+
+
+# 默认统计的时间范围：按小时最近 24 小时，按天最近 30 天
+STATS_DEFAULT_BUCKETS = {"hour": 24, "day": 30}
+STATS_MAX_BUCKETS = 1000
+
+
+@router.get("/stats", response_model=ItemStatsResponse)
+async def read_item_stats(
+    bucket: Literal["hour", "day"] = Query("day", description="创建时间分桶粒度 hour/day"),
+    since: Optional[datetime] = Query(None, description="分桶起始时间（UTC），默认按粒度回溯"),
+    until: Optional[datetime] = Query(None, description="分桶结束时间（UTC），默认当前时间"),
+):
+    """Item 统计：总数、按状态 / 是否激活的数量、按创建时间分桶的数量
+
+    数据来自写操作增量维护、后台定期对账的 Redis 计数器，请求时不查询数据库。
+    """
+    # 统一换算为不带时区信息的 UTC（计数器按 UTC 分桶）
+    until = utc_naive(until)
+    if since is not None:
+        since = utc_naive(since)
+    since = since or until - BUCKET_STEPS[bucket] * (STATS_DEFAULT_BUCKETS[bucket] - 1)
+    if since > until:
+        raise HTTPException(status_code=400, detail="since must not be later than until")
+    if (until - since) / BUCKET_STEPS[bucket] >= STATS_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=400, detail=f"Too many buckets, at most {STATS_MAX_BUCKETS} per request"
+        )
+    stats = await item_counter_service.get_stats(bucket, since, until)
+    if stats is None:
+        raise HTTPException(status_code=503, detail="Item stats are not available yet")
+    return FastJSONResponse({"bucket": bucket, **stats})
+
+
+@router.get("/batch", response_model=List[Optional[ItemResponse]])
+async def read_items_batch(
+    ids: List[str] = Query(..., description="Item ID，逗号分隔或重复传参，例如 ids=1,2,3"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """按 ID 批量获取 Item，按请求顺序返回，不存在的 ID 对应 null
+
+    先用一次 MGET 读取 item:{id} 缓存，未命中的 ID 用一条 IN 查询回源，
+    再用一个 pipeline 回填缓存。
+    """
+    try:
+        item_ids = [int(value) for raw in ids for value in raw.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be integers")
+    unique_ids = list(dict.fromkeys(item_ids))
+    if len(unique_ids) > settings.ITEM_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many ids, at most {settings.ITEM_BATCH_MAX_IDS} per request",
+        )
+
+    found = await cache_service.get_items_cache(unique_ids)
+    misses = [item_id for item_id in unique_ids if item_id not in found]
+    if misses:
+        loaded = {
+            item.id: row_dict(item, ITEM_FIELDS)
+            for item in await AsyncItemService.get_many(db, misses)
+        }
+        await cache_service.set_items_cache(loaded, expire_seconds=settings.ITEM_CACHE_SECONDS)
+        found.update(loaded)
+    return FastJSONResponse([found.get(item_id) for item_id in item_ids])
 
 
-@router.get("/{item_id}", response_model=ItemResponse)
-async def read_item(item_id: int, db: Session = Depends(get_db)):
-    """根据 ID 获取单个 Item"""
-    item = ItemService.get(db, item_id)
+@router.get("/{item_id}", response_model=ItemResponse, responses=NOT_MODIFIED_RESPONSE)
+async def read_item(
+    item_id: int,
+    include_archived: bool = Query(False, description=INCLUDE_ARCHIVED_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """根据 ID 获取单个 Item
+
+    支持条件 GET：ETag 与 Last-Modified 由 updated_at 生成，
+    先用缓存的版本号判断，未修改时直接返回 304，不读取整行；
+    取不到版本号时（不存在、updated_at 为空等）按普通读取处理。
+    已归档的 Item 只在 include_archived=true 时返回（不参与版本号缓存）。
+    """
+    if if_none_match or if_modified_since:
+        version = await item_version_service.get(db, item_id)
+        if version is not None:
+            etag = item_version_service.etag(item_id, version)
+            last_modified = item_version_service.updated_at_of(version)
+            if is_not_modified(etag, last_modified, if_none_match, if_modified_since):
+                return Response(status_code=304, headers=validator_headers(etag, last_modified))
+
+    item = await AsyncItemService.get(db, item_id)
+    if not item and include_archived:
+        item = await AsyncItemService.get_archived(db, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    return ItemResponse.model_validate(item)
+    headers = None
+    if item.updated_at is not None:
+        version = item_version_service.version_of(item.updated_at)
+        headers = validator_headers(item_version_service.etag(item.id, version), item.updated_at)
+    return FastJSONResponse(row_dict(item, ITEM_FIELDS), headers=headers)
 
 
-@router.get("/", response_model=List[ItemResponse])
-async def read_items(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.get(
+    "/",
+    response_model=Union[List[ItemResponse], List[ItemPartialResponse]],
+    responses=NOT_MODIFIED_RESPONSE,
+)
+async def read_items(
+    skip: int = 0,
+    limit: int = 100,
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+):
     """获取多个 Item（基础列表接口）"""
-    items = ItemService.get_multi(db, skip=skip, limit=limit)
-    return [ItemResponse.model_validate(item) for item in items]
+    selected = _parse_fields(fields)
+    items = await AsyncItemService.get_multi(db, skip=skip, limit=limit, fields=selected)
+    return _list_response(_items_payload(items, selected), if_none_match)
 
 
 @router.put("/{item_id}", response_model=ItemResponse)
 async def update_item(
-    item_id: int, item_in: ItemUpdate, db: Session = Depends(get_db)
+    item_id: int, item_in: ItemUpdate, db: AsyncSession = Depends(get_async_db)
 ):
     """更新 Item"""
-    item = ItemService.update(db, item_id, item_in)
+    item = await AsyncItemService.update(db, item_id, item_in)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    return ItemResponse.model_validate(item)
+    return FastJSONResponse(row_dict(item, ITEM_FIELDS))
 
 
 @router.delete("/{item_id}")
-async def delete_item(item_id: int, db: Session = Depends(get_db)):
+async def delete_item(item_id: int, db: AsyncSession = Depends(get_async_db)):
     """删除 Item"""
-    success = ItemService.delete(db, item_id)
+    success = await AsyncItemService.delete(db, item_id)
     if not success:
         raise HTTPException(status_code=404, detail="Item not found")
     return {"success": True}
 
 
-@router.get("/search/", response_model=List[ItemResponse])
+@router.get(
+    "/search/",
+    response_model=Union[ItemListResponse, ItemPartialListResponse],
+    responses=NOT_MODIFIED_RESPONSE,
+)
 async def search_items(
-    keyword: str,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    keyword: str = Query(..., min_length=1, max_length=100, description="搜索关键词"),
+    skip: int = Query(0, ge=0, description="起始偏移量（传入 cursor 时忽略）"),
+    limit: int = Query(20, ge=1, le=100, description="每页数量"),
+    cursor: Optional[str] = Query(None, description="游标分页：上一页返回的 next_cursor"),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """根据关键词搜索 Item"""
-    items = ItemService.search(db, keyword, skip=skip, limit=limit)
-    return [ItemResponse.model_validate(item) for item in items]
+    """根据关键词全文检索 Item（标题与描述），按相关度排序"""
+    selected = _parse_fields(fields)
+    after = None
+    if cursor is not None:
+        try:
+            rank, last_id = decode_cursor(cursor, 2)
+            after = (float(rank), int(last_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        skip = 0
+
+    results, has_more = await ItemSearchService.search(
+        db, keyword, limit=limit, skip=skip, after=after, fields=_query_fields(selected, ("id",))
+    )
+    next_cursor = None
+    if has_more and results:
+        last, last_rank = results[-1]
+        next_cursor = encode_cursor(last_rank, last.id)
+
+    return _list_response(
+        {
+            "total": None,
+            "items": _items_payload((item for item, _ in results), selected),
+            "skip": skip,
+            "limit": limit,
+            "next_cursor": next_cursor,
+        },
+        if_none_match,
+    )
 
 
 # --- 新增：标准分页 + 条件过滤示例 ---
-@router.get("/page/", response_model=ItemListResponse)
+@router.get(
+    "/page/",
+    response_model=Union[ItemListResponse, ItemPartialListResponse],
+    responses=NOT_MODIFIED_RESPONSE,
+)
 async def read_items_paged(
-    skip: int = Query(0, ge=0, description="起始偏移量"),
+    skip: int = Query(0, ge=0, description="起始偏移量（传入 cursor 时忽略）"),
     limit: int = Query(10, ge=1, le=100, description="每页数量"),
     status: Optional[str] = Query(None, description="按状态过滤，例如: pending/done"),
     is_active: Optional[bool] = Query(None, description="按是否启用过滤"),
     order: Literal["asc", "desc"] = Query("desc", description="排序方式，asc/desc"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="游标分页：上一页返回的 next_cursor"),
+    with_total: Optional[bool] = Query(
+        None, description="是否统计总数，默认偏移量分页统计、游标分页不统计"
+    ),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+    include_archived: bool = Query(False, description=INCLUDE_ARCHIVED_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """分页 + 条件过滤获取 Item 列表（CRUD 示例）"""
-    total = ItemService.count_filtered(db, status=status, is_active=is_active)
-    items = ItemService.get_multi_filtered(
-        db,
-        skip=skip,
-        limit=limit,
-        status=status,
-        is_active=is_active,
-        order=order,
+    """分页 + 条件过滤获取 Item 列表（CRUD 示例）
+
+    - 偏移量分页：使用 skip/limit，适合浅分页
+    - 游标分页：使用上一页返回的 next_cursor，按 (created_at, id) seek，深分页代价与首页相同
+    """
+    selected = _parse_fields(fields)
+    query_fields = _query_fields(selected, ("id", "created_at"))
+    if with_total is None:
+        with_total = cursor is None
+    total = (
+        await AsyncItemService.count_filtered(
+            db, status=status, is_active=is_active, include_archived=include_archived
+        )
+        if with_total
+        else None
     )
-    return ItemListResponse(
-        total=total,
-        items=[ItemResponse.model_validate(item) for item in items],
-        skip=skip,
-        limit=limit,
+
+    if cursor is not None:
+        try:
+            created_at, last_id, cursor_order = decode_cursor(cursor, 3)
+            after = (datetime.fromisoformat(created_at), int(last_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if cursor_order != order:
+            raise HTTPException(status_code=400, detail="Cursor does not match order")
+        items, has_more = await AsyncItemService.get_multi_after(
+            db,
+            limit=limit,
+            status=status,
+            is_active=is_active,
+            order=order,
+            after=after,
+            fields=query_fields,
+            include_archived=include_archived,
+        )
+        skip = 0
+    else:
+        items = await AsyncItemService.get_multi_filtered(
+            db,
+            skip=skip,
+            limit=limit,
+            status=status,
+            is_active=is_active,
+            order=order,
+            fields=query_fields,
+            include_archived=include_archived,
+        )
+        has_more = len(items) == limit
+
+    next_cursor = None
+    if has_more and items:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id, order)
+
+    return _list_response(
+        {
+            "total": total,
+            "items": _items_payload(items, selected),
+            "skip": skip,
+            "limit": limit,
+            "next_cursor": next_cursor,
+        },
+        if_none_match,
     )
@@ -0,0 +1,54 @@
+"""
+运行状态监控路由
+- 数据库连接池：常驻/占用/溢出连接数与获取连接的等待时间
+- 只读副本：健康状态与复制延迟
+- SQL 执行统计：语句总数与耗时、最近的慢查询与疑似 N+1 查询
+- 缓存：进程内 L1 与 Redis L2 的命中率
+- Redis：部署模式、连接池上限与熔断状态
+
+指标按进程统计，多 worker 部署时每次请求只反映处理该请求的 worker（见返回中的 pid）。
+"""
+import os
+from typing import Any, Dict
+
+from fastapi import APIRouter
+
+from app.db.instrumentation import query_monitor
+from app.db.pool import pool_status
+from app.db.routing import replica_set
+from app.db.session import async_engine, engine
+from app.services.cache_service import cache_service
+from app.utils.redis_client import redis_client
+
+router = APIRouter()
+
+
+@router.get("/db/pool")
+async def get_db_pool_status() -> Dict[str, Any]:
+    """数据库连接池状态（主库异步/同步引擎与各只读副本）"""
+    return {
+        "primary": pool_status(async_engine),
+        "primary_sync": pool_status(engine),
+        "replicas": [
+            {**pool_status(replica.engine), "healthy": replica.healthy, "lag_seconds": replica.lag}
+            for replica in replica_set.replicas
+        ],
+    }
+
+
+@router.get("/db/queries")
+async def get_db_query_stats() -> Dict[str, Any]:
+    """SQL 执行统计（语句总数与耗时、最近的慢查询与疑似 N+1 查询）"""
+    return query_monitor.snapshot()
+
+
+@router.get("/cache")
+async def get_cache_stats() -> Dict[str, Any]:
+    """缓存命中率（进程内 L1 与 Redis L2，按 worker 统计）"""
+    return {"pid": os.getpid(), **cache_service.stats()}
+
+
+@router.get("/redis")
+async def get_redis_status() -> Dict[str, Any]:
+    """Redis 连接状态（部署模式、连接池上限与熔断状态，按 worker 统计）"""
+    return {"pid": os.getpid(), **redis_client.status()}
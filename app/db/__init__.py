@@ -1,6 +1,25 @@
 """
 数据库包
 """
-from app.db.session import Base, engine, get_db, init_db
+from app.db.routing import replica_set, use_primary
+from app.db.session import (
+    AsyncSessionLocal,
+    Base,
+    async_engine,
+    engine,
+    get_async_db,
+    get_db,
+    init_db,
+)
 
-__all__ = ["Base", "engine", "get_db", "init_db"]
+__all__ = [
+    "AsyncSessionLocal",
+    "Base",
+    "async_engine",
+    "engine",
+    "get_async_db",
+    "get_db",
+    "init_db",
+    "replica_set",
+    "use_primary",
+]
@@ -0,0 +1,236 @@
+"""
+SQL 执行统计模块
+- 引擎事件：记录每条语句的耗时，累加到当前请求的统计（contextvar）
+- 慢查询日志：耗时超过 DATABASE_SLOW_QUERY_MS 的语句以归一化 SQL（字面量替换为 ?）记录
+- N+1 检测：同一请求内同一归一化语句执行次数达到 DATABASE_N_PLUS_ONE_THRESHOLD 时告警
+- QueryStatsMiddleware：为每个 HTTP 请求建立统计，并通过 Server-Timing 响应头返回
+  查询次数、数据库总耗时与最慢语句耗时
+
+统计按进程保存，多 worker 部署时 /monitor/db/queries 只反映处理该请求的 worker。
+"""
+import os
+import re
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.utils.logger import logger
+
+EngineT = TypeVar("EngineT", Engine, AsyncEngine)
+
+# 执行上下文上保存语句开始时间的属性名
+_STARTED_AT = "_query_stats_started_at"
+
+# 归一化 SQL 使用的正则：字符串字面量、各驱动的占位符、数字字面量、IN 列表
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql: str) -> str:
+    """
+    归一化 SQL：合并空白，字面量与占位符统一替换为 ?，IN 列表折叠为 (?)
+
+    参数值不同但结构相同的语句归一化后相同，便于慢查询聚合与 N+1 检测，
+    同时避免把参数值（可能含敏感数据）写入日志。
+
+    Args:
+        sql: 驱动实际执行的 SQL
+
+    Returns:
+        归一化后的 SQL
+    """
+    sql = _SPACES.sub(" ", sql).strip()
+    sql = _STRING.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    return _IN_LIST.sub("(?)", sql)
+
+
+class QueryStats:
+    """单个请求的 SQL 执行统计"""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_sql: Optional[str] = None
+        self.statements: Counter = Counter()
+
+    def record(self, sql: str, elapsed: float, executemany: bool = False) -> None:
+        """
+        记录一条语句
+
+        Args:
+            sql: 归一化后的 SQL
+            elapsed: 耗时（秒）
+            executemany: 是否为批量执行（批量插入按批次拆分的语句不计入 N+1 检测）
+        """
+        self.count += 1
+        self.total_time += elapsed
+        if not executemany:
+            self.statements[sql] += 1
+        if elapsed >= self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_sql = sql
+
+    def repeated(self, threshold: int) -> List[Dict[str, Any]]:
+        """执行次数达到阈值的语句（疑似 N+1）"""
+        if threshold <= 0:
+            return []
+        return [
+            {"sql": sql, "count": count}
+            for sql, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+    def server_timing(self) -> str:
+        """Server-Timing 响应头的值"""
+        return (
+            f'db;dur={self.total_time * 1000:.1f};desc="queries: {self.count}", '
+            f"db-slowest;dur={self.slowest_time * 1000:.1f}"
+        )
+
+
+class QueryMonitor:
+    """进程级的 SQL 执行统计：总次数、慢查询与疑似 N+1 的最近记录"""
+
+    def __init__(self, window: int = 100):
+        self.queries = 0
+        self.total_time = 0.0
+        self.slow_queries = 0
+        self.n_plus_one = 0
+        self.recent_slow: Deque[Dict[str, Any]] = deque(maxlen=window)
+        self.recent_n_plus_one: Deque[Dict[str, Any]] = deque(maxlen=window)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """当前统计（毫秒）"""
+        return {
+            "pid": os.getpid(),
+            "queries": self.queries,
+            "total_ms": round(self.total_time * 1000, 3),
+            "slow_queries": self.slow_queries,
+            "slow_query_ms": settings.DATABASE_SLOW_QUERY_MS,
+            "n_plus_one": self.n_plus_one,
+            "n_plus_one_threshold": settings.DATABASE_N_PLUS_ONE_THRESHOLD,
+            "recent_slow": list(self.recent_slow),
+            "recent_n_plus_one": list(self.recent_n_plus_one),
+        }
+
+
+# 创建全局 SQL 执行统计实例
+query_monitor = QueryMonitor()
+
+# 当前请求的统计，不在请求内（脚本、后台任务）时为 None
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """当前请求的 SQL 执行统计"""
+    return _current_stats.get()
+
+
+def instrument_engine(engine: EngineT) -> EngineT:
+    """
+    为引擎注册语句计时事件
+
+    Args:
+        engine: 同步或异步引擎
+
+    Returns:
+        传入的引擎
+    """
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            setattr(context, _STARTED_AT, time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started_at = getattr(context, _STARTED_AT, None)
+        if started_at is None:
+            return
+        elapsed = time.perf_counter() - started_at
+        sql = normalize_sql(statement)
+
+        query_monitor.queries += 1
+        query_monitor.total_time += elapsed
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(sql, elapsed, executemany)
+
+        slow_query_ms = settings.DATABASE_SLOW_QUERY_MS
+        if slow_query_ms > 0 and elapsed * 1000 >= slow_query_ms:
+            query_monitor.slow_queries += 1
+            query_monitor.recent_slow.append(
+                {
+                    "at": time.time(),
+                    "ms": round(elapsed * 1000, 3),
+                    "sql": sql,
+                    "request": stats.label if stats is not None else None,
+                }
+            )
+            logger.warning(
+                f"慢查询 {elapsed * 1000:.1f}ms"
+                f"{f' [{stats.label}]' if stats is not None else ''}: {sql}"
+            )
+
+    return engine
+
+
+def _report_n_plus_one(stats: QueryStats) -> None:
+    """请求结束时检查同一语句是否重复执行（疑似 N+1）"""
+    for suspect in stats.repeated(settings.DATABASE_N_PLUS_ONE_THRESHOLD):
+        query_monitor.n_plus_one += 1
+        query_monitor.recent_n_plus_one.append(
+            {"at": time.time(), "request": stats.label, **suspect}
+        )
+        logger.warning(
+            f"疑似 N+1 查询 [{stats.label}]: 同一语句执行 {suspect['count']} 次: {suspect['sql']}"
+        )
+
+
+class QueryStatsMiddleware:
+    """
+    请求级 SQL 执行统计中间件（纯 ASGI 实现，不缓冲响应体，流式响应不受影响）
+
+    Server-Timing 头在响应开始时写入，流式响应只包含发送响应头之前执行的语句；
+    N+1 检测在响应结束后进行，覆盖整个请求。
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(f"{scope['method']} {scope['path']}")
+        token = _current_stats.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and settings.DATABASE_SERVER_TIMING:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            _report_n_plus_one(stats)
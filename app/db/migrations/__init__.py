@@ -0,0 +1,100 @@
+"""
+数据库版本化迁移
+
+- 迁移脚本位于 app/db/migrations/versions，文件名形如 v0001_xxx.py
+- 每个脚本定义 revision、description 和 upgrade(conn)；
+  可选 transactional = False，表示在自动提交模式下执行
+  （例如 PostgreSQL 的 CREATE INDEX CONCURRENTLY 不能放在事务中）
+- 已执行的版本记录在 schema_migrations 表中，重复执行 upgrade 是安全的
+"""
+import importlib
+import pkgutil
+from datetime import datetime
+from types import ModuleType
+from typing import Dict, List
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, insert, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.migrations import versions
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", String(32), primary_key=True, comment="迁移版本号"),
+    Column("description", String(200), nullable=True, comment="迁移说明"),
+    Column("applied_at", DateTime, nullable=False, comment="执行时间"),
+)
+
+
+def load_migrations() -> List[ModuleType]:
+    """
+    加载全部迁移脚本
+
+    Returns:
+        按版本号排序的迁移模块列表
+    """
+    modules = [
+        importlib.import_module(f"{versions.__name__}.{info.name}")
+        for info in pkgutil.iter_modules(versions.__path__)
+        if info.name.startswith("v")
+    ]
+    return sorted(modules, key=lambda module: module.revision)
+
+
+def applied_versions(engine: Engine) -> Dict[str, datetime]:
+    """
+    查询已执行的迁移版本
+
+    Args:
+        engine: 同步数据库引擎
+
+    Returns:
+        {版本号: 执行时间}
+    """
+    schema_migrations.create(engine, checkfirst=True)
+    with engine.connect() as conn:
+        rows = conn.execute(select(schema_migrations.c.version, schema_migrations.c.applied_at))
+        return {version: applied_at for version, applied_at in rows}
+
+
+def _record(conn: Connection, module: ModuleType) -> None:
+    """记录迁移已执行"""
+    conn.execute(
+        insert(schema_migrations).values(
+            version=module.revision,
+            description=module.description,
+            applied_at=datetime.utcnow(),
+        )
+    )
+
+
+def upgrade(engine: Engine) -> List[str]:
+    """
+    按版本顺序执行尚未执行的迁移
+
+    Args:
+        engine: 同步数据库引擎
+
+    Returns:
+        本次执行的版本号列表
+    """
+    applied = applied_versions(engine)
+    executed = []
+    for module in load_migrations():
+        if module.revision in applied:
+            continue
+        print(f"⏫ 执行迁移 {module.revision}: {module.description}")
+        if getattr(module, "transactional", True):
+            with engine.begin() as conn:
+                module.upgrade(conn)
+                _record(conn, module)
+        else:
+            with engine.connect() as conn:
+                conn.execution_options(isolation_level="AUTOCOMMIT")
+                module.upgrade(conn)
+                _record(conn, module)
+        executed.append(module.revision)
+    return executed
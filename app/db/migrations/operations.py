@@ -0,0 +1,78 @@
+"""
+迁移常用操作
+"""
+from sqlalchemy import Index, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateIndex
+
+
+def index_exists(conn: Connection, table_name: str, index_name: str) -> bool:
+    """
+    判断索引是否已存在
+
+    Args:
+        conn: 数据库连接
+        table_name: 表名
+        index_name: 索引名
+
+    Returns:
+        是否存在
+    """
+    indexes = inspect(conn).get_indexes(table_name)
+    return any(index["name"] == index_name for index in indexes)
+
+
+def create_index_online(conn: Connection, index: Index) -> bool:
+    """
+    在线创建索引（已存在则跳过），尽量不阻塞表的读写：
+    - PostgreSQL: CREATE INDEX CONCURRENTLY（需在自动提交模式下执行）
+    - MySQL: ALGORITHM=INPLACE, LOCK=NONE（全文索引由 MySQL 自行选择算法）
+    - MSSQL: WITH (ONLINE = ON)，当前版本不支持在线操作时退回普通创建
+
+    Args:
+        conn: 数据库连接
+        index: 模型中声明的索引
+
+    Returns:
+        本次是否创建了索引
+    """
+    if index_exists(conn, index.table.name, index.name):
+        return False
+
+    ddl = str(CreateIndex(index).compile(dialect=conn.dialect))
+    dialect_name = conn.dialect.name
+    if dialect_name == "postgresql":
+        conn.execute(text(ddl.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)))
+    elif dialect_name in ("mysql", "mariadb"):
+        if index.dialect_options["mysql"]["prefix"] == "FULLTEXT":
+            conn.execute(text(ddl))
+        else:
+            conn.execute(text(f"{ddl} ALGORITHM=INPLACE LOCK=NONE"))
+    elif dialect_name == "mssql":
+        try:
+            conn.execute(text(f"{ddl} WITH (ONLINE = ON)"))
+        except DBAPIError:
+            # 例如 Standard/Express 版本不支持在线索引操作
+            conn.execute(text(ddl))
+    else:
+        conn.execute(text(ddl))
+    print(f"✅ 已创建索引 {index.name}")
+    return True
+
+
+def model_index(table, index_name: str) -> Index:
+    """
+    按名称获取模型中声明的索引，索引定义只保留在模型一处
+
+    Args:
+        table: SQLAlchemy Table
+        index_name: 索引名
+
+    Returns:
+        Index 对象
+    """
+    for index in table.indexes:
+        if index.name == index_name:
+            return index
+    raise KeyError(f"{table.name} 上未声明索引 {index_name}")
@@ -0,0 +1,3 @@
+"""
+迁移脚本包
+"""
@@ -0,0 +1,15 @@
+"""
+基线迁移：按当前模型创建尚不存在的表（已存在的表不做修改）
+"""
+from sqlalchemy.engine import Connection
+
+revision = "0001"
+description = "创建初始表结构"
+
+
+def upgrade(conn: Connection) -> None:
+    """执行迁移"""
+    from app.db.session import Base
+    import app.models  # noqa: F401  确保所有模型已注册
+
+    Base.metadata.create_all(bind=conn)
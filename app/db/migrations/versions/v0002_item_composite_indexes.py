@@ -0,0 +1,27 @@
+"""
+为 items 表在线添加与热点查询匹配的复合索引：
+- 按 status / is_active 过滤并按 (created_at, id) 排序的分页与游标查询
+- 按 status / is_active 的计数
+"""
+from sqlalchemy.engine import Connection
+
+from app.db.migrations.operations import create_index_online, model_index
+
+revision = "0002"
+description = "items 表复合索引"
+transactional = False
+
+INDEX_NAMES = [
+    "ix_items_status_active_created",
+    "ix_items_status_created",
+    "ix_items_active_created",
+    "ix_items_created",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    """执行迁移"""
+    from app.models.item import Item
+
+    for name in INDEX_NAMES:
+        create_index_online(conn, model_index(Item.__table__, name))
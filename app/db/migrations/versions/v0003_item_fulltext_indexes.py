@@ -0,0 +1,58 @@
+"""
+为 items 表添加全文索引（ItemSearchService 使用）：
+- MySQL: FULLTEXT (title, description) WITH PARSER ngram
+- PostgreSQL: to_tsvector 表达式上的 GIN 索引（CONCURRENTLY）
+- MSSQL: 全文目录 + 全文索引（未安装全文检索组件时跳过，需设置 ITEM_SEARCH_MODE=like）
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.db.migrations.operations import create_index_online, model_index
+
+revision = "0003"
+description = "items 表全文索引"
+transactional = False
+
+
+def _upgrade_mssql(conn: Connection) -> None:
+    """MSSQL 全文索引需要全文目录和主键索引名"""
+    if not conn.scalar(text("SELECT FULLTEXTSERVICEPROPERTY('IsFulltextInstalled')")):
+        print("⚠️ MSSQL 未安装全文检索组件，跳过全文索引，请设置 ITEM_SEARCH_MODE=like")
+        return
+    exists = conn.scalar(
+        text("SELECT 1 FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID('items')")
+    )
+    if exists:
+        return
+    conn.execute(
+        text(
+            "IF NOT EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = 'ft_catalog') "
+            "CREATE FULLTEXT CATALOG ft_catalog AS DEFAULT"
+        )
+    )
+    pk_name = conn.scalar(
+        text(
+            "SELECT name FROM sys.indexes "
+            "WHERE object_id = OBJECT_ID('items') AND is_primary_key = 1"
+        )
+    )
+    conn.execute(
+        text(
+            f"CREATE FULLTEXT INDEX ON items (title, description) KEY INDEX [{pk_name}] "
+            "WITH CHANGE_TRACKING AUTO"
+        )
+    )
+    print("✅ 已创建 MSSQL 全文索引")
+
+
+def upgrade(conn: Connection) -> None:
+    """执行迁移"""
+    from app.models.item import Item
+
+    dialect_name = conn.dialect.name
+    if dialect_name in ("mysql", "mariadb"):
+        create_index_online(conn, model_index(Item.__table__, "ft_items_title_description"))
+    elif dialect_name == "postgresql":
+        create_index_online(conn, model_index(Item.__table__, "ix_items_search_vector"))
+    elif dialect_name == "mssql":
+        _upgrade_mssql(conn)
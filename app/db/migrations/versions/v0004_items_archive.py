@@ -0,0 +1,16 @@
+"""
+创建 items_archive 归档表（冷数据，见 ItemArchiveService）：
+- 列与 items 一致并保留原主键，另加 archived_at
+- 与 items 对应的复合索引，供 include_archived 查询使用
+"""
+from sqlalchemy.engine import Connection
+
+revision = "0004"
+description = "items_archive 归档表"
+
+
+def upgrade(conn: Connection) -> None:
+    """执行迁移（新库在 0001 中已按模型建表，此处跳过）"""
+    from app.models.item import ItemArchive
+
+    ItemArchive.__table__.create(conn, checkfirst=True)
@@ -0,0 +1,184 @@
+"""
+数据库连接池模块
+- 统一根据 Settings 生成连接池参数（大小、溢出、超时、LIFO、回收、预检策略）
+- 带指标的连接池：记录获取连接的等待时间、超时次数，便于按 worker 调整连接池大小
+- idle 预检策略：仅对空闲超过阈值的连接做 ping，避免每次获取连接都多一次往返
+"""
+import os
+import statistics
+import time
+from collections import deque
+from typing import Any, Deque, Dict, TypeVar, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+# 连接记录 info 中保存归还时间的键
+_CHECKIN_TIME = "checkin_time"
+
+EngineT = TypeVar("EngineT", Engine, AsyncEngine)
+
+
+class PoolMetrics:
+    """连接池获取连接的统计"""
+
+    def __init__(self, window: int = 1000):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._recent: Deque[float] = deque(maxlen=window)
+
+    def record(self, wait: float) -> None:
+        """记录一次成功获取连接的等待时间（秒）"""
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self._recent.append(wait)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """当前统计（毫秒）"""
+        recent = sorted(self._recent)
+        p95 = recent[int(len(recent) * 0.95) - 1] if len(recent) >= 20 else None
+        avg = self.total_wait / self.checkouts if self.checkouts else 0.0
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": round(avg * 1000, 3),
+            "wait_max_ms": round(self.max_wait * 1000, 3),
+            "wait_recent_p50_ms": round(statistics.median(recent) * 1000, 3) if recent else None,
+            "wait_recent_p95_ms": round(p95 * 1000, 3) if p95 is not None else None,
+        }
+
+
+class _InstrumentedPoolMixin:
+    """在获取连接时计时的连接池混入类"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        # 连接池失效重建后沿用同一份统计
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """带指标的同步连接池"""
+
+    # 沿用 SQLAlchemy 的日志名，避免连接池日志混入 app 日志
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.QueuePool"
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """带指标的异步连接池"""
+
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.AsyncAdaptedQueuePool"
+
+
+def engine_options(is_async: bool) -> Dict[str, Any]:
+    """
+    根据配置生成 create_engine / create_async_engine 的连接池参数
+
+    Args:
+        is_async: 是否用于异步引擎
+
+    Returns:
+        引擎参数
+    """
+    return {
+        "echo": settings.DATABASE_ECHO,
+        "poolclass": InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,  # 连接回收时间（秒）
+        "pool_use_lifo": settings.DATABASE_POOL_USE_LIFO,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING == "always",
+    }
+
+
+def setup_engine(engine: EngineT) -> EngineT:
+    """
+    为引擎注册连接池事件（idle 预检策略）
+
+    Args:
+        engine: 同步或异步引擎
+
+    Returns:
+        传入的引擎
+    """
+    if settings.DATABASE_POOL_PRE_PING != "idle":
+        return engine
+
+    idle_seconds = settings.DATABASE_POOL_PRE_PING_IDLE_SECONDS
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info[_CHECKIN_TIME] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checkin_time = connection_record.info.get(_CHECKIN_TIME)
+        if checkin_time is None or time.monotonic() - checkin_time < idle_seconds:
+            return
+        try:
+            sync_engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            # 抛出 DisconnectionError 后连接池会丢弃该连接并重新获取
+            raise DisconnectionError() from e
+
+    return engine
+
+
+def pool_status(engine: Union[Engine, AsyncEngine]) -> Dict[str, Any]:
+    """
+    连接池当前状态与获取连接的统计
+
+    Args:
+        engine: 同步或异步引擎
+
+    Returns:
+        状态字典
+    """
+    pool = engine.pool
+    status: Dict[str, Any] = {
+        "url": engine.url.render_as_string(hide_password=True),
+        "pid": os.getpid(),
+        "pool_class": type(pool).__name__,
+    }
+    if isinstance(pool, QueuePool):
+        status.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                # overflow() 为负数表示尚未创建满 pool_size 个连接
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+            }
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.snapshot())
+    return status
@@ -0,0 +1,195 @@
+"""
+读写分离路由模块
+- 只读查询按轮询发往健康的只读副本，写操作与加锁查询发往主库
+- 后台定期检查副本连通性与复制延迟，不健康或延迟过大的副本暂时摘除，全部不可用时回退主库
+- 会话中发生写操作（或显式调用 use_primary）后，后续查询固定走主库，保证读到自己的写入
+"""
+import asyncio
+import itertools
+import time
+from typing import List, Optional
+
+from sqlalchemy import Select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+from app.utils.logger import logger
+
+# 会话 info 中的标记：为 True 时该会话的所有语句都走主库
+USE_PRIMARY = "use_primary"
+
+
+def use_primary(db) -> None:
+    """
+    将会话固定到主库（写操作前的读取、需要强一致的读取时调用）
+
+    Args:
+        db: Session 或 AsyncSession
+    """
+    db.info[USE_PRIMARY] = True
+
+
+class Replica:
+    """只读副本"""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.healthy = True
+        self.lag: Optional[float] = None
+        self.checked_at: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        """不含密码的连接地址，用于日志"""
+        return self.engine.url.render_as_string(hide_password=True)
+
+
+class ReplicaSet:
+    """只读副本集合"""
+
+    def __init__(self):
+        self.replicas: List[Replica] = []
+        self._counter = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self.max_lag_seconds = 5.0
+        self.check_interval = 10
+
+    def configure(self, engines: List[AsyncEngine], max_lag_seconds: float, check_interval: int):
+        """
+        设置副本引擎与健康检查参数
+
+        Args:
+            engines: 副本的异步引擎
+            max_lag_seconds: 允许的最大复制延迟（秒），超过则摘除
+            check_interval: 健康检查间隔（秒）
+        """
+        self.replicas = [Replica(engine) for engine in engines]
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+
+    def choose(self) -> Optional[AsyncEngine]:
+        """
+        轮询选择一个健康的副本
+
+        Returns:
+            副本引擎；没有可用副本时返回 None（调用方回退主库）
+        """
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)].engine
+
+    @staticmethod
+    async def _replication_lag(conn, dialect_name: str) -> Optional[float]:
+        """查询复制延迟（秒），无法获取时返回 None"""
+        if dialect_name == "postgresql":
+            return await conn.scalar(
+                text(
+                    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+                )
+            )
+        if dialect_name in ("mysql", "mariadb"):
+            for statement, column in (
+                ("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+                ("SHOW SLAVE STATUS", "Seconds_Behind_Master"),
+            ):
+                try:
+                    row = (await conn.execute(text(statement))).mappings().first()
+                except Exception:
+                    continue
+                # 非副本（没有复制状态）视为无延迟；复制线程停止时值为 NULL，视为不可用
+                if row is None:
+                    return 0.0
+                value = row.get(column)
+                return float(value) if value is not None else float("inf")
+        return 0.0
+
+    async def check(self, replica: Replica) -> None:
+        """检查单个副本的连通性与复制延迟"""
+        try:
+            async with replica.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                lag = await self._replication_lag(conn, replica.engine.dialect.name)
+            replica.lag = None if lag is None else float(lag)
+            healthy = replica.lag is None or replica.lag <= self.max_lag_seconds
+        except Exception as e:
+            logger.warning(f"只读副本 {replica.name} 检查失败: {e}")
+            healthy = False
+        if healthy != replica.healthy:
+            state = "恢复" if healthy else f"摘除（延迟: {replica.lag}）"
+            logger.warning(f"只读副本 {replica.name} {state}")
+        replica.healthy = healthy
+        replica.checked_at = time.time()
+
+    async def check_all(self) -> None:
+        """并发检查全部副本"""
+        timeout = max(self.check_interval, 1)
+        await asyncio.gather(
+            *(asyncio.wait_for(self.check(replica), timeout) for replica in self.replicas),
+            return_exceptions=True,
+        )
+
+    async def _check_loop(self):
+        """后台定期健康检查"""
+        while True:
+            await self.check_all()
+            await asyncio.sleep(self.check_interval)
+
+    def start(self):
+        """启动后台健康检查（应用启动时调用）"""
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._check_loop())
+
+    async def stop(self):
+        """停止健康检查并释放副本连接池（应用关闭时调用）"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def status(self) -> List[dict]:
+        """副本状态，用于监控"""
+        return [
+            {
+                "url": replica.name,
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag,
+                "checked_at": replica.checked_at,
+            }
+            for replica in self.replicas
+        ]
+
+
+# 创建全局副本集合实例
+replica_set = ReplicaSet()
+
+
+class RoutingSession(Session):
+    """按语句类型在主库与只读副本之间路由的会话
+
+    作为 AsyncSession 的 sync_session_class 使用，get_bind 需返回同步 Engine。
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        """选择执行语句的引擎"""
+        if self.info.get(USE_PRIMARY):
+            return super().get_bind(mapper, clause=clause, **kw)
+        is_read = (
+            isinstance(clause, Select)
+            and clause._for_update_arg is None
+            and not self._flushing
+        )
+        if is_read:
+            replica = replica_set.choose()
+            if replica is not None:
+                return replica.sync_engine
+        elif clause is not None or self._flushing:
+            # 写操作之后本会话固定走主库（读到自己的写入）
+            self.info[USE_PRIMARY] = True
+        return super().get_bind(mapper, clause=clause, **kw)
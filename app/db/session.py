@@ -1,23 +1,61 @@
 """
 数据库会话管理模块
+
+- 同步引擎 / SessionLocal：供 scripts/init_db.py 等脚本使用
+- 异步引擎 / AsyncSessionLocal：供 API 路由使用，避免数据库 I/O 阻塞事件循环
 """
+from typing import AsyncIterator
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.db.instrumentation import instrument_engine
+from app.db.pool import engine_options, setup_engine
+from app.db.routing import RoutingSession, replica_set
+
+
+def _setup(engine):
+    """注册连接池事件与 SQL 执行统计事件"""
+    setup_engine(engine)
+    if settings.DATABASE_QUERY_STATS:
+        instrument_engine(engine)
+    return engine
 
-# 创建数据库引擎
-engine = create_engine(
-    settings.database_url,
-    echo=settings.DATABASE_ECHO,
-    pool_pre_ping=True,  # 连接池预检查
-    pool_recycle=3600,  # 连接回收时间（秒）
-)
+
+# 创建数据库引擎（连接池参数见 app/db/pool.py）
+engine = _setup(create_engine(settings.database_url, **engine_options(is_async=False)))
 
 # 创建会话工厂
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 创建异步数据库引擎
+async_engine = _setup(
+    create_async_engine(settings.async_database_url, **engine_options(is_async=True))
+)
+
+# 配置只读副本：只读查询轮询发往健康副本，写操作与写后读取走主库
+replica_set.configure(
+    [
+        _setup(create_async_engine(url, **engine_options(is_async=True)))
+        for url in settings.DATABASE_REPLICA_URLS
+    ],
+    max_lag_seconds=settings.DATABASE_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.DATABASE_REPLICA_CHECK_SECONDS,
+)
+
+# 创建异步会话工厂
+# expire_on_commit=False：提交后仍可直接读取对象属性，避免在异步上下文中触发隐式加载
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession if settings.DATABASE_REPLICA_URLS else Session,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # 创建基础模型类
 Base = declarative_base()
 
@@ -34,10 +72,24 @@ def get_db():
         db.close()
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    获取异步数据库会话的依赖注入函数
+    用于 FastAPI 的 Depends，数据库往返不会阻塞事件循环
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
     """
     初始化数据库
-    创建所有表
+    按版本执行尚未执行的迁移（新库建表，已有库补齐索引等变更）
     """
-    Base.metadata.create_all(bind=engine)
-    print("✅ 数据库表创建成功")
+    from app.db.migrations import upgrade
+
+    executed = upgrade(engine)
+    if executed:
+        print(f"✅ 数据库迁移完成: {', '.join(executed)}")
+    else:
+        print("✅ 数据库已是最新版本")
@@ -7,6 +7,12 @@ from fastapi.responses import JSONResponse
 
 from app.api.v1 import api_router
 from app.core.config import settings
+from app.db.instrumentation import QueryStatsMiddleware
+from app.db.routing import replica_set
+from app.db.session import async_engine
+from app.services.cache_service import cache_service
+from app.services.item_archive_service import item_archive_service
+from app.services.item_counter_service import item_counter_service
 from app.utils.redis_client import redis_client
 from app.utils.mqtt_client import mqtt_client
 
@@ -28,8 +34,14 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # 允许跨域页面的脚本读取 Server-Timing 响应头
+        expose_headers=["Server-Timing"],
     )
 
+# 请求级 SQL 执行统计：Server-Timing 响应头与 N+1 检测
+if settings.DATABASE_QUERY_STATS:
+    app.add_middleware(QueryStatsMiddleware)
+
 
 @app.on_event("startup")
 async def startup_event():
@@ -37,18 +49,36 @@ async def startup_event():
     print(f"🚀 {settings.PROJECT_NAME} 正在启动...")
     # 连接 Redis
     await redis_client.connect()
+    # 订阅跨 worker 的缓存失效通知
+    cache_service.start()
     # 连接 MQTT
     mqtt_client.connect_async()
+    # 启动只读副本健康检查
+    replica_set.start()
+    # 启动 Item 计数器后台对账
+    item_counter_service.start()
+    # 启动 Item 后台归档
+    item_archive_service.start()
     print(f"📝 API 文档地址: http://{settings.HOST}:{settings.PORT}{settings.API_V1_STR}/docs")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """应用关闭时的事件处理"""
+    # 停止 Item 后台归档
+    await item_archive_service.stop()
+    # 停止 Item 计数器后台对账
+    await item_counter_service.stop()
+    # 停止缓存失效通知订阅
+    await cache_service.stop()
     # 断开 Redis
     await redis_client.disconnect()
     # 断开 MQTT
     mqtt_client.disconnect()
+    # 停止只读副本健康检查并释放连接池
+    await replica_set.stop()
+    # 释放异步数据库连接池
+    await async_engine.dispose()
     print(f"🛑 {settings.PROJECT_NAME} 正在关闭...")
 
 
@@ -1,6 +1,6 @@
 """
 数据模型包
 """
-from app.models.item import Item
+from app.models.item import Item, ItemArchive
 
-__all__ = ["Item"]
+__all__ = ["Item", "ItemArchive"]
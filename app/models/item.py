@@ -2,10 +2,30 @@
 示例数据模型 - Item
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from typing import Optional, Sequence
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Index, func, literal_column
 
 from app.db.session import Base
 
+# PostgreSQL 全文检索使用的分词配置（中文可安装 zhparser 等扩展后替换）
+SEARCH_TS_CONFIG = "simple"
+
+
+def item_search_vector(title, description):
+    """
+    PostgreSQL 全文检索的文档向量表达式
+
+    GIN 表达式索引与查询必须使用完全相同的表达式才能命中索引，
+    因此常量全部以字面量渲染，不使用绑定参数。
+    """
+    document = (
+        func.coalesce(title, literal_column("''"))
+        .concat(literal_column("' '"))
+        .concat(func.coalesce(description, literal_column("''")))
+    )
+    return func.to_tsvector(literal_column(f"'{SEARCH_TS_CONFIG}'"), document)
+
 
 class Item(Base):
     """物品模型"""
@@ -22,5 +42,73 @@ class Item(Base):
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment="更新时间"
     )
 
+    __table_args__ = (
+        # 复合索引：与按 status / is_active 过滤、按 (created_at, id) 排序的分页查询匹配
+        Index("ix_items_status_active_created", status, is_active, created_at, id),
+        Index("ix_items_status_created", status, created_at, id),
+        Index("ix_items_active_created", is_active, created_at, id),
+        Index("ix_items_created", created_at, id),
+        # 全文索引：MySQL 使用 ngram 解析器以支持中文分词
+        Index(
+            "ft_items_title_description",
+            title,
+            description,
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ).ddl_if(dialect="mysql"),
+        Index(
+            "ix_items_search_vector",
+            item_search_vector(title, description),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
+
     def __repr__(self):
         return f"<Item(id={self.id}, title={self.title})>"
+
+
+class ItemArchive(Base):
+    """已归档的物品（冷数据）
+
+    列与 Item 一致，保留原主键；由归档任务从 items 表迁移而来（见 item_archive_service）。
+    """
+
+    __tablename__ = "items_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False, comment="主键ID（沿用 items.id）")
+    title = Column(String(200), nullable=False, comment="标题")
+    description = Column(Text, nullable=True, comment="描述")
+    status = Column(String(50), comment="状态")
+    is_active = Column(Boolean, comment="是否激活")
+    created_at = Column(DateTime, comment="创建时间")
+    updated_at = Column(DateTime, comment="更新时间")
+    archived_at = Column(DateTime, nullable=False, default=datetime.utcnow, comment="归档时间")
+
+    __table_args__ = (
+        # 与 items 表的复合索引对应，include_archived 查询按相同条件过滤、排序
+        Index("ix_items_archive_status_active_created", status, is_active, created_at, id),
+        Index("ix_items_archive_created", created_at, id),
+    )
+
+    def __repr__(self):
+        return f"<ItemArchive(id={self.id}, title={self.title})>"
+
+
+# Item 的全部列名（与 ItemArchive 共有）
+ITEM_COLUMNS = tuple(column.name for column in Item.__table__.columns)
+
+
+def item_select_columns(fields: Optional[Sequence[str]] = None, model=Item) -> list:
+    """
+    查询的列：fields 为 None 时返回整个实体，否则只返回指定的列
+
+    Args:
+        fields: 需要的字段名
+        model: Item 或 ItemArchive
+
+    Returns:
+        可传给 select() 的列表达式列表
+    """
+    if fields is None:
+        return [model]
+    return [getattr(model, field) for field in fields]
@@ -3,7 +3,7 @@ Item 相关的 Pydantic Schema
 用于请求验证和响应序列化
 """
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from pydantic import BaseModel, Field
 
 
@@ -47,13 +47,110 @@ class ItemResponse(ItemInDB):
     pass
 
 
+class ItemPartialResponse(BaseModel):
+    """按 fields 参数只返回部分字段的 Item 响应 Schema"""
+
+    id: Optional[int] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[str] = None
+    is_active: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
 class ItemListResponse(BaseModel):
     """Item 分页列表响应 Schema
 
-    用于演示标准分页返回结构
+    用于演示标准分页返回结构，同时支持偏移量分页与游标分页
     """
 
-    total: int = Field(..., description="总记录数")
+    total: Optional[int] = Field(
+        None, description="总记录数（来自计数器时为近似值，未请求统计时为空）"
+    )
     items: List[ItemResponse] = Field(..., description="当前页数据列表")
     skip: int = Field(..., description="跳过的记录数")
     limit: int = Field(..., description="返回的最大记录数")
+    next_cursor: Optional[str] = Field(None, description="下一页游标，为空表示没有更多数据")
+
+
+class ItemPartialListResponse(ItemListResponse):
+    """按 fields 参数只返回部分字段的 Item 分页列表响应 Schema"""
+
+    items: List[ItemPartialResponse] = Field(..., description="当前页数据列表（仅含请求的字段）")
+
+
+class ItemBulkCreateRequest(BaseModel):
+    """批量创建 Item 的请求 Schema
+
+    每行按 ItemCreate 单独校验，校验失败的行会出现在结果的 errors 中，不影响其它行
+    """
+
+    items: List[Dict[str, Any]] = Field(..., min_length=1, description="待创建的 Item 列表")
+
+
+class ItemBulkUpdateRow(ItemUpdate):
+    """批量更新中的单行数据"""
+
+    id: int = Field(..., description="Item ID")
+
+
+class ItemBulkUpdateRequest(BaseModel):
+    """批量更新 Item 的请求 Schema
+
+    每行按 ItemBulkUpdateRow 单独校验（必须包含 id），仅更新显式传入的字段
+    """
+
+    items: List[Dict[str, Any]] = Field(..., min_length=1, description="待更新的 Item 列表")
+
+
+class ItemBulkDeleteRequest(BaseModel):
+    """批量删除 Item 的请求 Schema"""
+
+    ids: List[int] = Field(..., min_length=1, description="待删除的 Item ID 列表")
+
+
+class ItemBulkError(BaseModel):
+    """批量操作中单行的错误信息"""
+
+    index: int = Field(..., description="该行在请求列表中的下标（从 0 开始）")
+    id: Optional[int] = Field(None, description="Item ID（更新/删除时）")
+    detail: Any = Field(..., description="错误信息")
+
+
+class ItemBulkResult(BaseModel):
+    """批量操作结果 Schema"""
+
+    succeeded: int = Field(0, description="成功的行数")
+    failed: int = Field(0, description="失败的行数")
+    ids: List[int] = Field(
+        default_factory=list,
+        description="成功处理的 Item ID（数据库不支持批量 RETURNING 时批量创建不返回 ID）",
+    )
+    errors: List[ItemBulkError] = Field(default_factory=list, description="失败行的错误信息")
+
+
+class ItemStatsBreakdown(BaseModel):
+    """按 (status, is_active) 统计的 Item 数量"""
+
+    status: Optional[str] = Field(None, description="状态")
+    is_active: Optional[bool] = Field(None, description="是否激活")
+    count: int = Field(..., description="数量")
+
+
+class ItemStatsBucket(BaseModel):
+    """按创建时间分桶的 Item 数量"""
+
+    start: datetime = Field(..., description="分桶起始时间（UTC）")
+    count: int = Field(..., description="该时间段内创建、且仍在 items 表中的 Item 数量")
+
+
+class ItemStatsResponse(BaseModel):
+    """Item 统计响应 Schema（由预先维护的计数器生成，不含已归档的 Item）"""
+
+    bucket: str = Field(..., description="创建时间分桶粒度 hour/day")
+    total: int = Field(..., description="Item 总数")
+    by_status: Dict[str, int] = Field(..., description="按状态统计")
+    by_is_active: Dict[str, int] = Field(..., description="按是否激活统计（键为 true/false）")
+    by_status_active: List[ItemStatsBreakdown] = Field(..., description="按状态与是否激活统计")
+    created: List[ItemStatsBucket] = Field(..., description="按创建时间分桶统计")
@@ -1,9 +1,20 @@
 """
 业务逻辑层包
 """
-from app.services.item_service import ItemService
+from app.services.item_service import AsyncItemService
 from app.services.file_service import file_service
 from app.services.cache_service import cache_service
+from app.services.item_archive_service import item_archive_service
+from app.services.item_counter_service import item_counter_service
+from app.services.item_version_service import item_version_service
 from app.services.message_service import message_service
 
-__all__ = ["ItemService", "file_service", "cache_service", "message_service"]
+__all__ = [
+    "AsyncItemService",
+    "file_service",
+    "cache_service",
+    "item_archive_service",
+    "item_counter_service",
+    "item_version_service",
+    "message_service",
+]
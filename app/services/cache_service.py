@@ -1,79 +1,723 @@
 """
 缓存服务模块
 封装基于 Redis 的业务缓存逻辑
+
+Item 详情缓存分两级：
+- L1：进程内 LRU + TTL 缓存（CACHE_L1_*），命中时无网络往返、无需 json.loads
+- L2：Redis（item:{id}）
+写入、删除详情缓存时通过 Redis pub/sub 通知其他 worker 淘汰各自的 L1；
+订阅断开期间可能漏掉通知，因此重连后会清空 L1，L1 的 TTL 也应保持较短。
+
+Item 列表缓存按归一化的查询参数分键（item:list:{摘要}），并带有标签：
+- 标签版本号保存在 cache:tag:{item}:<标签>，列表缓存中记录写入时的版本号，读取时不一致即视为失效
+- Item 写操作提交后只更新受影响标签的版本号（items:all 以及变更前后的 status、is_active），
+  其他条件的列表缓存不受影响
+
+Item 写操作（AsyncItemService、批量接口、归档）提交后，post-commit 钩子按事务批量删除
+被修改、删除的 item:{id} 并更新列表标签，缓存无需依赖较短的 TTL 保证一致。
 """
-from typing import Any, Optional
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
+from app.core.config import settings
+from app.services.item_events import ItemChange, register_post_commit_hook
+from app.utils.local_cache import LocalCache, hit_ratio
+from app.utils.logger import logger
 from app.utils.redis_client import redis_client
 
+# 跨 worker 淘汰 L1 的 pub/sub 频道
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# 列表缓存键前缀、标签版本号键前缀、已使用过的标签集合
+# 标签版本号键共用 hash tag {item}，集群模式下位于同一个槽，可以一次 MGET 读取
+LIST_KEY_PREFIX = "item:list:"
+TAG_KEY_PREFIX = "cache:tag:{item}:"
+LIST_TAGS_KEY = "cache:tags:item"
+
+# 不带过滤条件的列表依赖全部 Item，任何 Item 变更都会使其失效
+ALL_ITEMS_TAG = "items:all"
+
+
+# 回源函数：异步、无参数，返回 None 表示数据不存在
+Loader = Callable[[], Awaitable[Optional[Any]]]
+
+
+def _item_key(item_id: int) -> str:
+    """Item 详情缓存键"""
+    return f"item:{item_id}"
+
+
+def _lock_key(key: str) -> str:
+    """回源锁键"""
+    return f"lock:{key}"
+
+
+def _delta_key(key: str) -> str:
+    """上次回源耗时（秒）的键，XFetch 据此决定提前刷新的时间"""
+    return f"{key}:delta"
+
+
+def _refresh_early(ttl_ms: int, delta: Optional[str]) -> bool:
+    """
+    XFetch：剩余存活时间小于 回源耗时 × beta × -ln(随机数) 时提前刷新
+
+    Args:
+        ttl_ms: 缓存剩余存活时间（毫秒，PTTL 的结果，无过期时间时为负数）
+        delta: 上次回源耗时（秒）
+
+    Returns:
+        是否提前刷新
+    """
+    beta = settings.CACHE_XFETCH_BETA
+    if beta <= 0 or delta is None or ttl_ms is None or ttl_ms < 0:
+        return False
+    # 1 - random() 的取值范围为 (0, 1]，避免 log(0)
+    return -float(delta) * beta * math.log(1.0 - random.random()) * 1000 >= ttl_ms
+
+
+def _tag_key(tag: str) -> str:
+    """标签版本号键"""
+    return f"{TAG_KEY_PREFIX}{tag}"
+
+
+def _new_version() -> str:
+    """新的标签版本号（随机值，标签键被淘汰后重新初始化也不会与旧版本号相同）"""
+    return uuid.uuid4().hex
+
+
+def _status_tag(status: Optional[str]) -> str:
+    """status 标签"""
+    return f"status:{status}"
+
+
+def _active_tag(is_active: Optional[bool]) -> str:
+    """is_active 标签"""
+    return f"active:{json.dumps(is_active)}"
+
+
+def item_list_key(query: Dict[str, Any]) -> str:
+    """
+    列表缓存键：查询参数归一化（忽略值为 None 的参数、按参数名排序）后取摘要
+
+    Args:
+        query: 列表查询参数（skip、limit、status、is_active、order 等）
+
+    Returns:
+        缓存键
+    """
+    normalized = json.dumps(
+        {name: value for name, value in query.items() if value is not None},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return LIST_KEY_PREFIX + hashlib.sha1(normalized.encode()).hexdigest()
+
+
+def item_list_tags(query: Dict[str, Any]) -> List[str]:
+    """
+    列表依赖的标签：只取最窄的过滤维度
+
+    按 status 过滤的列表只依赖该 status 的 Item（status:{status}），
+    只按 is_active 过滤的列表依赖 active:{true|false}，不带过滤条件的列表依赖 items:all。
+
+    Args:
+        query: 列表查询参数
+
+    Returns:
+        标签列表
+    """
+    if query.get("status") is not None:
+        return [_status_tag(query["status"])]
+    if query.get("is_active") is not None:
+        return [_active_tag(query["is_active"])]
+    return [ALL_ITEMS_TAG]
+
+
+def item_change_tags(changes: Iterable[ItemChange]) -> Set[str]:
+    """
+    Item 变更影响的标签：items:all 以及变更前后所在的 status、is_active 标签
+
+    Args:
+        changes: Item 变更
+
+    Returns:
+        标签集合
+    """
+    tags = {ALL_ITEMS_TAG}
+    for change in changes:
+        for key in (change.old_key, change.new_key):
+            if key is not None:
+                status, is_active = key
+                tags.add(_status_tag(status))
+                tags.add(_active_tag(is_active))
+    return tags
+
 
 class CacheService:
     """缓存服务类"""
 
-    @staticmethod
-    async def set_item_cache(item_id: int, item_data: Any, expire_seconds: int = 300):
+    def __init__(self):
+        """初始化缓存服务"""
+        self.local = LocalCache(
+            max_items=settings.CACHE_L1_MAX_ITEMS if settings.CACHE_L1_ENABLED else 0,
+            ttl_seconds=settings.CACHE_L1_TTL_SECONDS,
+        )
+        # 本进程发出的失效通知带上该标识，收到时跳过
+        self._instance_id = uuid.uuid4().hex
+        self._task: Optional[asyncio.Task] = None
+        # 进行中的回源：键 -> Future
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.invalidations_received = 0
+        self.loads = 0
+        self.coalesced = 0
+        self.load_waits = 0
+        self.early_refreshes = 0
+
+    async def set_item_cache(self, item_id: int, item_data: Any, expire_seconds: int = 300):
         """
-        设置 Item 详情缓存
-        
+        设置 Item 详情缓存（同时写入 L1 与 Redis，并通知其他 worker 淘汰旧的 L1）
+
         Args:
             item_id: Item ID
             item_data: Item 数据
             expire_seconds: 过期时间
         """
-        key = f"item:{item_id}"
-        await redis_client.set_cache(key, item_data, ex=expire_seconds)
+        key = _item_key(item_id)
+        self.local.set(key, item_data, expire_seconds)
+        if await redis_client.set_cache(key, item_data, ex=expire_seconds):
+            await self.publish_invalidation([key])
 
-    @staticmethod
-    async def get_item_cache(item_id: int) -> Optional[Any]:
+    async def get_item_cache(self, item_id: int) -> Optional[Any]:
         """
-        获取 Item 详情缓存
-        
+        获取 Item 详情缓存：先查 L1，未命中再查 Redis 并回填 L1
+
+        返回的对象可能被多个请求共享，调用方不应修改。
+
         Args:
             item_id: Item ID
-            
+
         Returns:
             Item 数据或 None
         """
-        key = f"item:{item_id}"
-        return await redis_client.get_cache(key)
+        key = _item_key(item_id)
+        value = self.local.get(key)
+        if value is not None:
+            return value
+        value = await redis_client.get_cache(key)
+        self._count_l2(value is not None)
+        if value is not None:
+            self.local.set(key, value)
+        return value
 
-    @staticmethod
-    async def delete_item_cache(item_id: int):
+    async def delete_item_cache(self, item_id: int):
         """
-        删除 Item 详情缓存
-        
+        删除 Item 详情缓存（Redis 与所有 worker 的 L1）
+
         Args:
             item_id: Item ID
         """
-        key = f"item:{item_id}"
+        key = _item_key(item_id)
+        self.local.delete([key])
         await redis_client.delete_cache(key)
+        await self.publish_invalidation([key])
+
+    async def get_items_cache(self, item_ids: List[int]) -> Dict[int, Any]:
+        """
+        批量获取 Item 详情缓存：先查 L1，其余一次 MGET
+
+        Args:
+            item_ids: Item ID 列表
+
+        Returns:
+            命中缓存的 {Item ID: Item 数据}，Redis 不可用时只返回 L1 命中的部分
+        """
+        found: Dict[int, Any] = {}
+        misses: List[int] = []
+        for item_id in item_ids:
+            value = self.local.get(_item_key(item_id))
+            if value is not None:
+                found[item_id] = value
+            else:
+                misses.append(item_id)
+        if not misses:
+            return found
+        values = await redis_client.mget_cache([_item_key(item_id) for item_id in misses])
+        for item_id, value in zip(misses, values):
+            self._count_l2(value is not None)
+            if value is not None:
+                found[item_id] = value
+                self.local.set(_item_key(item_id), value)
+        return found
+
+    async def set_items_cache(self, items: Dict[int, Any], expire_seconds: int = 300):
+        """
+        批量设置 Item 详情缓存（同时写入 L1，Redis 一次往返，并通知其他 worker 淘汰旧的 L1）
+
+        Args:
+            items: {Item ID: Item 数据}
+            expire_seconds: 过期时间
+        """
+        if not items:
+            return
+        values = {_item_key(item_id): value for item_id, value in items.items()}
+        for key, value in values.items():
+            self.local.set(key, value, expire_seconds)
+        if await redis_client.mset_cache(values, ex=expire_seconds):
+            await self.publish_invalidation(list(values))
+
+    # --- 防击穿读取：单飞 + Redis 锁 + XFetch 提前刷新 ---
+
+    async def get_or_load(
+        self, key: str, loader: Loader, expire_seconds: int = 300
+    ) -> Optional[Any]:
+        """
+        读取缓存，未命中时回源并写入缓存，热点键过期时不会造成回源洪峰
+
+        - 单飞：同一 worker 内同一个键同时只有一个回源，其余请求等待该回源的结果
+        - Redis 锁：跨 worker 只有持锁的 worker 回源，其余 worker 轮询等待缓存写入，
+          锁释放后仍未写入（回源结果为 None 或回源失败）时各自回源
+        - XFetch：缓存临近过期时按 回源耗时 × CACHE_XFETCH_BETA 以一定概率提前刷新，
+          越接近过期概率越高，刷新期间其他请求继续读取旧值
+
+        回源在独立的任务中执行，其他请求可能合并等待它的结果，发起回源的请求被取消后它仍会继续执行，
+        因此 loader 不能使用请求范围内的资源（例如 get_async_db 注入的会话），应自行打开会话。
+
+        Args:
+            key: 缓存键
+            loader: 回源函数（异步，无参数），返回 None 表示数据不存在，不写入缓存
+            expire_seconds: 过期时间
+
+        Returns:
+            缓存或回源得到的值
+        """
+        value = self.local.get(key)
+        if value is not None:
+            return value
+        if not redis_client.available:
+            # Redis 熔断中：只依靠进程内单飞回源，不访问 Redis
+            return await self._single_flight(key, loader, expire_seconds)
+        try:
+            async with redis_client.pipeline() as pipe:
+                pipe.get_cache(key).pttl(key).get(_delta_key(key))
+            value, ttl_ms, delta = pipe.results
+        except Exception as e:
+            logger.error(f"Redis 读取缓存失败: {e}")
+            return await self._single_flight(key, loader, expire_seconds)
+        self._count_l2(value is not None)
+        if value is None:
+            return await self._single_flight(key, loader, expire_seconds)
+
+        if key not in self._inflight and _refresh_early(ttl_ms, delta):
+            self.early_refreshes += 1
+            try:
+                return await self._single_flight(key, loader, expire_seconds, stale=value)
+            except Exception as e:
+                logger.error(f"缓存提前刷新失败 {key}: {e}")
+                return value
+        self.local.set(key, value)
+        return value
+
+    async def get_item_or_load(
+        self, item_id: int, loader: Loader, expire_seconds: int = 300
+    ) -> Optional[Any]:
+        """
+        读取 Item 详情缓存，未命中时回源（见 get_or_load）
+
+        Args:
+            item_id: Item ID
+            loader: 回源函数，Item 不存在时返回 None
+            expire_seconds: 过期时间
+
+        Returns:
+            Item 数据或 None
+        """
+        return await self.get_or_load(_item_key(item_id), loader, expire_seconds)
+
+    async def _single_flight(
+        self, key: str, loader: Loader, expire_seconds: int, stale: Optional[Any] = None
+    ) -> Optional[Any]:
+        """同一个键同时只有一个回源，其余调用等待其结果"""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._load(key, loader, expire_seconds, stale))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # shield：某个等待者被取消时不影响回源本身和其他等待者
+        return await asyncio.shield(future)
+
+    async def _load(
+        self, key: str, loader: Loader, expire_seconds: int, stale: Optional[Any]
+    ) -> Optional[Any]:
+        """获取跨 worker 回源锁后回源并写入缓存，锁被占用时等待持锁 worker 的结果"""
+        lock_key = _lock_key(key)
+        token = uuid.uuid4().hex
+        acquired = False
+        if redis_client.available:
+            try:
+                async with redis_client.guarded() as client:
+                    acquired = await client.set(
+                        lock_key, token, nx=True, px=settings.CACHE_LOAD_LOCK_MS
+                    )
+            except Exception as e:
+                # Redis 不可用：直接回源，进程内单飞仍然有效
+                logger.error(f"Redis 获取回源锁失败: {e}")
+            else:
+                if not acquired:
+                    if stale is not None:
+                        # 其他 worker 正在刷新，继续使用旧值
+                        return stale
+                    self.load_waits += 1
+                    value = await self._wait_for(key, lock_key)
+                    if value is not None:
+                        return value
 
-    # --- 示例：缓存列表 ---
+        try:
+            started = time.monotonic()
+            value = await loader()
+            delta = time.monotonic() - started
+            self.loads += 1
+            if value is not None:
+                self.local.set(key, value, expire_seconds)
+            if value is not None and redis_client.available:
+                try:
+                    async with redis_client.pipeline() as pipe:
+                        pipe.set_cache(key, value, ex=expire_seconds)
+                        pipe.set(_delta_key(key), round(delta, 6), ex=expire_seconds)
+                except Exception as e:
+                    logger.error(f"Redis 写入缓存失败: {e}")
+                else:
+                    # 提前刷新会覆盖旧值，其他 worker 的 L1 中可能仍是旧值
+                    await self.publish_invalidation([key])
+            return value
+        finally:
+            if acquired:
+                await self._release_lock(lock_key, token)
+
+    async def _wait_for(self, key: str, lock_key: str) -> Optional[Any]:
+        """
+        等待持锁的 worker 写入缓存
+
+        Returns:
+            缓存的值；锁已释放但仍未写入或等待超时时返回 None
+        """
+        deadline = time.monotonic() + settings.CACHE_LOAD_LOCK_MS / 1000
+        while time.monotonic() < deadline:
+            await asyncio.sleep(settings.CACHE_LOAD_WAIT_MS / 1000)
+            try:
+                async with redis_client.pipeline() as pipe:
+                    pipe.get_cache(key).exists(lock_key)
+                value, locked = pipe.results
+            except Exception as e:
+                logger.error(f"Redis 等待回源结果失败: {e}")
+                return None
+            if value is not None:
+                self.local.set(key, value)
+                return value
+            if not locked:
+                return None
+        return None
 
     @staticmethod
-    async def set_item_list_cache(list_data: Any, expire_seconds: int = 60):
+    async def _release_lock(lock_key: str, token: str):
+        """释放回源锁（锁已过期并被其他 worker 获取时不删除）"""
+        try:
+            async with redis_client.guarded() as client:
+                if await client.get(lock_key) == token:
+                    await client.delete(lock_key)
+        except Exception as e:
+            logger.error(f"Redis 释放回源锁失败: {e}")
+
+    # --- 两级缓存：命中率与跨 worker 失效 ---
+
+    def _count_l2(self, hit: bool) -> None:
+        """记录一次 Redis 读取是否命中"""
+        if hit:
+            self.l2_hits += 1
+        else:
+            self.l2_misses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        各级缓存的命中率
+
+        L1 的未命中会继续查询 Redis，因此 L2 的访问数等于 L1 的未命中数（Redis 不可用时除外）。
+
+        Returns:
+            {"l1": {...}, "l2": {...}, "overall_hit_ratio": ...}
+        """
+        l1 = self.local.stats()
+        hits = l1["hits"] + self.l2_hits
+        return {
+            "l1": {**l1, "enabled": settings.CACHE_L1_ENABLED},
+            "l2": {
+                "hits": self.l2_hits,
+                "misses": self.l2_misses,
+                "hit_ratio": hit_ratio(self.l2_hits, self.l2_misses),
+            },
+            "overall_hit_ratio": hit_ratio(hits, l1["hits"] + l1["misses"] - hits),
+            "invalidations_received": self.invalidations_received,
+            "loads": {
+                "loads": self.loads,
+                "coalesced": self.coalesced,
+                "waits": self.load_waits,
+                "early_refreshes": self.early_refreshes,
+                "inflight": len(self._inflight),
+            },
+            "subscribed": self._task is not None and not self._task.done(),
+        }
+
+    async def publish_invalidation(self, keys: List[str]):
+        """
+        通知其他 worker 淘汰 L1 中的键
+
+        Args:
+            keys: 缓存键
+        """
+        if not settings.CACHE_L1_ENABLED or not keys or not redis_client.available:
+            return
+        try:
+            message = json.dumps({"origin": self._instance_id, "keys": keys})
+            async with redis_client.guarded() as client:
+                await client.publish(INVALIDATION_CHANNEL, message)
+        except Exception as e:
+            logger.error(f"Redis 发布缓存失效通知失败: {e}")
+
+    def _on_invalidation(self, data: str) -> None:
+        """处理收到的失效通知"""
+        try:
+            message = json.loads(data)
+        except ValueError:
+            return
+        if message.get("origin") == self._instance_id:
+            return
+        self.invalidations_received += 1
+        self.local.delete(message.get("keys", []))
+
+    async def _subscribe_loop(self):
+        """订阅失效通知，断开后重连"""
+        while True:
+            if not redis_client.available:
+                # Redis 熔断中：等待恢复后再订阅
+                await asyncio.sleep(settings.CACHE_L1_RESUBSCRIBE_SECONDS)
+                continue
+            pubsub = None
+            try:
+                pubsub = redis_client.client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # 订阅建立之前的通知可能已丢失，清空 L1
+                self.local.clear()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._on_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"缓存失效通知订阅中断: {e}")
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+            await asyncio.sleep(settings.CACHE_L1_RESUBSCRIBE_SECONDS)
+
+    def start(self):
+        """启动失效通知订阅（应用启动时、Redis 连接之后调用）"""
+        if settings.CACHE_L1_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._subscribe_loop())
+
+    async def stop(self):
+        """停止失效通知订阅（应用关闭时、断开 Redis 之前调用）"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # --- 列表缓存：按查询参数分键，按标签版本号失效 ---
+
+    async def _list_tag_versions(self, tags: List[str]) -> Dict[str, str]:
+        """
+        读取标签的当前版本号，不存在的标签先初始化
+
+        Args:
+            tags: 标签
+
+        Returns:
+            {标签: 版本号}
+        """
+        keys = [_tag_key(tag) for tag in tags]
+        async with redis_client.guarded() as client:
+            values = await client.mget(keys)
+            missing = [tag for tag, value in zip(tags, values) if value is None]
+            if missing:
+                pipe = client.pipeline(transaction=False)
+                for tag in missing:
+                    # NX：并发初始化时以先写入的版本号为准
+                    pipe.set(_tag_key(tag), _new_version(), nx=True)
+                pipe.sadd(LIST_TAGS_KEY, *missing)
+                await pipe.execute()
+                values = await client.mget(keys)
+        return dict(zip(tags, values))
+
+    async def get_item_list_cache(
+        self, query: Dict[str, Any]
+    ) -> Tuple[Optional[Any], Dict[str, str]]:
+        """
+        获取 Item 列表缓存（缓存与标签版本号一次 pipeline 读取）
+
+        缓存写入时记录的标签版本号与当前版本号不一致时视为未命中。
+        返回的版本号应传给 set_item_list_cache：回源期间有写操作提交时，
+        写入的缓存带着旧版本号，下次读取即失效，不会把回源前读到的旧数据当作最新数据缓存。
+
+        Args:
+            query: 列表查询参数
+
+        Returns:
+            (列表数据或 None, 当前标签版本号)
+        """
+        tags = item_list_tags(query)
+        if not redis_client.available:
+            return None, {}
+        try:
+            async with redis_client.pipeline() as pipe:
+                pipe.get_cache(item_list_key(query)).mget([_tag_key(tag) for tag in tags])
+            entry, values = pipe.results
+            versions = dict(zip(tags, values))
+            if None in values:
+                versions = await self._list_tag_versions(tags)
+        except Exception as e:
+            logger.error(f"Redis 读取 Item 列表缓存失败: {e}")
+            return None, {}
+        if entry and entry.get("tags") == versions:
+            return entry.get("data"), versions
+        return None, versions
+
+    async def set_item_list_cache(
+        self,
+        query: Dict[str, Any],
+        list_data: Any,
+        versions: Optional[Dict[str, str]] = None,
+        expire_seconds: int = 60,
+    ):
         """
         设置 Item 列表缓存
+
+        Args:
+            query: 列表查询参数
+            list_data: 列表数据
+            versions: 回源前由 get_item_list_cache 返回的标签版本号，不提供时读取当前版本号
+            expire_seconds: 过期时间
         """
-        key = "item:list:all"
-        await redis_client.set_cache(key, list_data, ex=expire_seconds)
+        if not redis_client.available:
+            return
+        try:
+            if not versions:
+                versions = await self._list_tag_versions(item_list_tags(query))
+        except Exception as e:
+            logger.error(f"Redis 读取缓存标签版本号失败: {e}")
+            return
+        entry = {"tags": versions, "data": list_data}
+        await redis_client.set_cache(item_list_key(query), entry, ex=expire_seconds)
 
     @staticmethod
-    async def get_item_list_cache() -> Optional[Any]:
+    def _queue_tag_bumps(pipe, tags: List[str]) -> None:
+        """在 pipeline 中写入标签的新版本号"""
+        for tag in tags:
+            pipe.set(_tag_key(tag), _new_version())
+        pipe.sadd(LIST_TAGS_KEY, *tags)
+
+    async def invalidate_item_list_tags(self, tags: Iterable[str]):
         """
-        获取 Item 列表缓存
+        更新标签版本号，使带有这些标签的列表缓存全部失效（一次 pipeline）
+
+        Args:
+            tags: 标签
         """
-        key = "item:list:all"
-        return await redis_client.get_cache(key)
+        tags = list(tags)
+        if not tags:
+            return
+        try:
+            async with redis_client.pipeline() as pipe:
+                self._queue_tag_bumps(pipe, tags)
+        except Exception as e:
+            logger.error(f"Redis 更新缓存标签版本号失败: {e}")
 
-    @staticmethod
-    async def delete_item_list_cache():
+    async def delete_item_list_cache(self, query: Optional[Dict[str, Any]] = None):
         """
         删除 Item 列表缓存
+
+        Args:
+            query: 列表查询参数，不提供时使全部列表缓存失效
         """
-        key = "item:list:all"
-        await redis_client.delete_cache(key)
+        if query is not None:
+            await redis_client.delete_cache(item_list_key(query))
+            return
+        try:
+            async with redis_client.guarded() as client:
+                tags = await client.smembers(LIST_TAGS_KEY)
+        except Exception as e:
+            logger.error(f"Redis 读取缓存标签失败: {e}")
+            return
+        await self.invalidate_item_list_tags(tags)
+
+    # --- 写操作提交后的缓存失效 ---
+
+    async def apply(self, changes: List[ItemChange]):
+        """
+        根据已提交的变更使缓存失效（post-commit 钩子，一个事务一次 pipeline）
+
+        - 被修改、删除（含归档）的 Item：删除 Redis 中的详情缓存，并通知所有 worker 淘汰 L1
+        - 列表缓存：更新受影响标签的版本号
+        详情缓存采用失效而不是写入新值，并发写操作的钩子乱序执行时也不会留下旧值。
+
+        Args:
+            changes: 本次事务内的 Item 变更
+        """
+        # 新建的 Item（只有 new_key）不会有详情缓存，无需删除
+        item_keys = sorted(
+            {
+                _item_key(change.item_id)
+                for change in changes
+                if change.item_id is not None
+                and (change.old_key is not None or change.new_key is None)
+            }
+        )
+        self.local.delete(item_keys)
+        if not redis_client.available:
+            # Redis 熔断中：只能淘汰本进程的 L1，Redis 中的缓存依赖 TTL 过期
+            return
+        try:
+            if any(change.old_key is None and change.new_key is None for change in changes):
+                # 变更前后的过滤维度都未知，无法确定受影响的标签，使全部列表缓存失效
+                async with redis_client.guarded() as client:
+                    tags = list(await client.smembers(LIST_TAGS_KEY))
+            else:
+                tags = sorted(item_change_tags(changes))
+            async with redis_client.pipeline() as pipe:
+                # 逐个 DEL：集群模式下这些键分布在不同的槽
+                for key in item_keys:
+                    pipe.delete(key)
+                if tags:
+                    self._queue_tag_bumps(pipe, tags)
+        except Exception as e:
+            logger.error(f"Redis 提交后缓存失效失败: {e}")
+        await self.publish_invalidation(item_keys)
 
 
 # 创建全局缓存服务实例
 cache_service = CacheService()
+
+register_post_commit_hook(cache_service.apply)
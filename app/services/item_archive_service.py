@@ -0,0 +1,149 @@
+"""
+Item 归档服务模块
+把满足保留策略的冷数据（未激活且创建时间早于 ITEM_ARCHIVE_AFTER_DAYS 天）
+从 items 表迁移到 items_archive 表，缩小热表，降低过滤扫描与计数的代价：
+- 每批在一个事务内 INSERT ... SELECT 到归档表并从 items 删除，批次之间短暂停顿，避免长事务与长时间锁表
+- 删除通过 post-commit 钩子分发，计数器、版本号等缓存随之更新
+- 多个 worker 同时运行时，通过 Redis 锁保证一个周期内只有一个 worker 执行归档
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, false, insert, literal, select
+
+from app.core.config import settings
+from app.db.routing import USE_PRIMARY
+from app.db.session import AsyncSessionLocal
+from app.models.item import ITEM_COLUMNS, Item, ItemArchive
+from app.services import item_events
+from app.services.item_events import ItemChange, record_item_change
+from app.utils.logger import logger
+from app.utils.redis_client import redis_client
+
+ARCHIVE_LOCK_KEY = "item:archive:lock"
+
+
+class ItemArchiveService:
+    """Item 归档服务类"""
+
+    def __init__(self):
+        """初始化归档服务"""
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def cutoff(now: Optional[datetime] = None) -> datetime:
+        """归档截止时间：创建时间早于该时间的未激活 Item 会被归档"""
+        now = now or datetime.utcnow()
+        return now - timedelta(days=settings.ITEM_ARCHIVE_AFTER_DAYS)
+
+    @staticmethod
+    async def archive_batch(cutoff: datetime, batch_size: int) -> int:
+        """
+        归档一批 Item（单个事务）
+
+        Args:
+            cutoff: 归档截止时间
+            batch_size: 本批最多归档的行数
+
+        Returns:
+            本批归档的行数
+        """
+        async with AsyncSessionLocal(info={USE_PRIMARY: True}) as db:
+            # 按 (is_active, created_at, id) 索引顺序取一批并加锁，跳过正在被其他事务修改的行
+            candidates = (
+                select(Item.id, Item.status, Item.is_active, Item.created_at)
+                .where(Item.is_active == false(), Item.created_at < cutoff)
+                .order_by(Item.created_at, Item.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = (await db.execute(candidates)).all()
+            if not rows:
+                return 0
+
+            item_ids = [row.id for row in rows]
+            columns = [getattr(Item, name) for name in ITEM_COLUMNS]
+            await db.execute(
+                insert(ItemArchive).from_select(
+                    [*ITEM_COLUMNS, "archived_at"],
+                    select(*columns, literal(datetime.utcnow())).where(Item.id.in_(item_ids)),
+                )
+            )
+            await db.execute(
+                delete(Item)
+                .where(Item.id.in_(item_ids))
+                .execution_options(synchronize_session=False)
+            )
+            for row in rows:
+                record_item_change(
+                    db,
+                    ItemChange(
+                        row.id, old_key=(row.status, row.is_active), created_at=row.created_at
+                    ),
+                )
+            await item_events.commit(db)
+        return len(item_ids)
+
+    async def run_once(self, cutoff: Optional[datetime] = None) -> int:
+        """
+        按批归档全部满足条件的 Item
+
+        单次运行不超过一个归档周期，剩余的数据留到下一个周期继续。
+
+        Args:
+            cutoff: 归档截止时间，默认按 ITEM_ARCHIVE_AFTER_DAYS 计算
+
+        Returns:
+            本次归档的行数；其他 worker 正在归档时返回 0
+        """
+        lock_seconds = max(settings.ITEM_ARCHIVE_INTERVAL_SECONDS - 1, 1)
+        async with redis_client.guarded() as client:
+            acquired = await client.set(ARCHIVE_LOCK_KEY, "1", nx=True, ex=lock_seconds)
+        if not acquired:
+            return 0
+
+        cutoff = cutoff or self.cutoff()
+        batch_size = settings.ITEM_ARCHIVE_BATCH_SIZE
+        deadline = time.monotonic() + lock_seconds
+        total = 0
+        while time.monotonic() < deadline:
+            archived = await self.archive_batch(cutoff, batch_size)
+            total += archived
+            if archived < batch_size:
+                break
+            await asyncio.sleep(settings.ITEM_ARCHIVE_BATCH_PAUSE_SECONDS)
+        if total:
+            logger.info(f"Item 归档完成，共 {total} 条（创建时间早于 {cutoff.isoformat()}）")
+        return total
+
+    async def _archive_loop(self):
+        """后台定期归档"""
+        while True:
+            # 归档依赖 Redis 锁，Redis 熔断中时跳过本周期
+            if redis_client.available:
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    logger.error(f"Item 归档失败: {e}")
+            await asyncio.sleep(settings.ITEM_ARCHIVE_INTERVAL_SECONDS)
+
+    def start(self):
+        """启动后台归档任务（应用启动时调用）"""
+        if settings.ITEM_ARCHIVE_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._archive_loop())
+
+    async def stop(self):
+        """停止后台归档任务（应用关闭时调用）"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# 创建全局归档服务实例
+item_archive_service = ItemArchiveService()
@@ -0,0 +1,280 @@
+"""
+Item 批量写入服务层
+- 创建：多行 INSERT（支持时带 RETURNING），按块执行
+- 更新：按主键的 executemany UPDATE，按块执行
+- 删除：WHERE id IN (...)，按块执行
+整个请求只提交一次事务；每个块在 SAVEPOINT 中执行，块失败时逐行重试以定位出错的行
+"""
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import Row, delete, insert, select, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.routing import use_primary
+from app.models.item import Item
+from app.schemas.item import (
+    ItemBulkError,
+    ItemBulkResult,
+    ItemBulkUpdateRow,
+    ItemCreate,
+)
+from app.services import item_events
+from app.services.item_events import ItemChange
+
+# (请求中的下标, 参数)
+IndexedRow = Tuple[int, Dict[str, Any]]
+# 一个块的处理结果：(成功的 ID, Item 变更, 行级错误)
+ChunkOutcome = Tuple[List[Optional[int]], List[ItemChange], List[ItemBulkError]]
+
+
+def _chunks(rows: Sequence[Any], size: int):
+    """按块切分"""
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def _validation_detail(e: ValidationError) -> List[Dict[str, Any]]:
+    """精简 Pydantic 校验错误，便于 JSON 返回"""
+    return e.errors(include_url=False, include_context=False, include_input=False)
+
+
+def _db_error_detail(e: DBAPIError) -> str:
+    """提取数据库错误信息"""
+    return str(getattr(e, "orig", None) or e)
+
+
+class ItemBulkService:
+    """Item 批量写入服务类"""
+
+    @staticmethod
+    async def _insert(db: AsyncSession, params: List[Dict[str, Any]]) -> List[Optional[int]]:
+        """执行一次多行 INSERT，返回与参数顺序一致的 ID 列表"""
+        if db.get_bind().dialect.insert_executemany_returning:
+            stmt = insert(Item).returning(Item.id, sort_by_parameter_order=True)
+            result = await db.execute(stmt, params)
+            return list(result.scalars().all())
+        # 例如 MySQL：驱动会把 executemany 改写为多行 VALUES，但拿不到每行的 ID
+        await db.execute(insert(Item), params)
+        return [None] * len(params)
+
+    @staticmethod
+    async def create(
+        db: AsyncSession, rows: List[Dict[str, Any]], chunk_size: int
+    ) -> ItemBulkResult:
+        """
+        批量创建 Item
+
+        Args:
+            db: 异步数据库会话
+            rows: 原始行数据，逐行按 ItemCreate 校验
+            chunk_size: 每个 INSERT 语句包含的行数
+
+        Returns:
+            批量操作结果
+        """
+        use_primary(db)
+        result = ItemBulkResult()
+        valid: List[IndexedRow] = []
+        for index, raw in enumerate(rows):
+            try:
+                valid.append((index, ItemCreate.model_validate(raw).model_dump()))
+            except ValidationError as e:
+                result.errors.append(ItemBulkError(index=index, detail=_validation_detail(e)))
+
+        async def insert_rows(chunk: List[IndexedRow]) -> ChunkOutcome:
+            # 显式写入创建时间，提交后按创建时间维护分桶统计
+            now = datetime.utcnow()
+            params_list = [{**params, "created_at": now, "updated_at": now} for _, params in chunk]
+            ids = await ItemBulkService._insert(db, params_list)
+            changes = [
+                ItemChange(
+                    item_id, new_key=(params["status"], params["is_active"]), created_at=now
+                )
+                for params, item_id in zip(params_list, ids)
+            ]
+            return ids, changes, []
+
+        for chunk in _chunks(valid, chunk_size):
+            await ItemBulkService._run_chunk(db, chunk, insert_rows, result)
+
+        return await ItemBulkService._finish(db, result)
+
+    @staticmethod
+    async def update(
+        db: AsyncSession, rows: List[Dict[str, Any]], chunk_size: int
+    ) -> ItemBulkResult:
+        """
+        批量更新 Item（仅更新每行显式传入的字段）
+
+        Args:
+            db: 异步数据库会话
+            rows: 原始行数据，逐行按 ItemBulkUpdateRow 校验
+            chunk_size: 每次 executemany 包含的行数
+
+        Returns:
+            批量操作结果
+        """
+        use_primary(db)
+        result = ItemBulkResult()
+        valid: List[IndexedRow] = []
+        seen = set()
+        for index, raw in enumerate(rows):
+            try:
+                row = ItemBulkUpdateRow.model_validate(raw)
+            except ValidationError as e:
+                result.errors.append(ItemBulkError(index=index, detail=_validation_detail(e)))
+                continue
+            if row.id in seen:
+                result.errors.append(ItemBulkError(index=index, id=row.id, detail="Duplicate id"))
+                continue
+            seen.add(row.id)
+            valid.append((index, row.model_dump(exclude_unset=True)))
+
+        async def update_rows(chunk: List[IndexedRow]) -> ChunkOutcome:
+            existing = await ItemBulkService._load_keys(db, [params["id"] for _, params in chunk])
+            # 按主键批量 UPDATE 时显式写入更新时间，同一块内各行保持一致
+            now = datetime.utcnow()
+            found: List[Dict[str, Any]] = []
+            changes: List[ItemChange] = []
+            errors: List[ItemBulkError] = []
+            for index, params in chunk:
+                row = existing.get(params["id"])
+                if row is None:
+                    errors.append(
+                        ItemBulkError(index=index, id=params["id"], detail="Item not found")
+                    )
+                    continue
+                found.append({**params, "updated_at": now})
+                old_key = (row.status, row.is_active)
+                new_key = (params.get("status", old_key[0]), params.get("is_active", old_key[1]))
+                changes.append(ItemChange(params["id"], old_key=old_key, new_key=new_key))
+            if found:
+                await db.execute(update(Item), found)
+            return [params["id"] for params in found], changes, errors
+
+        for chunk in _chunks(valid, chunk_size):
+            await ItemBulkService._run_chunk(db, chunk, update_rows, result)
+
+        return await ItemBulkService._finish(db, result)
+
+    @staticmethod
+    async def delete(db: AsyncSession, ids: List[int], chunk_size: int) -> ItemBulkResult:
+        """
+        批量删除 Item
+
+        Args:
+            db: 异步数据库会话
+            ids: 待删除的 Item ID
+            chunk_size: 每个 DELETE 语句包含的 ID 数
+
+        Returns:
+            批量操作结果
+        """
+        use_primary(db)
+        result = ItemBulkResult()
+        valid: List[IndexedRow] = []
+        seen = set()
+        for index, item_id in enumerate(ids):
+            if item_id in seen:
+                result.errors.append(ItemBulkError(index=index, id=item_id, detail="Duplicate id"))
+                continue
+            seen.add(item_id)
+            valid.append((index, {"id": item_id}))
+
+        async def delete_rows(chunk: List[IndexedRow]) -> ChunkOutcome:
+            existing = await ItemBulkService._load_keys(db, [params["id"] for _, params in chunk])
+            found: List[int] = []
+            errors: List[ItemBulkError] = []
+            for index, params in chunk:
+                if params["id"] not in existing:
+                    errors.append(
+                        ItemBulkError(index=index, id=params["id"], detail="Item not found")
+                    )
+                    continue
+                found.append(params["id"])
+            if found:
+                stmt = delete(Item).where(Item.id.in_(found))
+                await db.execute(stmt.execution_options(synchronize_session=False))
+            changes = [
+                ItemChange(
+                    item_id,
+                    old_key=(existing[item_id].status, existing[item_id].is_active),
+                    created_at=existing[item_id].created_at,
+                )
+                for item_id in found
+            ]
+            return found, changes, errors
+
+        for chunk in _chunks(valid, chunk_size):
+            await ItemBulkService._run_chunk(db, chunk, delete_rows, result)
+
+        return await ItemBulkService._finish(db, result)
+
+    @staticmethod
+    async def _finish(db: AsyncSession, result: ItemBulkResult) -> ItemBulkResult:
+        """一次性提交整个请求的事务，并整理结果"""
+        await item_events.commit(db)
+        result.errors.sort(key=lambda error: error.index)
+        result.failed = len(result.errors)
+        return result
+
+    @staticmethod
+    async def _load_keys(db: AsyncSession, ids: List[int]) -> Dict[int, Row]:
+        """
+        一次查询取回一批 Item 当前的 (status, is_active, created_at)，
+        用于判断存在性、维护计数器与分桶统计
+        """
+        stmt = select(Item.id, Item.status, Item.is_active, Item.created_at).where(
+            Item.id.in_(ids)
+        )
+        rows = (await db.execute(stmt)).all()
+        return {row.id: row for row in rows}
+
+    @staticmethod
+    async def _run_chunk(
+        db: AsyncSession,
+        chunk: List[IndexedRow],
+        handler: Callable[[List[IndexedRow]], Awaitable[ChunkOutcome]],
+        result: ItemBulkResult,
+    ):
+        """
+        在 SAVEPOINT 中执行一个块；块失败时回滚该块并逐行重试，把数据库错误归到具体的行
+
+        只有 SAVEPOINT 成功释放后才把结果和变更记入 result / 会话，避免重试时重复记录。
+
+        Args:
+            db: 异步数据库会话
+            chunk: 本块的行
+            handler: 处理若干行的异步函数
+            result: 批量操作结果
+        """
+
+        def merge(outcome: ChunkOutcome):
+            ids, changes, errors = outcome
+            result.ids.extend(item_id for item_id in ids if item_id is not None)
+            result.succeeded += len(ids)
+            result.errors.extend(errors)
+            for change in changes:
+                item_events.record_item_change(db, change)
+
+        try:
+            async with db.begin_nested():
+                outcome = await handler(chunk)
+            merge(outcome)
+            return
+        except DBAPIError:
+            pass
+
+        for row in chunk:
+            try:
+                async with db.begin_nested():
+                    outcome = await handler([row])
+                merge(outcome)
+            except DBAPIError as e:
+                index, params = row
+                result.errors.append(
+                    ItemBulkError(index=index, id=params.get("id"), detail=_db_error_detail(e))
+                )
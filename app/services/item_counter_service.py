@@ -0,0 +1,399 @@
+"""
+Item 计数器服务模块
+在 Redis Hash 中按 (status, is_active) 维护 Item 数量，并按创建时间（UTC）维护小时 / 天分桶数量：
+- 写操作提交后增量更新（HINCRBY）
+- 后台任务定期用 GROUP BY 结果对账，修正增量更新可能产生的漂移；
+  增量同时累加到待合并 Hash，对账开始时清空、替换计数器时合并，快照之后提交的增量不会丢失
+- 计数器不可用时返回 None，由调用方回退到 COUNT 查询
+- /items/stats 只读取这些 Hash，请求时不会对整表 GROUP BY
+"""
+import asyncio
+import json
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from redis.exceptions import WatchError
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.sql import ColumnElement
+
+from app.core.config import settings
+from app.db.routing import USE_PRIMARY
+from app.db.session import AsyncSessionLocal
+from app.models.item import Item
+from app.services.item_events import ItemChange, ItemKey, register_post_commit_hook
+from app.utils.logger import logger
+from app.utils.redis_client import redis_client
+
+# 计数器的键共用 hash tag {item:counters}，集群模式下位于同一个槽，对账时才能在一个事务内重建
+COUNTER_KEY = "{item:counters}"
+# 按创建时间分桶的计数：字段为 UTC 时间的 "YYYY-MM-DDTHH"（小时）/ "YYYY-MM-DD"（天）
+HOURLY_KEY = "{item:counters}:hour"
+DAILY_KEY = "{item:counters}:day"
+BUCKET_KEYS = {"hour": HOURLY_KEY, "day": DAILY_KEY}
+BUCKET_STEPS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+RECONCILE_LOCK_KEY = "{item:counters}:lock"
+# 计数器 -> 待合并增量：自上次对账开始以来钩子累加的增量
+PENDING_KEYS = {key: f"{key}:pending" for key in (COUNTER_KEY, HOURLY_KEY, DAILY_KEY)}
+# 替换计数器时待合并增量被并发修改（WATCH 冲突）的最大重试次数
+RECONCILE_MERGE_RETRIES = 5
+# 对账完成标记，不存在时说明计数器尚未初始化，不能用于回答查询
+READY_FIELD = "__ready__"
+
+
+def _field(key: ItemKey) -> str:
+    """
+    将 (status, is_active) 编码为 Hash 字段名（紧凑 JSON 数组，例如 ["active",true]）
+
+    None 编码为 null，与空字符串等任何真实的 status 都不会混淆。
+    """
+    status, is_active = key
+    return json.dumps([status, is_active], separators=(",", ":"))
+
+
+def _parse_field(field: str) -> Optional[ItemKey]:
+    """
+    将 Hash 字段名解码为 (status, is_active)
+
+    Returns:
+        (status, is_active)；旧版本格式（status|0/1）的字段返回 None，由下一次对账清除
+    """
+    try:
+        status, is_active = json.loads(field)
+    except ValueError:
+        return None
+    return (status, is_active)
+
+
+def utc_naive(value: Optional[datetime] = None) -> datetime:
+    """
+    转换为不带时区信息的 UTC 时间（与 created_at 列及分桶字段一致）
+
+    Args:
+        value: 时间，不带时区信息时视为 UTC；不提供时取当前时间
+
+    Returns:
+        不带时区信息的 UTC 时间
+    """
+    if value is None:
+        value = datetime.now(timezone.utc)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def bucket_field(bucket: str, value: datetime) -> str:
+    """创建时间所在分桶的字段名，例如 2024-01-01T08（hour）、2024-01-01（day）"""
+    return value.strftime("%Y-%m-%dT%H" if bucket == "hour" else "%Y-%m-%d")
+
+
+def bucket_start(bucket: str, value: datetime) -> datetime:
+    """创建时间所在分桶的起始时间"""
+    value = value.replace(minute=0, second=0, microsecond=0)
+    return value if bucket == "hour" else value.replace(hour=0)
+
+
+def _hour_bucket(dialect_name: str) -> ColumnElement:
+    """对账时按小时分组的表达式，结果与 bucket_field("hour", ...) 格式一致"""
+    created_at = Item.created_at
+    if dialect_name in ("mysql", "mariadb"):
+        return func.date_format(created_at, "%Y-%m-%dT%H")
+    if dialect_name == "postgresql":
+        return func.to_char(created_at, 'YYYY-MM-DD"T"HH24')
+    if dialect_name == "mssql":
+        # 样式 126 为 ISO 8601（yyyy-mm-ddThh:mi:ss.mmm），截取到小时
+        iso = func.convert(literal_column("VARCHAR(23)"), created_at, literal_column("126"))
+        return func.left(iso, 13)
+    return func.strftime("%Y-%m-%dT%H", created_at)
+
+
+class ItemCounterService:
+    """Item 计数器服务类"""
+
+    def __init__(self):
+        """初始化计数器服务"""
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _deltas(changes: List[ItemChange]) -> Dict[str, int]:
+        """把一批变更折算为各字段的增量"""
+        deltas: Counter = Counter()
+        for change in changes:
+            if change.old_key == change.new_key:
+                continue
+            if change.old_key is not None:
+                deltas[_field(change.old_key)] -= 1
+            if change.new_key is not None:
+                deltas[_field(change.new_key)] += 1
+        return {field: delta for field, delta in deltas.items() if delta}
+
+    @staticmethod
+    def _bucket_deltas(changes: List[ItemChange], bucket: str) -> Dict[str, int]:
+        """把一批创建 / 删除折算为按创建时间分桶的增量（创建时间未知的留给对账修正）"""
+        deltas: Counter = Counter()
+        for change in changes:
+            if change.created_at is None or (change.old_key is None) == (change.new_key is None):
+                continue
+            deltas[bucket_field(bucket, change.created_at)] += 1 if change.old_key is None else -1
+        return {field: delta for field, delta in deltas.items() if delta}
+
+    async def apply(self, changes: List[ItemChange]):
+        """
+        根据已提交的变更增量更新计数器（一个事务一次 MULTI，同时累加待合并增量）
+
+        Args:
+            changes: 本次事务内的 Item 变更
+        """
+        increments = [(COUNTER_KEY, self._deltas(changes))] + [
+            (key, self._bucket_deltas(changes, bucket)) for bucket, key in BUCKET_KEYS.items()
+        ]
+        if not any(deltas for _, deltas in increments):
+            return
+        if not redis_client.available:
+            # Redis 熔断中：本次增量丢失，等待恢复后的对账修正
+            return
+        try:
+            async with redis_client.pipeline(transaction=True) as pipe:
+                for key, deltas in increments:
+                    for field, delta in deltas.items():
+                        pipe.hincrby(key, field, delta)
+                        pipe.hincrby(PENDING_KEYS[key], field, delta)
+        except Exception as e:
+            # 计数器可能已漂移，等待下一次对账修正
+            logger.error(f"Redis 计数器更新失败: {e}")
+
+    async def get_count(
+        self, status: Optional[str] = None, is_active: Optional[bool] = None
+    ) -> Optional[int]:
+        """
+        从计数器读取满足条件的 Item 总数
+
+        Args:
+            status: 按状态过滤
+            is_active: 按是否激活过滤
+
+        Returns:
+            总数；计数器未启用、未初始化或 Redis 不可用时返回 None
+        """
+        if not settings.ITEM_COUNTER_ENABLED or not redis_client.available:
+            return None
+        try:
+            async with redis_client.guarded() as client:
+                if status is not None and is_active is not None:
+                    ready, value = await client.hmget(
+                        COUNTER_KEY, [READY_FIELD, _field((status, is_active))]
+                    )
+                    if not ready:
+                        return None
+                    return max(int(value or 0), 0)
+
+                fields = await client.hgetall(COUNTER_KEY)
+        except Exception as e:
+            logger.error(f"Redis 计数器读取失败: {e}")
+            return None
+
+        if not fields.pop(READY_FIELD, None):
+            return None
+        total = 0
+        for field, value in fields.items():
+            key = _parse_field(field)
+            if key is None:
+                continue
+            field_status, field_active = key
+            if status is not None and field_status != status:
+                continue
+            if is_active is not None and field_active != is_active:
+                continue
+            total += int(value)
+        return max(total, 0)
+
+    async def reconcile(self) -> bool:
+        """
+        用数据库 GROUP BY 结果重建计数器
+
+        多个 worker 同时运行时，通过 Redis 锁保证一个周期内只有一个 worker 执行对账。
+
+        读取快照之前清空待合并增量，替换计数器时把快照与其后累加的增量合并：
+        钩子早于清空执行的写操作已计入快照，晚于清空执行的写操作留在待合并增量中。
+        提交早于快照、钩子却晚于清空的写操作会被多计一次，
+        误差不超过对账开始时正在执行的钩子数，由下一次对账修正。
+
+        Returns:
+            本次是否替换了计数器
+        """
+        lock_seconds = max(settings.ITEM_COUNTER_RECONCILE_SECONDS - 1, 1)
+        async with redis_client.guarded() as client:
+            acquired = await client.set(RECONCILE_LOCK_KEY, "1", nx=True, ex=lock_seconds)
+            if not acquired:
+                return False
+            await client.delete(*PENDING_KEYS.values())
+
+        counts, hourly = await self._snapshot()
+        mapping = {_field(key): count for key, count in counts.items()}
+        mapping[READY_FIELD] = 1
+        daily: Counter = Counter()
+        for bucket, count in hourly.items():
+            daily[bucket[:10]] += count
+        # 小时分桶只保留最近 ITEM_STATS_HOURLY_RETENTION_DAYS 天，避免 Hash 无限增长
+        oldest_hour = bucket_field(
+            "hour", utc_naive() - timedelta(days=settings.ITEM_STATS_HOURLY_RETENTION_DAYS)
+        )
+        hourly = {bucket: count for bucket, count in hourly.items() if bucket >= oldest_hour}
+
+        if not await self._replace({COUNTER_KEY: mapping, HOURLY_KEY: hourly, DAILY_KEY: daily}):
+            logger.warning("Item 计数器对账放弃：待合并增量持续变化，保留增量维护的计数器")
+            return False
+        logger.info(f"Item 计数器对账完成，共 {len(counts)} 个维度、{len(daily)} 个日分桶")
+        return True
+
+    @staticmethod
+    async def _snapshot() -> Tuple[Dict[ItemKey, int], Dict[str, int]]:
+        """
+        从数据库读取计数快照
+
+        Returns:
+            ({(status, is_active): 数量}, {小时分桶: 数量})
+        """
+        # 对账需要与写入一致的数据，固定读主库
+        async with AsyncSessionLocal(info={USE_PRIMARY: True}) as db:
+            stmt = select(Item.status, Item.is_active, func.count(Item.id)).group_by(
+                Item.status, Item.is_active
+            )
+            rows = (await db.execute(stmt)).all()
+            hour = _hour_bucket(db.get_bind().dialect.name).label("hour")
+            stmt = (
+                select(hour, func.count(Item.id))
+                .where(Item.created_at.is_not(None))
+                .group_by(hour)
+            )
+            hourly = {bucket: count for bucket, count in (await db.execute(stmt)).all()}
+        return {(status, is_active): count for status, is_active, count in rows}, hourly
+
+    @staticmethod
+    async def _replace(rebuilt: Dict[str, Dict[str, int]]) -> bool:
+        """
+        用重建结果加上待合并增量替换计数器（WATCH 待合并增量，一次 MULTI 完成替换）
+
+        Args:
+            rebuilt: {计数器键: 重建后的字段值}
+
+        Returns:
+            是否替换成功；重试 RECONCILE_MERGE_RETRIES 次仍有冲突时返回 False
+        """
+        pending_keys = [PENDING_KEYS[key] for key in rebuilt]
+        async with redis_client.guarded() as client:
+            async with client.pipeline(transaction=True) as pipe:
+                for _ in range(RECONCILE_MERGE_RETRIES):
+                    try:
+                        await pipe.watch(*pending_keys)
+                        # WATCH 之后、MULTI 之前的命令立即执行
+                        pending = [await pipe.hgetall(key) for key in pending_keys]
+                        pipe.multi()
+                        for (key, values), deltas in zip(rebuilt.items(), pending):
+                            merged = Counter(values)
+                            for field, delta in deltas.items():
+                                merged[field] += int(delta)
+                            pipe.delete(key)
+                            if merged:
+                                pipe.hset(key, mapping=dict(merged))
+                        pipe.delete(*pending_keys)
+                        await pipe.execute()
+                        return True
+                    except WatchError:
+                        continue
+        return False
+
+    async def get_stats(
+        self, bucket: str, since: datetime, until: datetime
+    ) -> Optional[Dict[str, Any]]:
+        """
+        读取预先维护的 Item 统计
+
+        Args:
+            bucket: 创建时间分桶粒度 hour/day
+            since: 分桶起始时间（UTC，包含）
+            until: 分桶结束时间（UTC，包含）
+
+        Returns:
+            统计结果；计数器未启用、未初始化或 Redis 不可用时返回 None
+        """
+        if not settings.ITEM_COUNTER_ENABLED or not redis_client.available:
+            return None
+        starts: List[datetime] = []
+        start, step = bucket_start(bucket, since), BUCKET_STEPS[bucket]
+        while start <= until:
+            starts.append(start)
+            start += step
+        try:
+            async with redis_client.pipeline() as pipe:
+                pipe.hgetall(COUNTER_KEY)
+                if starts:
+                    pipe.hmget(
+                        BUCKET_KEYS[bucket], [bucket_field(bucket, value) for value in starts]
+                    )
+            results = pipe.results
+        except Exception as e:
+            logger.error(f"Redis 计数器读取失败: {e}")
+            return None
+
+        fields = results[0]
+        if not fields.pop(READY_FIELD, None):
+            return None
+        by_status: Counter = Counter()
+        by_is_active: Counter = Counter()
+        breakdown: List[Dict[str, Any]] = []
+        for field, value in fields.items():
+            count = max(int(value), 0)
+            key = _parse_field(field)
+            if not count or key is None:
+                continue
+            status, is_active = key
+            by_status[status] += count
+            by_is_active[is_active] += count
+            breakdown.append({"status": status, "is_active": is_active, "count": count})
+        counts = results[1] if starts else []
+        return {
+            "total": sum(by_status.values()),
+            "by_status": dict(by_status),
+            "by_is_active": dict(by_is_active),
+            "by_status_active": sorted(
+                breakdown, key=lambda row: (str(row["status"]), str(row["is_active"]))
+            ),
+            "created": [
+                {"start": value, "count": max(int(count or 0), 0)}
+                for value, count in zip(starts, counts)
+            ],
+        }
+
+    async def _reconcile_loop(self):
+        """后台定期对账"""
+        while True:
+            # Redis 熔断中时跳过本周期，恢复后的第一个周期重建计数器
+            if redis_client.available:
+                try:
+                    await self.reconcile()
+                except Exception as e:
+                    logger.error(f"Item 计数器对账失败: {e}")
+            await asyncio.sleep(settings.ITEM_COUNTER_RECONCILE_SECONDS)
+
+    def start(self):
+        """启动后台对账任务（应用启动时调用）"""
+        if settings.ITEM_COUNTER_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._reconcile_loop())
+
+    async def stop(self):
+        """停止后台对账任务（应用关闭时调用）"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# 创建全局计数器服务实例
+item_counter_service = ItemCounterService()
+
+if settings.ITEM_COUNTER_ENABLED:
+    register_post_commit_hook(item_counter_service.apply)
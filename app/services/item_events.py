@@ -0,0 +1,98 @@
+"""
+Item 变更事件模块
+在会话中记录 Item 的增删改，并在事务提交成功后统一分发给已注册的钩子
+（例如计数器维护），事务回滚时丢弃
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.logger import logger
+
+# 计数维度：(status, is_active)
+ItemKey = Tuple[Optional[str], Optional[bool]]
+
+_SESSION_INFO_KEY = "item_changes"
+
+
+@dataclass(frozen=True)
+class ItemChange:
+    """一次 Item 变更
+
+    old_key 为变更前的 (status, is_active)，创建时为 None；
+    new_key 为变更后的 (status, is_active)，删除时为 None。
+    item_id 在数据库不支持批量 RETURNING 的批量创建场景下可能为 None。
+    updated_at 为变更后的更新时间（已知时填写，用于维护 ETag 版本号）。
+    created_at 为 Item 的创建时间（创建和删除时填写，用于维护按创建时间分桶的统计）。
+    """
+
+    item_id: Optional[int]
+    old_key: Optional[ItemKey] = None
+    new_key: Optional[ItemKey] = None
+    updated_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+
+PostCommitHook = Callable[[List[ItemChange]], Awaitable[None]]
+
+_post_commit_hooks: List[PostCommitHook] = []
+
+
+def register_post_commit_hook(hook: PostCommitHook) -> None:
+    """
+    注册事务提交后的钩子
+
+    Args:
+        hook: 异步函数，接收本次事务内的全部变更
+    """
+    if hook not in _post_commit_hooks:
+        _post_commit_hooks.append(hook)
+
+
+def record_item_change(db: AsyncSession, change: ItemChange) -> None:
+    """
+    在会话中记录一次 Item 变更（提交后才会分发）
+
+    Args:
+        db: 异步数据库会话
+        change: 变更内容
+    """
+    db.info.setdefault(_SESSION_INFO_KEY, []).append(change)
+
+
+async def commit(db: AsyncSession) -> None:
+    """
+    提交事务，并在成功后把本事务内的变更批量分发给钩子
+
+    钩子失败只记录日志，不影响已提交的事务。
+
+    Args:
+        db: 异步数据库会话
+    """
+    try:
+        await db.commit()
+    except Exception:
+        db.info.pop(_SESSION_INFO_KEY, None)
+        raise
+
+    changes: List[ItemChange] = db.info.pop(_SESSION_INFO_KEY, [])
+    if not changes:
+        return
+    for hook in list(_post_commit_hooks):
+        try:
+            await hook(changes)
+        except Exception as e:
+            logger.error(f"Item 提交后钩子执行失败 {getattr(hook, '__qualname__', hook)}: {e}")
+
+
+async def rollback(db: AsyncSession) -> None:
+    """
+    回滚事务并丢弃未分发的变更
+
+    Args:
+        db: 异步数据库会话
+    """
+    db.info.pop(_SESSION_INFO_KEY, None)
+    await db.rollback()
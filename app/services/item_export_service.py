@@ -0,0 +1,103 @@
+"""
+Item 导出服务层
+以服务端游标（stream_results + yield_per）逐批读取 items 表并编码为 NDJSON 或 CSV，
+每批编码后立即输出，内存占用与导出行数无关
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from sqlalchemy import Row
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.services.item_service import AsyncItemService
+
+# 导出的列（与 ItemResponse 字段一致）
+EXPORT_FIELDS = ["id", "title", "description", "status", "is_active", "created_at", "updated_at"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def _plain(value: Any) -> Any:
+    """转换为可直接编码的值"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class ItemExportService:
+    """Item 导出服务类"""
+
+    @staticmethod
+    def _encode_ndjson(rows: Sequence[Row]) -> str:
+        """把一批行编码为 NDJSON（每行一个 JSON 对象）"""
+        return "".join(
+            json.dumps(
+                {field: _plain(value) for field, value in zip(EXPORT_FIELDS, row)},
+                ensure_ascii=False,
+            )
+            + "\n"
+            for row in rows
+        )
+
+    @staticmethod
+    def _encode_csv(rows: Sequence[Row], header: bool) -> str:
+        """把一批行编码为 CSV"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(EXPORT_FIELDS)
+        writer.writerows([_plain(value) for value in row] for row in rows)
+        return buffer.getvalue()
+
+    @staticmethod
+    async def stream(
+        fmt: str = "ndjson",
+        status: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+        include_archived: bool = False,
+    ) -> AsyncIterator[str]:
+        """
+        按条件流式导出 Item
+
+        在生成器内部创建会话：StreamingResponse 发送响应体时，
+        请求依赖注入的会话已经关闭。
+
+        Args:
+            fmt: 导出格式 ndjson/csv
+            status: 按状态过滤
+            is_active: 按是否激活过滤
+            batch_size: 每批从游标读取的行数
+            include_archived: 是否同时导出归档表中的 Item
+
+        Returns:
+            按批编码后的文本块
+        """
+        batch_size = batch_size or settings.ITEM_EXPORT_BATCH_SIZE
+        stmt = AsyncItemService.filtered_query(
+            status,
+            is_active,
+            order="asc",
+            fields=EXPORT_FIELDS,
+            include_archived=include_archived,
+        ).execution_options(yield_per=batch_size)
+        if fmt == "csv":
+            # UTF-8 BOM，便于 Excel 正确识别中文
+            yield "\ufeff" + ItemExportService._encode_csv([], header=True)
+
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(stmt)
+            async for rows in result.partitions():
+                if fmt == "csv":
+                    yield ItemExportService._encode_csv(rows, header=False)
+                else:
+                    yield ItemExportService._encode_ndjson(rows)
+
+    @staticmethod
+    def filename(fmt: str) -> str:
+        """导出文件名，例如 items-20240101120000.csv"""
+        return f"items-{datetime.now().strftime('%Y%m%d%H%M%S')}.{fmt}"
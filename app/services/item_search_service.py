@@ -0,0 +1,151 @@
+"""
+Item 全文检索服务层
+按数据库方言使用原生全文检索并按相关度排序：
+- MySQL: FULLTEXT 索引 + MATCH ... AGAINST（ngram 解析器）
+- PostgreSQL: GIN 表达式索引 + to_tsvector @@ plainto_tsquery，ts_rank 排序
+- MSSQL: 全文索引 + FREETEXTTABLE，RANK 排序
+- 其它数据库或 ITEM_SEARCH_MODE=like：回退到 title/description 的 LIKE 匹配
+结果按 (相关度, id) 降序，支持游标（keyset）分页
+"""
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    Float,
+    Integer,
+    String,
+    bindparam,
+    case,
+    cast,
+    column,
+    func,
+    literal_column,
+    select,
+    text,
+    type_coerce,
+)
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement, Select
+
+from app.core.config import settings
+from app.models.item import SEARCH_TS_CONFIG, Item, item_search_vector, item_select_columns
+
+
+class ItemSearchService:
+    """Item 全文检索服务类"""
+
+    @staticmethod
+    def _build(dialect_name: str, mode: str) -> Tuple[Select, ColumnElement]:
+        """
+        构造检索语句与相关度表达式，关键词为绑定参数 keyword
+
+        Args:
+            dialect_name: 数据库方言名称
+            mode: 检索方式 fulltext/like
+
+        Returns:
+            (已附加匹配条件的 SELECT, 相关度表达式)
+        """
+        keyword = bindparam("keyword", type_=String)
+        if mode == "fulltext":
+            if dialect_name in ("mysql", "mariadb"):
+                matched = mysql.match(Item.title, Item.description, against=keyword)
+                matched = matched.in_natural_language_mode()
+                # MATCH 表达式本身没有数值类型，转换后才能与游标中的相关度比较
+                rank = type_coerce(matched, Float)
+                return select(Item, rank.label("rank")).where(matched), rank
+
+            if dialect_name == "postgresql":
+                query = func.plainto_tsquery(literal_column(f"'{SEARCH_TS_CONFIG}'"), keyword)
+                vector = item_search_vector(Item.title, Item.description)
+                # ts_rank 返回 real，转为 double 后游标中的相关度才能无损往返并精确比较
+                rank = cast(func.ts_rank(vector, query), Float(precision=53))
+                stmt = select(Item, rank.label("rank")).where(vector.bool_op("@@")(query))
+                return stmt, rank
+
+            if dialect_name == "mssql":
+                matches = (
+                    text(
+                        "SELECT [KEY], [RANK] FROM "
+                        "FREETEXTTABLE(items, (title, description), :keyword)"
+                    )
+                    .bindparams(keyword)
+                    .columns(column("KEY", Integer), column("RANK", Integer))
+                    .subquery("ft")
+                )
+                rank = matches.c.RANK
+                stmt = select(Item, rank.label("rank")).join(matches, matches.c.KEY == Item.id)
+                return stmt, rank
+
+        # 回退：LIKE 匹配，标题命中权重高于描述
+        in_title = Item.title.contains(keyword)
+        in_description = Item.description.contains(keyword)
+        rank = case((in_title, 2), else_=0) + case((in_description, 1), else_=0)
+        return select(Item, rank.label("rank")).where(in_title | in_description), rank
+
+    @staticmethod
+    async def search(
+        db: AsyncSession,
+        keyword: str,
+        limit: int = 100,
+        skip: int = 0,
+        after: Optional[Tuple[float, int]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Tuple[Any, float]], bool]:
+        """
+        全文检索 Item，按相关度降序
+
+        Args:
+            db: 异步数据库会话
+            keyword: 搜索关键词
+            limit: 返回的最大记录数
+            skip: 跳过的记录数（传入 after 时忽略）
+            after: 上一页最后一条记录的 (相关度, id)
+            fields: 只查询指定的列，为 None 时返回完整的 Item 对象
+
+        Returns:
+            ([(Item 或只含指定列的行, 相关度)], 是否还有下一页)
+        """
+        stmt = ItemSearchService._statement(
+            db.get_bind().dialect.name,
+            settings.ITEM_SEARCH_MODE,
+            after is not None,
+            bool(skip),
+            None if fields is None else tuple(fields),
+        )
+        params = {"keyword": keyword, "limit": limit + 1}
+        if after is not None:
+            params["last_rank"], params["last_id"] = after
+        elif skip:
+            params["offset"] = skip
+
+        rows = (await db.execute(stmt, params)).all()
+        results = [
+            (row[0] if fields is None else row, float(row.rank or 0)) for row in rows[:limit]
+        ]
+        return results, len(rows) > limit
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _statement(
+        dialect_name: str,
+        mode: str,
+        keyset: bool,
+        paged: bool,
+        fields: Optional[Tuple[str, ...]],
+    ) -> Select:
+        """
+        检索语句模板（按参数组合只构建一次）
+
+        绑定参数：keyword、limit，以及 last_rank、last_id（keyset）或 offset（paged）
+        """
+        stmt, rank = ItemSearchService._build(dialect_name, mode)
+        if fields is not None:
+            stmt = stmt.with_only_columns(*item_select_columns(fields), rank.label("rank"))
+        if keyset:
+            last_rank, last_id = bindparam("last_rank"), bindparam("last_id")
+            stmt = stmt.where((rank < last_rank) | ((rank == last_rank) & (Item.id < last_id)))
+        elif paged:
+            stmt = stmt.offset(bindparam("offset", type_=Integer))
+        return stmt.order_by(rank.desc(), Item.id.desc()).limit(bindparam("limit", type_=Integer))
@@ -1,16 +1,32 @@
 """
 Item CRUD 服务层
 """
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, asc, desc
+from sqlalchemy import Row, Select, delete, select, update
 
-from app.models.item import Item
+from app.db.routing import use_primary
+from app.models.item import ITEM_COLUMNS, Item, ItemArchive, item_select_columns
 from app.schemas.item import ItemCreate, ItemUpdate
+from app.services import item_events, item_statements
+from app.services.item_counter_service import item_counter_service
+from app.services.item_events import ItemChange
+from app.services.item_search_service import ItemSearchService
+
+# 参与计数的字段，修改这些字段时需要旧值来调整计数器、使旧条件下的列表缓存失效
+COUNTED_FIELDS = {"status", "is_active"}
 
 
 class ItemService:
-    """Item 服务类"""
+    """Item 同步服务类（仅供 scripts 等非事件循环场景使用）
+
+    写操作直接提交，不记录 Item 变更、不分发 post-commit 钩子：
+    详情缓存、列表缓存、计数器与版本号都不会随之更新。
+    通过它修改数据后，应清理相关缓存，计数器由下一次对账修正。
+    API 路由与后台任务的写操作必须使用 AsyncItemService。
+    """
 
     @staticmethod
     def create(db: Session, item_in: ItemCreate) -> Item:
@@ -64,7 +80,7 @@ class ItemService:
     @staticmethod
     def update(db: Session, item_id: int, item_in: ItemUpdate) -> Optional[Item]:
         """
-        更新 Item
+        更新 Item（支持 RETURNING 的数据库一条语句完成）
         
         Args:
             db: 数据库会话
@@ -74,22 +90,27 @@ class ItemService:
         Returns:
             更新后的 Item 对象或 None
         """
-        item = db.query(Item).filter(Item.id == item_id).first()
-        if not item:
-            return None
-
         update_data = item_in.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(item, field, value)
+        if not update_data:
+            return db.get(Item, item_id)
+
+        # 未在 values 中出现的 updated_at 由列的 onupdate 自动填充
+        stmt = update(Item).where(Item.id == item_id).values(**update_data)
+        if db.get_bind().dialect.update_returning:
+            item = db.scalars(stmt.returning(Item)).first()
+        else:
+            result = db.execute(stmt, execution_options={"synchronize_session": False})
+            item = db.get(Item, item_id, populate_existing=True) if result.rowcount else None
+        if item is None:
+            return None
 
         db.commit()
-        db.refresh(item)
         return item
 
     @staticmethod
     def delete(db: Session, item_id: int) -> bool:
         """
-        删除 Item
+        删除 Item（单条 DELETE，按影响行数判断是否存在）
         
         Args:
             db: 数据库会话
@@ -98,11 +119,13 @@ class ItemService:
         Returns:
             是否删除成功
         """
-        item = db.query(Item).filter(Item.id == item_id).first()
-        if not item:
+        result = db.execute(
+            delete(Item).where(Item.id == item_id),
+            execution_options={"synchronize_session": False},
+        )
+        if result.rowcount == 0:
             return False
 
-        db.delete(item)
         db.commit()
         return True
 
@@ -132,12 +155,8 @@ class ItemService:
     @staticmethod
     def count_filtered(db: Session, status: Optional[str] = None, is_active: Optional[bool] = None) -> int:
         """统计满足条件的 Item 总数"""
-        q = db.query(func.count(Item.id))
-        if status is not None:
-            q = q.filter(Item.status == status)
-        if is_active is not None:
-            q = q.filter(Item.is_active == is_active)
-        return q.scalar() or 0
+        stmt = item_statements.count_statement(status is not None, is_active is not None)
+        return db.scalar(stmt, item_statements.filter_params(status, is_active)) or 0
 
     @staticmethod
     def get_multi_filtered(
@@ -149,13 +168,386 @@ class ItemService:
         order: str = "desc",
     ) -> List[Item]:
         """按条件筛选并分页返回 Item 列表"""
-        q = db.query(Item)
-        if status is not None:
-            q = q.filter(Item.status == status)
-        if is_active is not None:
-            q = q.filter(Item.is_active == is_active)
-        if order == "asc":
-            q = q.order_by(asc(Item.created_at))
+        stmt = item_statements.page_statement(
+            status is not None, is_active is not None, order, False
+        )
+        params = item_statements.filter_params(status, is_active)
+        params.update(offset=skip, limit=limit)
+        return list(db.scalars(stmt, params).all())
+
+
+class AsyncItemService:
+    """Item 异步服务类
+
+    与 ItemService 方法一一对应，基于 AsyncSession 执行，供 API 路由使用；
+    写操作通过 item_events 在提交后分发变更（缓存失效、计数器、版本号）。
+    同步的 ItemService 保留给 scripts 等非事件循环场景，不分发变更。
+    """
+
+    @staticmethod
+    async def create(db: AsyncSession, item_in: ItemCreate) -> Item:
+        """
+        创建新的 Item
+
+        Args:
+            db: 异步数据库会话
+            item_in: Item 创建数据
+
+        Returns:
+            创建的 Item 对象
+        """
+        item = Item(**item_in.model_dump())
+        db.add(item)
+        await db.flush()
+        item_events.record_item_change(
+            db,
+            ItemChange(
+                item.id, new_key=(item.status, item.is_active), created_at=item.created_at
+            ),
+        )
+        await item_events.commit(db)
+        await db.refresh(item)
+        return item
+
+    @staticmethod
+    async def get(db: AsyncSession, item_id: int) -> Optional[Item]:
+        """
+        根据 ID 获取 Item
+
+        Args:
+            db: 异步数据库会话
+            item_id: Item ID
+
+        Returns:
+            Item 对象或 None
+        """
+        return await db.get(Item, item_id)
+
+    @staticmethod
+    async def get_archived(db: AsyncSession, item_id: int) -> Optional[ItemArchive]:
+        """
+        根据 ID 获取已归档的 Item
+
+        Args:
+            db: 异步数据库会话
+            item_id: Item ID
+
+        Returns:
+            ItemArchive 对象或 None
+        """
+        return await db.get(ItemArchive, item_id)
+
+    @staticmethod
+    async def get_many(db: AsyncSession, item_ids: Sequence[int]) -> List[Item]:
+        """
+        按 ID 批量获取 Item（一条 WHERE id IN (...) 查询）
+
+        Args:
+            db: 异步数据库会话
+            item_ids: Item ID 列表
+
+        Returns:
+            存在的 Item 列表（顺序不保证）
+        """
+        if not item_ids:
+            return []
+        return list((await db.scalars(select(Item).where(Item.id.in_(item_ids)))).all())
+
+    @staticmethod
+    async def get_multi(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
+        """
+        获取多个 Item
+
+        Args:
+            db: 异步数据库会话
+            skip: 跳过的记录数
+            limit: 返回的最大记录数
+            fields: 只查询指定的列，为 None 时返回完整的 Item 对象
+
+        Returns:
+            Item 列表（指定 fields 时为只含这些列的行）
+        """
+        stmt = select(*item_select_columns(fields)).offset(skip).limit(limit)
+        return await AsyncItemService._fetch(db, stmt, fields)
+
+    @staticmethod
+    async def _fetch(
+        db: AsyncSession,
+        stmt: Select,
+        fields: Optional[Sequence[str]],
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Any]:
+        """执行查询：整实体返回 Item 对象，列投影返回 Row"""
+        if fields is None:
+            return list((await db.scalars(stmt, params)).all())
+        return list((await db.execute(stmt, params)).all())
+
+    @staticmethod
+    async def update(db: AsyncSession, item_id: int, item_in: ItemUpdate) -> Optional[Item]:
+        """
+        更新 Item
+
+        支持 UPDATE ... RETURNING 的数据库一条语句完成更新并取回整行；
+        其余数据库（MySQL）按影响行数判断是否存在，再读取更新后的行。
+        只有修改了计数维度（status / is_active）时才会预先读取旧值。
+
+        Args:
+            db: 异步数据库会话
+            item_id: Item ID
+            item_in: 更新数据
+
+        Returns:
+            更新后的 Item 对象或 None
+        """
+        update_data = item_in.model_dump(exclude_unset=True)
+        if not update_data:
+            return await db.get(Item, item_id)
+
+        use_primary(db)
+        old_key = None
+        if COUNTED_FIELDS & update_data.keys():
+            row = await AsyncItemService._locked_row(db, item_id)
+            if row is None:
+                return None
+            old_key = (row.status, row.is_active)
+
+        # 未在 values 中出现的 updated_at 由列的 onupdate 自动填充
+        stmt = update(Item).where(Item.id == item_id).values(**update_data)
+        if db.get_bind().dialect.update_returning:
+            item = (await db.scalars(stmt.returning(Item))).first()
+            if item is None:
+                return None
+        else:
+            result = await db.execute(stmt, execution_options={"synchronize_session": False})
+            if result.rowcount == 0:
+                return None
+            item = await db.get(Item, item_id, populate_existing=True)
+
+        new_key = (item.status, item.is_active)
+        item_events.record_item_change(
+            db,
+            ItemChange(
+                item.id,
+                old_key=old_key or new_key,
+                new_key=new_key,
+                updated_at=item.updated_at,
+            ),
+        )
+        await item_events.commit(db)
+        return item
+
+    @staticmethod
+    async def delete(db: AsyncSession, item_id: int) -> bool:
+        """
+        删除 Item
+
+        支持 DELETE ... RETURNING 的数据库一条语句完成删除并取回计数维度；
+        其余数据库（MySQL）先加锁读取计数维度，再按影响行数判断是否删除成功。
+
+        Args:
+            db: 异步数据库会话
+            item_id: Item ID
+
+        Returns:
+            是否删除成功
+        """
+        use_primary(db)
+        stmt = delete(Item).where(Item.id == item_id)
+        if db.get_bind().dialect.delete_returning:
+            row = (
+                await db.execute(stmt.returning(Item.status, Item.is_active, Item.created_at))
+            ).first()
+            deleted = row is not None
         else:
-            q = q.order_by(desc(Item.created_at))
-        return q.offset(skip).limit(limit).all()
+            row = await AsyncItemService._locked_row(db, item_id)
+            if row is None:
+                return False
+            result = await db.execute(stmt, execution_options={"synchronize_session": False})
+            deleted = result.rowcount > 0
+
+        if not deleted:
+            return False
+        change = ItemChange(
+            item_id, old_key=(row.status, row.is_active), created_at=row.created_at
+        )
+        item_events.record_item_change(db, change)
+        await item_events.commit(db)
+        return True
+
+    @staticmethod
+    async def _locked_row(db: AsyncSession, item_id: int) -> Optional[Row]:
+        """加锁读取 Item 当前的计数维度 (status, is_active) 与创建时间，不存在时返回 None"""
+        stmt = (
+            select(Item.status, Item.is_active, Item.created_at)
+            .where(Item.id == item_id)
+            .with_for_update()
+        )
+        return (await db.execute(stmt)).first()
+
+    @staticmethod
+    async def search(
+        db: AsyncSession, keyword: str, skip: int = 0, limit: int = 100
+    ) -> List[Item]:
+        """
+        搜索 Item（全文检索，按相关度降序）
+
+        Args:
+            db: 异步数据库会话
+            keyword: 搜索关键词
+            skip: 跳过的记录数
+            limit: 返回的最大记录数
+
+        Returns:
+            Item 列表
+        """
+        results, _ = await ItemSearchService.search(db, keyword, limit=limit, skip=skip)
+        return [item for item, _ in results]
+
+    @staticmethod
+    async def count_filtered(
+        db: AsyncSession,
+        status: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        include_archived: bool = False,
+    ) -> int:
+        """统计满足条件的 Item 总数
+
+        优先读取 Redis 中维护的计数器（O(1)，与数据库可能有短暂偏差，由定期对账修正），
+        不可用时回退到 COUNT 查询；
+        include_archived 为 True 时加上归档表的 COUNT（计数器只统计 items 表）
+        """
+        params = item_statements.filter_params(status, is_active)
+        total = await item_counter_service.get_count(status=status, is_active=is_active)
+        if total is None:
+            stmt = item_statements.count_statement(status is not None, is_active is not None)
+            total = (await db.scalar(stmt, params)) or 0
+        if include_archived:
+            stmt = item_statements.count_statement(
+                status is not None, is_active is not None, archived=True
+            )
+            total += (await db.scalar(stmt, params)) or 0
+        return total
+
+    @staticmethod
+    def _template_fields(
+        fields: Optional[Sequence[str]], include_archived: bool
+    ) -> Optional[Tuple[str, ...]]:
+        """语句模板的列：同时查询归档表时结果只能是 Row，未指定 fields 则查询全部列"""
+        if fields is None:
+            return ITEM_COLUMNS if include_archived else None
+        return tuple(fields)
+
+    @staticmethod
+    def count_query(status: Optional[str] = None, is_active: Optional[bool] = None) -> Select:
+        """构造按条件计数的查询语句（参数值已绑定）"""
+        stmt = item_statements.count_statement(status is not None, is_active is not None)
+        return stmt.params(item_statements.filter_params(status, is_active))
+
+    @staticmethod
+    def filtered_query(
+        status: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        order: str = "desc",
+        after: Optional[Tuple[datetime, int]] = None,
+        fields: Optional[Sequence[str]] = None,
+        include_archived: bool = False,
+    ) -> Select:
+        """
+        构造按条件过滤、按 (created_at, id) 排序的列表查询语句
+        （与 items 表的复合索引对应）
+
+        由预构建的语句模板绑定参数值得到，供导出、基准测试等需要完整语句的场景使用；
+        分页接口直接以参数字典执行模板（见 get_multi_filtered / get_multi_after）。
+
+        Args:
+            status: 按状态过滤
+            is_active: 按是否激活过滤
+            order: 排序方式 asc/desc
+            after: 游标分页时上一页最后一条记录的 (created_at, id)
+            fields: 只查询指定的列，为 None 时查询完整的 Item
+            include_archived: 是否同时查询归档表（结果为 Row）
+
+        Returns:
+            SELECT 语句（未附加 OFFSET/LIMIT）
+        """
+        stmt = item_statements.filtered_statement(
+            status is not None,
+            is_active is not None,
+            order,
+            after is not None,
+            AsyncItemService._template_fields(fields, include_archived),
+            include_archived,
+        )
+        return stmt.params(item_statements.filter_params(status, is_active, after))
+
+    @staticmethod
+    async def get_multi_filtered(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        order: str = "desc",
+        fields: Optional[Sequence[str]] = None,
+        include_archived: bool = False,
+    ) -> List[Any]:
+        """按条件筛选并分页返回 Item 列表
+
+        指定 fields 时只查询这些列；include_archived 为 True 时同时查询归档表，返回 Row
+        """
+        fields = AsyncItemService._template_fields(fields, include_archived)
+        stmt = item_statements.page_statement(
+            status is not None, is_active is not None, order, False, fields, include_archived
+        )
+        params = item_statements.filter_params(status, is_active)
+        params.update(offset=skip, limit=limit)
+        return await AsyncItemService._fetch(db, stmt, fields, params)
+
+    @staticmethod
+    async def get_multi_after(
+        db: AsyncSession,
+        limit: int = 100,
+        status: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        order: str = "desc",
+        after: Optional[Tuple[datetime, int]] = None,
+        fields: Optional[Sequence[str]] = None,
+        include_archived: bool = False,
+    ) -> Tuple[List[Any], bool]:
+        """
+        按 (created_at, id) 游标（keyset）分页获取 Item 列表
+
+        以 seek 条件代替 OFFSET，任意页的代价与第一页相同。
+
+        Args:
+            db: 异步数据库会话
+            limit: 返回的最大记录数
+            status: 按状态过滤
+            is_active: 按是否激活过滤
+            order: 排序方式 asc/desc
+            after: 上一页最后一条记录的 (created_at, id)，为 None 时从头开始
+            fields: 只查询指定的列，为 None 时返回完整的 Item 对象
+            include_archived: 是否同时查询归档表（返回 Row）
+
+        Returns:
+            (Item 列表, 是否还有下一页)
+        """
+        fields = AsyncItemService._template_fields(fields, include_archived)
+        stmt = item_statements.page_statement(
+            status is not None,
+            is_active is not None,
+            order,
+            after is not None,
+            fields,
+            include_archived,
+        )
+        # 多取一条用于判断是否存在下一页，无需额外 COUNT
+        params = item_statements.filter_params(status, is_active, after)
+        params["limit"] = limit + 1
+        items = await AsyncItemService._fetch(db, stmt, fields, params)
+        return items[:limit], len(items) > limit
@@ -0,0 +1,149 @@
+"""
+Item 热点查询的预构建语句
+按过滤条件的组合（是否按 status / is_active 过滤、排序方向、分页方式、投影列）
+各构建一次 SELECT，条件值全部使用绑定参数，调用时只需传入参数字典：
+- 省去每次调用重新拼装 select().where()... 的 Python 开销
+- 语句对象复用，SQLAlchemy 的缓存键只计算一次，直接命中编译缓存
+
+include_archived 为 True 时同时查询 items_archive 归档表（两表 UNION ALL）。
+"""
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import Integer, Select, and_, asc, bindparam, desc, func, or_, select, union_all
+
+from app.models.item import Item, ItemArchive, item_select_columns
+
+Fields = Optional[Tuple[str, ...]]
+
+
+def _conditions(model, has_status: bool, has_active: bool, order: str, keyset: bool) -> list:
+    """过滤与游标（seek）条件，model 为 Item 或 ItemArchive"""
+    conditions = []
+    if has_status:
+        conditions.append(model.status == bindparam("status"))
+    if has_active:
+        conditions.append(model.is_active == bindparam("is_active"))
+    if keyset:
+        created_at, item_id = bindparam("after_created_at"), bindparam("after_id")
+        # 展开为 OR 形式而不是行值比较，兼容 MSSQL
+        if order == "asc":
+            conditions.append(
+                or_(
+                    model.created_at > created_at,
+                    and_(model.created_at == created_at, model.id > item_id),
+                )
+            )
+        else:
+            conditions.append(
+                or_(
+                    model.created_at < created_at,
+                    and_(model.created_at == created_at, model.id < item_id),
+                )
+            )
+    return conditions
+
+
+@lru_cache(maxsize=None)
+def filtered_statement(
+    has_status: bool,
+    has_active: bool,
+    order: str,
+    keyset: bool,
+    fields: Fields = None,
+    include_archived: bool = False,
+) -> Select:
+    """
+    按条件过滤、按 (created_at, id) 排序的列表查询模板（未附加 OFFSET/LIMIT）
+
+    绑定参数：status、is_active、after_created_at、after_id（keyset 为 True 时）
+
+    Args:
+        has_status: 是否按状态过滤
+        has_active: 是否按是否激活过滤
+        order: 排序方式 asc/desc
+        keyset: 是否附加游标（seek）条件
+        fields: 只查询指定的列，为 None 时查询完整的 Item
+        include_archived: 是否同时查询归档表（必须指定 fields，结果为 Row）
+
+    Returns:
+        SELECT 语句
+    """
+    if include_archived:
+        # 两张表分别过滤后 UNION ALL，各自命中复合索引，再统一排序
+        names = tuple(dict.fromkeys((*fields, "created_at", "id")))
+        source = union_all(
+            *(
+                select(*item_select_columns(names, model)).where(
+                    *_conditions(model, has_status, has_active, order, keyset)
+                )
+                for model in (Item, ItemArchive)
+            )
+        ).subquery("items_all")
+        stmt = select(*(source.c[field] for field in fields))
+        created_at, item_id = source.c.created_at, source.c.id
+    else:
+        stmt = select(*item_select_columns(fields)).where(
+            *_conditions(Item, has_status, has_active, order, keyset)
+        )
+        created_at, item_id = Item.created_at, Item.id
+    # 追加 id 作为排序的决胜键，保证顺序稳定，便于与游标分页衔接
+    if order == "asc":
+        return stmt.order_by(asc(created_at), asc(item_id))
+    return stmt.order_by(desc(created_at), desc(item_id))
+
+
+@lru_cache(maxsize=None)
+def page_statement(
+    has_status: bool,
+    has_active: bool,
+    order: str,
+    keyset: bool,
+    fields: Fields = None,
+    include_archived: bool = False,
+) -> Select:
+    """
+    分页查询模板：在 filtered_statement 基础上附加 LIMIT（偏移量分页另附加 OFFSET）
+
+    绑定参数：filtered_statement 的参数，以及 limit、offset（keyset 为 False 时）
+    """
+    stmt = filtered_statement(has_status, has_active, order, keyset, fields, include_archived)
+    if not keyset:
+        stmt = stmt.offset(bindparam("offset", type_=Integer))
+    return stmt.limit(bindparam("limit", type_=Integer))
+
+
+@lru_cache(maxsize=None)
+def count_statement(has_status: bool, has_active: bool, archived: bool = False) -> Select:
+    """按条件计数的查询模板（archived 为 True 时统计归档表），绑定参数：status、is_active"""
+    model = ItemArchive if archived else Item
+    return select(func.count(model.id)).where(
+        *_conditions(model, has_status, has_active, "desc", False)
+    )
+
+
+def filter_params(
+    status: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+) -> Dict[str, Any]:
+    """
+    生成与上述模板对应的绑定参数
+
+    Args:
+        status: 按状态过滤
+        is_active: 按是否激活过滤
+        after: 游标分页时上一页最后一条记录的 (created_at, id)
+
+    Returns:
+        参数字典
+    """
+    params: Dict[str, Any] = {}
+    if status is not None:
+        params["status"] = status
+    if is_active is not None:
+        params["is_active"] = is_active
+    if after is not None:
+        params["after_created_at"], params["after_id"] = after
+    return params
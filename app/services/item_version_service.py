@@ -0,0 +1,135 @@
+"""
+Item 版本号服务模块
+以 updated_at（微秒）作为 Item 的版本号，用于生成 ETag / Last-Modified：
+- 版本号缓存在 Redis（item:version:{id}），条件 GET 命中缓存时无需访问数据库
+- 缓存未命中时只在主库查询 updated_at 一列，并以较短的过期时间回填缓存
+  （回填可能与删除并发，短过期时间限制旧版本号被误用的时间）
+- 写操作提交后通过 post-commit 钩子写入新版本号（更新时间未知时删除缓存）
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.routing import use_primary
+from app.models.item import Item
+from app.services.item_events import ItemChange, register_post_commit_hook
+from app.utils.logger import logger
+from app.utils.redis_client import redis_client
+
+VERSION_KEY_PREFIX = "item:version:"
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _key(item_id: int) -> str:
+    """版本号缓存键"""
+    return f"{VERSION_KEY_PREFIX}{item_id}"
+
+
+class ItemVersionService:
+    """Item 版本号服务类"""
+
+    @staticmethod
+    def version_of(updated_at: datetime) -> int:
+        """把更新时间转换为版本号（自 1970-01-01 起的微秒数，与时区无关）"""
+        return (updated_at.replace(tzinfo=None) - _EPOCH) // _MICROSECOND
+
+    @staticmethod
+    def updated_at_of(version: int) -> datetime:
+        """把版本号还原为更新时间"""
+        return _EPOCH + version * _MICROSECOND
+
+    @staticmethod
+    def etag(item_id: int, version: int) -> str:
+        """
+        Item 的强 ETag
+
+        Args:
+            item_id: Item ID
+            version: 版本号
+
+        Returns:
+            带双引号的 ETag，例如 "12-5f0a3c2b1d000"
+        """
+        return f'"{item_id}-{version:x}"'
+
+    async def get(self, db: AsyncSession, item_id: int) -> Optional[int]:
+        """
+        获取 Item 当前版本号
+
+        Args:
+            db: 异步数据库会话
+            item_id: Item ID
+
+        Returns:
+            版本号；Item 不存在或 updated_at 为空时返回 None
+        """
+        backfill = redis_client.available
+        if backfill:
+            try:
+                async with redis_client.guarded() as client:
+                    cached = await client.get(_key(item_id))
+                if cached is not None:
+                    return int(cached)
+            except Exception as e:
+                logger.error(f"Redis 读取 Item 版本号失败: {e}")
+                backfill = False
+
+        if backfill:
+            # 只读副本可能尚未同步最近的修改或删除，回填缓存的版本号必须来自主库
+            use_primary(db)
+        updated_at = await db.scalar(select(Item.updated_at).where(Item.id == item_id))
+        if updated_at is None:
+            return None
+        version = self.version_of(updated_at)
+        if not backfill:
+            return version
+        try:
+            # NX：不覆盖并发写操作提交后写入的更新版本号
+            async with redis_client.guarded() as client:
+                await client.set(
+                    _key(item_id), version, ex=settings.ITEM_VERSION_BACKFILL_SECONDS, nx=True
+                )
+        except Exception as e:
+            logger.error(f"Redis 写入 Item 版本号失败: {e}")
+        return version
+
+    async def apply(self, changes: List[ItemChange]):
+        """
+        根据已提交的变更刷新版本号缓存（一个事务一次 pipeline）
+
+        Args:
+            changes: 本次事务内的 Item 变更
+        """
+        # 新建的 Item（只有 new_key）不会有版本号缓存，无需处理
+        changes = [
+            change
+            for change in changes
+            if change.item_id is not None
+            and (change.old_key is not None or change.new_key is None)
+        ]
+        if not changes or not redis_client.available:
+            return
+        try:
+            async with redis_client.pipeline() as pipe:
+                for change in changes:
+                    if change.new_key is not None and change.updated_at is not None:
+                        pipe.set(
+                            _key(change.item_id),
+                            self.version_of(change.updated_at),
+                            ex=settings.ITEM_VERSION_CACHE_SECONDS,
+                        )
+                    else:
+                        pipe.delete(_key(change.item_id))
+        except Exception as e:
+            logger.error(f"Redis 刷新 Item 版本号失败: {e}")
+
+
+# 创建全局 Item 版本号服务实例
+item_version_service = ItemVersionService()
+
+register_post_commit_hook(item_version_service.apply)
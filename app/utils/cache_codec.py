@@ -0,0 +1,200 @@
+"""
+缓存值编解码模块
+RedisClient 的缓存方法（set_cache / get_cache / mget_cache / mset_cache / pipeline）统一经过这里：
+- 序列化：json（标准库）、orjson、msgpack（需 pip install msgpack）
+- 压缩：编码结果达到 CACHE_COMPRESSION_MIN_BYTES 时使用 zstd（需 pip install zstandard）
+  或 lz4（需 pip install lz4）压缩，压缩后没有变小时保留原文
+- 格式头：编码结果的第一个字节记录序列化与压缩方式（最高位为 1），
+  读取时按格式头解码，与当前配置无关，因此切换配置或滚动升级期间新旧格式可以共存
+
+格式头的最高位为 1，合法的 JSON 文本不会以这样的字节开头，
+因此没有格式头的值按旧版本写入的 JSON 文本读取。
+CACHE_SERIALIZER=json 且未压缩时不写格式头，与旧版本的格式完全一致，
+从旧版本滚动升级时可先以该配置部署，全部 worker 升级后再切换到 orjson / msgpack。
+"""
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import orjson
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+from app.core.config import settings
+
+# 格式头：最高位标记，低 4 位为序列化方式，第 4~6 位为压缩方式
+HEADER_FLAG = 0x80
+
+SERIALIZER_IDS = {"json": 1, "orjson": 2, "msgpack": 3}
+COMPRESSION_IDS = {"none": 0, "zstd": 1, "lz4": 2}
+
+
+def _json_default(value: Any) -> Any:
+    """JSON / msgpack 不支持的类型：日期时间转为 ISO 8601 字符串"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_dumps(value: Any) -> bytes:
+    """标准库 json 编码"""
+    return json.dumps(value, default=_json_default).encode()
+
+
+def _orjson_dumps(value: Any) -> bytes:
+    """orjson 编码（原生支持 datetime，与 FastJSONResponse 的选项一致）"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _msgpack_dumps(value: Any) -> bytes:
+    """msgpack 编码"""
+    return msgpack.packb(value, default=_json_default, datetime=False)
+
+
+def _msgpack_loads(data: bytes) -> Any:
+    """msgpack 解码"""
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def _serializers() -> Dict[str, Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]]:
+    """可用的序列化方式：名称 -> (编码, 解码)，未安装的可选依赖不在其中"""
+    serializers = {
+        "json": (_json_dumps, orjson.loads),
+        "orjson": (_orjson_dumps, orjson.loads),
+    }
+    if msgpack is not None:
+        serializers["msgpack"] = (_msgpack_dumps, _msgpack_loads)
+    return serializers
+
+
+def _compressors(level: Optional[int]) -> Dict[str, Tuple[Callable, Callable]]:
+    """可用的压缩方式：名称 -> (压缩, 解压)，未安装的可选依赖不在其中"""
+    compressors: Dict[str, Tuple[Callable, Callable]] = {}
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=level if level is not None else 3)
+        decompressor = zstandard.ZstdDecompressor()
+        compressors["zstd"] = (compressor.compress, decompressor.decompress)
+    if lz4_frame is not None:
+        compressors["lz4"] = (
+            lambda data: lz4_frame.compress(data, compression_level=level or 0),
+            lz4_frame.decompress,
+        )
+    return compressors
+
+
+class CacheCodec:
+    """缓存值编解码器"""
+
+    def __init__(
+        self,
+        serializer: str = "orjson",
+        compression: str = "none",
+        min_bytes: int = 1024,
+        level: Optional[int] = None,
+    ):
+        """
+        初始化编解码器
+
+        配置的序列化或压缩方式依赖的库未安装时，退回 orjson / 不压缩。
+
+        Args:
+            serializer: 写入时的序列化方式（json / orjson / msgpack）
+            compression: 写入时的压缩方式（none / zstd / lz4）
+            min_bytes: 序列化结果达到该字节数时才压缩
+            level: 压缩级别，不提供时使用各算法的默认值
+        """
+        self._serializers = _serializers()
+        self._compressors = _compressors(level)
+        self._loads_by_id = {
+            SERIALIZER_IDS[name]: loads for name, (_, loads) in self._serializers.items()
+        }
+        self._decompress_by_id = {
+            COMPRESSION_IDS[name]: decompress
+            for name, (_, decompress) in self._compressors.items()
+        }
+
+        if serializer not in self._serializers:
+            print(f"⚠️ 缓存序列化方式 {serializer} 不可用（未安装依赖），使用 orjson")
+            serializer = "orjson"
+        if compression != "none" and compression not in self._compressors:
+            print(f"⚠️ 缓存压缩方式 {compression} 不可用（未安装依赖），不压缩")
+            compression = "none"
+        self.serializer = serializer
+        self.compression = compression
+        self.min_bytes = min_bytes
+        self._dumps = self._serializers[serializer][0]
+        self._compress = self._compressors[compression][0] if compression != "none" else None
+
+    def encode(self, value: Any) -> bytes:
+        """
+        编码缓存值
+
+        Args:
+            value: 待编码的值
+
+        Returns:
+            带格式头的字节串（json 且未压缩时为不带格式头的 JSON 文本）
+        """
+        payload = self._dumps(value)
+        compression = "none"
+        if self._compress is not None and len(payload) >= self.min_bytes:
+            compressed = self._compress(payload)
+            if len(compressed) < len(payload):
+                payload, compression = compressed, self.compression
+        if self.serializer == "json" and compression == "none":
+            return payload
+        header = HEADER_FLAG | COMPRESSION_IDS[compression] << 4
+        return bytes((header | SERIALIZER_IDS[self.serializer],)) + payload
+
+    def decode(self, data: Optional[bytes]) -> Optional[Any]:
+        """
+        解码缓存值（按格式头识别，兼容旧版本写入的 JSON 文本）
+
+        Args:
+            data: Redis 返回的原始值
+
+        Returns:
+            解码后的值，空值返回 None
+
+        Raises:
+            ValueError: 格式头无法识别，或所需的可选依赖未安装
+        """
+        if not data:
+            return None
+        if isinstance(data, str):
+            data = data.encode()
+        header = data[0]
+        if not header & HEADER_FLAG:
+            return orjson.loads(data)
+
+        loads = self._loads_by_id.get(header & 0x0F)
+        compression_id = (header >> 4) & 0x07
+        decompress = self._decompress_by_id.get(compression_id) if compression_id else None
+        if loads is None or (compression_id and decompress is None):
+            raise ValueError(f"无法解码的缓存格式头 0x{header:02x}")
+        payload = data[1:]
+        if decompress is not None:
+            payload = decompress(payload)
+        return loads(payload)
+
+
+# 创建全局缓存编解码器实例
+cache_codec = CacheCodec(
+    serializer=settings.CACHE_SERIALIZER,
+    compression=settings.CACHE_COMPRESSION,
+    min_bytes=settings.CACHE_COMPRESSION_MIN_BYTES,
+    level=settings.CACHE_COMPRESSION_LEVEL,
+)
@@ -0,0 +1,70 @@
+"""
+熔断器工具模块
+依赖（例如 Redis）连续失败达到阈值后打开熔断，打开期间调用方直接跳过该依赖，
+不再逐次等待超时；由后台任务定期探测，恢复后关闭熔断。
+"""
+import time
+from typing import Any, Dict, Optional
+
+
+class CircuitBreaker:
+    """熔断器（关闭 / 打开两种状态，恢复探测由持有者的后台任务负责）"""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        """
+        初始化熔断器
+
+        Args:
+            failure_threshold: 连续失败多少次后打开熔断
+            reset_seconds: 打开期间的探测间隔（秒）
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.trips = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        """熔断是否打开"""
+        return self.opened_at is not None
+
+    def record_success(self) -> None:
+        """记录一次成功调用"""
+        self.failures = 0
+
+    def record_failure(self) -> bool:
+        """
+        记录一次失败调用
+
+        Returns:
+            本次失败是否导致熔断打开
+        """
+        self.failures += 1
+        if not self.is_open and self.failures >= self.failure_threshold:
+            self.open()
+            return True
+        return False
+
+    def open(self) -> None:
+        """打开熔断"""
+        if not self.is_open:
+            self.opened_at = time.monotonic()
+            self.trips += 1
+
+    def close(self) -> None:
+        """关闭熔断"""
+        self.opened_at = None
+        self.failures = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """当前状态"""
+        return {
+            "state": "open" if self.is_open else "closed",
+            "failures": self.failures,
+            "failure_threshold": self.failure_threshold,
+            "trips": self.trips,
+            "open_seconds": (
+                round(time.monotonic() - self.opened_at, 3) if self.opened_at is not None else None
+            ),
+        }
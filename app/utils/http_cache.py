@@ -0,0 +1,105 @@
+"""
+HTTP 条件请求工具模块
+生成 ETag / Last-Modified 并判断 If-None-Match / If-Modified-Since 是否命中（命中时返回 304）
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+
+def body_etag(body: bytes) -> str:
+    """
+    根据响应体内容生成强 ETag
+
+    Args:
+        body: 响应体字节串
+
+    Returns:
+        带双引号的 ETag
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def http_date(value: datetime) -> str:
+    """
+    格式化为 HTTP 日期（Last-Modified 使用）
+
+    Args:
+        value: 时间，无时区信息时视为 UTC
+
+    Returns:
+        例如 "Mon, 01 Jan 2024 00:00:00 GMT"
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 是否匹配（弱比较，忽略 W/ 前缀）"""
+    if if_none_match.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == target for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    """资源在 If-Modified-Since 之后是否未修改（HTTP 日期精度为秒）"""
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def is_not_modified(
+    etag: str,
+    last_modified: Optional[datetime],
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+) -> bool:
+    """
+    判断条件 GET 是否可以返回 304
+
+    同时携带两个条件头时只看 If-None-Match（RFC 9110 13.2.2）。
+
+    Args:
+        etag: 当前资源的 ETag
+        last_modified: 当前资源的最后修改时间
+        if_none_match: 请求头 If-None-Match
+        if_modified_since: 请求头 If-Modified-Since
+
+    Returns:
+        是否未修改
+    """
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+    if if_modified_since and last_modified is not None:
+        return not_modified_since(if_modified_since, last_modified)
+    return False
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    """
+    响应中的缓存校验头
+
+    no-cache 表示客户端可以缓存，但每次使用前都要带条件头回源校验。
+
+    Args:
+        etag: ETag
+        last_modified: 最后修改时间
+
+    Returns:
+        响应头字典
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
@@ -0,0 +1,96 @@
+"""
+进程内缓存工具模块
+有容量上限的 LRU + TTL 缓存，作为 Redis 之前的一级缓存（L1）使用：
+- 超过 max_items 时淘汰最久未访问的条目
+- 每个条目在 ttl_seconds 后过期，限制跨进程失效通知丢失时的脏读时间
+- 仅在事件循环线程中使用，不加锁
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+def hit_ratio(hits: int, misses: int) -> Optional[float]:
+    """命中率，尚无访问时返回 None"""
+    total = hits + misses
+    return round(hits / total, 4) if total else None
+
+
+class LocalCache:
+    """进程内 LRU + TTL 缓存"""
+
+    def __init__(self, max_items: int, ttl_seconds: float):
+        """
+        初始化缓存
+
+        Args:
+            max_items: 最大条目数
+            ttl_seconds: 条目的最长存活时间（秒）
+        """
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        # 键 -> (过期时间, 值)，按访问顺序排列，最近访问的在末尾
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        读取缓存
+
+        Args:
+            key: 键
+
+        Returns:
+            值；未命中或已过期时返回 None
+        """
+        entry = self._data.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._data[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """
+        写入缓存
+
+        Args:
+            key: 键
+            value: 值（调用方不应再修改该对象）
+            ttl_seconds: 过期时间（秒），不超过缓存的 ttl_seconds
+        """
+        if self.max_items <= 0:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_items:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, keys: Iterable[str]) -> None:
+        """删除缓存"""
+        for key in keys:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """当前统计"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": hit_ratio(self.hits, self.misses),
+            "size": len(self._data),
+            "max_items": self.max_items,
+            "ttl_seconds": self.ttl_seconds,
+            "evictions": self.evictions,
+        }
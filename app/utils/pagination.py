@@ -0,0 +1,47 @@
+"""
+游标分页工具模块
+将排序键编码为不透明的游标字符串，用于 keyset（seek）分页
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    将排序键编码为游标
+
+    Args:
+        values: 排序键的值（datetime 会转换为 ISO 字符串）
+
+    Returns:
+        URL 安全的 base64 游标字符串
+    """
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    解码游标
+
+    Args:
+        cursor: encode_cursor 生成的游标字符串
+        size: 期望的排序键数量
+
+    Returns:
+        排序键列表
+
+    Raises:
+        ValueError: 游标格式不合法
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise ValueError("无效的分页游标") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("无效的分页游标")
+    return values
@@ -1,12 +1,118 @@
 """
 Redis 客户端工具模块
 支持受保护（需密码/用户名）的 Redis 连接
+- 连接模式（REDIS_MODE）：单机 standalone、哨兵 sentinel、集群 cluster
+- 连接池：最大连接数、读写与建连超时、空闲连接健康检查间隔均可配置
+- 熔断：连接类错误连续达到阈值或健康检查失败时打开熔断，期间所有调用立即失败（缓存方法返回未命中），
+  不再等待超时；后台任务定期重连，成功后恢复。缓存方法、pipeline() 与 guarded() 中的错误计入熔断器，
+  直接使用 client 执行的命令不计入
+
+多键操作（mget_cache / mset_cache / delete_many）与 pipeline 上下文管理器
+把多条命令合并为一次往返，缓存值与 set_cache / get_cache 使用相同的编码。
+
+缓存值由 cache_codec 编码为字节串（可能是 msgpack 或压缩后的二进制），
+连接使用 decode_responses=True，读取缓存值的命令以 NEVER_DECODE 选项取回原始字节，
+其他命令的返回值仍然是 str。
 """
-import json
-from typing import Any, Optional
+import asyncio
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 import redis.asyncio as redis
+from redis.asyncio.cluster import ClusterNode, RedisCluster
+from redis.asyncio.sentinel import Sentinel
+from redis.client import NEVER_DECODE
 
 from app.core.config import settings
+from app.utils.cache_codec import cache_codec
+from app.utils.circuit_breaker import CircuitBreaker
+
+# 读取缓存值时不按 utf-8 解码响应
+_RAW = {NEVER_DECODE: []}
+
+
+def _parse_nodes(nodes: str) -> List[Tuple[str, int]]:
+    """解析逗号分隔的 host:port 节点列表"""
+    result = []
+    for node in nodes.split(","):
+        if node.strip():
+            node_host, _, node_port = node.strip().rpartition(":")
+            result.append((node_host, int(node_port)))
+    return result
+
+
+def decode_value(value: Optional[bytes]) -> Optional[Any]:
+    """
+    解码缓存值
+
+    Args:
+        value: Redis 返回的原始字节串
+
+    Returns:
+        解码后的值；空值或无法解码时返回 None（视为未命中）
+    """
+    try:
+        return cache_codec.decode(value)
+    except Exception as e:
+        print(f"Redis 缓存值解码失败: {e}")
+        return None
+
+
+class RedisPipeline:
+    """
+    pipeline 封装：命令在退出上下文时一次往返执行
+
+    set_cache / get_cache 使用与 RedisClient 相同的编码；其他 Redis 命令
+    （incr、expire、hset 等）可直接调用，原样排队。执行结果按调用顺序保存在 results 中，
+    get_cache 的结果已解码。
+    """
+
+    def __init__(self, pipe: redis.client.Pipeline):
+        self.pipe = pipe
+        self.results: List[Any] = []
+        self._decoders: List[Optional[Callable[[Any], Any]]] = []
+
+    def set_cache(self, key: str, value: Any, ex: Optional[int] = None) -> "RedisPipeline":
+        """排队写入缓存"""
+        self.pipe.set(key, cache_codec.encode(value), ex=ex)
+        self._decoders.append(None)
+        return self
+
+    def get_cache(self, key: str) -> "RedisPipeline":
+        """排队读取缓存"""
+        self.pipe.execute_command("GET", key, **_RAW)
+        self._decoders.append(decode_value)
+        return self
+
+    def __getattr__(self, name: str):
+        command = getattr(self.pipe, name)
+
+        def queue(*args, **kwargs) -> "RedisPipeline":
+            command(*args, **kwargs)
+            self._decoders.append(None)
+            return self
+
+        return queue
+
+    async def execute(self) -> List[Any]:
+        """执行已排队的命令"""
+        raw = await self.pipe.execute()
+        self.results = [
+            decoder(value) if decoder is not None else value
+            for decoder, value in zip(self._decoders, raw)
+        ]
+        self._decoders = []
+        return self.results
 
 
 class RedisClient:
@@ -15,6 +121,13 @@ class RedisClient:
     def __init__(self):
         """初始化 Redis 连接"""
         self._redis_client: Optional[redis.Redis] = None
+        self._factory: Optional[Callable[[], redis.Redis]] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+        self.mode = settings.REDIS_MODE
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.REDIS_CIRCUIT_FAILURE_THRESHOLD,
+            reset_seconds=settings.REDIS_CIRCUIT_RESET_SECONDS,
+        )
 
     async def connect(
         self,
@@ -27,8 +140,10 @@ class RedisClient:
         db: Optional[int] = None,
     ):
         """
-        建立 Redis 连接
-        
+        建立 Redis 连接，并启动后台健康检查
+
+        连接失败时不会放弃：熔断打开，后台任务每 REDIS_CIRCUIT_RESET_SECONDS 秒重连一次。
+
         Args:
             url: 连接字符串（如 redis://:password@host:port/db），不提供则使用配置 settings.REDIS_URL
             password: 密码（优先级高于 url，用于受保护的 Redis）
@@ -37,47 +152,186 @@ class RedisClient:
             port: 端口（不提供则使用 settings.REDIS_PORT）
             db: 数据库编号（不提供则使用 settings.REDIS_DB）
         """
-        try:
-            # 如果显式提供了用户名/密码，或者配置中存在密码，则优先使用参数连接，避免 URL 中的特殊字符导致解析错误
-            if (password is not None) or (username is not None) or (settings.REDIS_PASSWORD):
-                self._redis_client = redis.Redis(
+        password = password if password is not None else (settings.REDIS_PASSWORD or None)
+        pool_kwargs = {
+            "max_connections": settings.REDIS_MAX_CONNECTIONS,
+            "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+            "socket_connect_timeout": settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+            "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL,
+            "encoding": "utf-8",
+            "decode_responses": True,
+        }
+
+        if self.mode == "sentinel":
+
+            def factory() -> redis.Redis:
+                sentinel = Sentinel(
+                    _parse_nodes(settings.REDIS_SENTINELS),
+                    sentinel_kwargs={
+                        "password": settings.REDIS_SENTINEL_PASSWORD or None,
+                        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+                        "socket_connect_timeout": settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+                    },
+                    password=password,
+                    username=username,
+                    db=db or settings.REDIS_DB,
+                )
+                return sentinel.master_for(settings.REDIS_SENTINEL_MASTER, **pool_kwargs)
+
+        elif self.mode == "cluster":
+
+            def factory() -> redis.Redis:
+                nodes = _parse_nodes(settings.REDIS_CLUSTER_NODES) or [
+                    (host or settings.REDIS_HOST, port or settings.REDIS_PORT)
+                ]
+                return RedisCluster(
+                    startup_nodes=[ClusterNode(*node) for node in nodes],
+                    password=password,
+                    username=username,
+                    **pool_kwargs,
+                )
+
+        # 如果显式提供了用户名/密码，或者配置中存在密码，则优先使用参数连接，避免 URL 中的特殊字符导致解析错误
+        elif password is not None or username is not None:
+
+            def factory() -> redis.Redis:
+                return redis.Redis(
                     host=host or settings.REDIS_HOST,
                     port=port or settings.REDIS_PORT,
                     db=db or settings.REDIS_DB,
-                    password=(password if password is not None else (settings.REDIS_PASSWORD or None)),
+                    password=password,
                     username=username,
-                    encoding="utf-8",
-                    decode_responses=True,
+                    **pool_kwargs,
                 )
-            else:
+
+        else:
+
+            def factory() -> redis.Redis:
                 # 优先使用显式传入的 URL；否则使用配置中的 REDIS_URL
-                final_url = url or settings.REDIS_URL
-                self._redis_client = redis.from_url(
-                    final_url,
-                    encoding="utf-8",
-                    decode_responses=True,
-                )
+                return redis.from_url(url or settings.REDIS_URL, **pool_kwargs)
 
-            # 测试连接
+        self._factory = factory
+        if await self._reconnect():
+            print(f"✅ Redis 连接成功（{self.mode}）")
+        if self._monitor_task is None:
+            self._monitor_task = asyncio.create_task(self._monitor_loop())
+
+    async def _reconnect(self) -> bool:
+        """
+        创建客户端（如尚未创建）并测试连接，成功时关闭熔断，失败时打开熔断
+
+        Returns:
+            是否连接成功
+        """
+        try:
+            if self._redis_client is None:
+                self._redis_client = self._factory()
             await self._redis_client.ping()
-            print("✅ Redis 连接成功")
         except Exception as e:
-            print(f"❌ Redis 连接失败: {e}")
-            self._redis_client = None
+            if not self.breaker.is_open:
+                print(f"❌ Redis 连接失败: {e}")
+            self.breaker.open()
+            if self._redis_client is not None:
+                # 丢弃客户端，下次重连时重新创建（Sentinel 重新查询主节点，集群重新加载拓扑）
+                client, self._redis_client = self._redis_client, None
+                try:
+                    await client.aclose()
+                except Exception:
+                    pass
+            return False
+        if self.breaker.is_open:
+            print("✅ Redis 已恢复连接")
+        self.breaker.close()
+        return True
+
+    async def _monitor_loop(self):
+        """后台健康检查：熔断打开时定期重连，关闭时定期 PING，失败即打开熔断"""
+        while True:
+            if self.breaker.is_open:
+                await asyncio.sleep(settings.REDIS_CIRCUIT_RESET_SECONDS)
+                await self._reconnect()
+                continue
+            await asyncio.sleep(settings.REDIS_HEALTH_CHECK_INTERVAL)
+            try:
+                await self._redis_client.ping()
+            except Exception as e:
+                print(f"❌ Redis 健康检查失败，暂停访问 Redis: {e}")
+                self.breaker.open()
+
+    def _record_error(self, error: Exception) -> None:
+        """记录一次调用失败，连接类错误连续达到阈值时打开熔断"""
+        if isinstance(error, (redis.ConnectionError, redis.TimeoutError, OSError)):
+            if self.breaker.record_failure():
+                print(f"❌ Redis 连续失败 {self.breaker.failures} 次，暂停访问 Redis: {error}")
 
     async def disconnect(self):
         """断开 Redis 连接"""
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+            self._monitor_task = None
         if self._redis_client:
-            await self._redis_client.close()
+            await self._redis_client.aclose()
+            self._redis_client = None
             print("🛑 Redis 连接已断开")
 
+    @property
+    def available(self) -> bool:
+        """Redis 是否可用（已连接且熔断未打开）"""
+        return self._redis_client is not None and not self.breaker.is_open
+
     @property
     def client(self) -> redis.Redis:
-        """获取 Redis 客户端实例"""
+        """
+        获取 Redis 客户端实例
+
+        Raises:
+            ConnectionError: 未连接或熔断打开（此时不会访问 Redis，立即失败）
+        """
         if not self._redis_client:
             raise ConnectionError("Redis 客户端未连接")
+        if self.breaker.is_open:
+            raise ConnectionError("Redis 不可用（熔断中）")
         return self._redis_client
 
+    @asynccontextmanager
+    async def guarded(self) -> AsyncIterator[redis.Redis]:
+        """
+        直接使用客户端执行命令，结果计入熔断器
+
+        缓存方法之外的 Redis 调用（锁、计数器、发布通知等）应通过它或 pipeline() 访问 Redis，
+        连接类错误才会累计到熔断阈值；异常原样抛出，由调用方决定如何降级。
+
+        用法：
+            async with redis_client.guarded() as client:
+                value = await client.hget("key", "field")
+
+        Yields:
+            Redis 客户端
+
+        Raises:
+            ConnectionError: 未连接或熔断打开（不访问 Redis，立即失败）
+        """
+        client = self.client
+        try:
+            yield client
+        except Exception as e:
+            self._record_error(e)
+            raise
+        self.breaker.record_success()
+
+    def status(self) -> Dict[str, Any]:
+        """连接状态（模式、可用性、熔断器、连接池上限）"""
+        return {
+            "mode": self.mode,
+            "available": self.available,
+            "circuit": self.breaker.snapshot(),
+            "max_connections": settings.REDIS_MAX_CONNECTIONS,
+        }
+
     # --- 缓存操作 ---
 
     async def set_cache(self, key: str, value: Any, ex: Optional[int] = None) -> bool:
@@ -86,18 +340,23 @@ class RedisClient:
         
         Args:
             key: 键
-            value: 值 (会自动序列化为 JSON)
+            value: 值 (按 CACHE_SERIALIZER 自动编码)
             ex: 过期时间（秒）
             
         Returns:
             是否设置成功
         """
+        if not self.available:
+            return False
         try:
-            serialized_value = json.dumps(value)
-            return await self.client.set(key, serialized_value, ex=ex)
+            serialized_value = cache_codec.encode(value)
+            result = await self.client.set(key, serialized_value, ex=ex)
         except Exception as e:
+            self._record_error(e)
             print(f"Redis set_cache 失败: {e}")
             return False
+        self.breaker.record_success()
+        return result
 
     async def get_cache(self, key: str) -> Optional[Any]:
         """
@@ -109,14 +368,16 @@ class RedisClient:
         Returns:
             值 (会自动反序列化为 Python 对象) 或 None
         """
-        try:
-            value = await self.client.get(key)
-            if value:
-                return json.loads(value)
+        if not self.available:
             return None
+        try:
+            value = await self.client.execute_command("GET", key, **_RAW)
         except Exception as e:
+            self._record_error(e)
             print(f"Redis get_cache 失败: {e}")
             return None
+        self.breaker.record_success()
+        return decode_value(value)
 
     async def delete_cache(self, key: str) -> int:
         """
@@ -128,11 +389,139 @@ class RedisClient:
         Returns:
             删除的键的数量
         """
+        if not self.available:
+            return 0
         try:
-            return await self.client.delete(key)
+            result = await self.client.delete(key)
         except Exception as e:
+            self._record_error(e)
             print(f"Redis delete_cache 失败: {e}")
             return 0
+        self.breaker.record_success()
+        return result
+
+    # --- 批量操作 ---
+
+    async def mget_cache(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """
+        批量获取缓存（一次 MGET）
+
+        Args:
+            keys: 键列表
+
+        Returns:
+            与 keys 顺序一致的值列表，未命中为 None；Redis 不可用时全部为 None
+        """
+        if not keys or not self.available:
+            return [None] * len(keys)
+        try:
+            if self.mode == "cluster":
+                # 集群模式下 MGET 的键必须位于同一个槽，改为按节点分组的 pipeline
+                pipe = self.client.pipeline()
+                for key in keys:
+                    pipe.execute_command("GET", key, **_RAW)
+                values = await pipe.execute()
+            else:
+                values = await self.client.execute_command("MGET", *keys, **_RAW)
+        except Exception as e:
+            self._record_error(e)
+            print(f"Redis mget_cache 失败: {e}")
+            return [None] * len(keys)
+        self.breaker.record_success()
+        return [decode_value(value) for value in values]
+
+    async def mset_cache(
+        self, items: Mapping[str, Any], ex: Union[int, Mapping[str, int], None] = None
+    ) -> bool:
+        """
+        批量设置缓存
+
+        不设置过期时间时为一次 MSET；设置过期时间时为一个 pipeline（每个键一条 SET ... EX），
+        同样只有一次往返。
+
+        Args:
+            items: {键: 值}，值会自动序列化
+            ex: 过期时间（秒），可以是统一的秒数，也可以是 {键: 秒数}（未列出的键不过期）
+
+        Returns:
+            是否设置成功
+        """
+        if not items:
+            return True
+        if not self.available:
+            return False
+        try:
+            encoded = {key: cache_codec.encode(value) for key, value in items.items()}
+            if ex is None and self.mode != "cluster":
+                await self.client.mset(encoded)
+            else:
+                pipe = self.client.pipeline(transaction=False)
+                for key, value in encoded.items():
+                    ttl = ex if ex is None or isinstance(ex, int) else ex.get(key)
+                    pipe.set(key, value, ex=ttl)
+                await pipe.execute()
+        except Exception as e:
+            self._record_error(e)
+            print(f"Redis mset_cache 失败: {e}")
+            return False
+        self.breaker.record_success()
+        return True
+
+    async def delete_many(self, keys: Sequence[str]) -> int:
+        """
+        批量删除缓存（一次 DEL）
+
+        Args:
+            keys: 键列表
+
+        Returns:
+            删除的键的数量
+        """
+        if not keys or not self.available:
+            return 0
+        try:
+            # 集群模式下由客户端按槽拆分
+            result = await self.client.delete(*keys)
+        except Exception as e:
+            self._record_error(e)
+            print(f"Redis delete_many 失败: {e}")
+            return 0
+        self.breaker.record_success()
+        return result
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[RedisPipeline]:
+        """
+        pipeline 上下文管理器：上下文内排队的命令在退出时一次往返执行
+
+        与其他缓存方法不同，Redis 不可用或执行失败时抛出异常，由调用方决定如何降级；
+        上下文内抛出异常时已排队的命令全部丢弃。
+        集群模式下命令按节点分组执行，transaction=True 时所有键必须位于同一个槽（使用 hash tag）。
+
+        用法：
+            async with redis_client.pipeline() as pipe:
+                pipe.get_cache("a")
+                pipe.set_cache("b", {"x": 1}, ex=60)
+                pipe.incr("counter")
+            a, _, counter = pipe.results
+
+        Args:
+            transaction: 是否以 MULTI / EXEC 事务执行
+
+        Yields:
+            RedisPipeline
+        """
+        batch = RedisPipeline(self.client.pipeline(transaction=transaction))
+        try:
+            yield batch
+            try:
+                await batch.execute()
+            except Exception as e:
+                self._record_error(e)
+                raise
+            self.breaker.record_success()
+        finally:
+            await batch.pipe.reset()
 
 
 # 创建全局 Redis 客户端实例
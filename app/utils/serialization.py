@@ -0,0 +1,69 @@
+"""
+JSON 序列化工具
+- FastJSONResponse：使用 orjson 编码的响应类，路由直接返回时 FastAPI 不再按 response_model 二次校验
+- row_dict / rows_payload：直接读取 ORM 对象属性生成可编码的字典，跳过 Pydantic 校验
+
+ORM 对象来自数据库，字段类型已由模型约束，因此响应路径上无需再次校验；
+response_model 仍然保留在路由上，用于生成 OpenAPI 文档。
+"""
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Type
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def dumps(content: Any) -> bytes:
+    """
+    使用 orjson 编码（支持 datetime / date / UUID / dataclass，非字符串的字典键）
+
+    Args:
+        content: 待编码的数据
+
+    Returns:
+        JSON 字节串
+    """
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """基于 orjson 的 JSON 响应"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def schema_fields(schema: Type[BaseModel]) -> Tuple[str, ...]:
+    """响应 Schema 的字段名（按声明顺序，结果缓存）"""
+    return tuple(schema.model_fields)
+
+
+def row_dict(row: Any, fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    读取 ORM 对象（或 Row）的指定属性，生成响应字典
+
+    Args:
+        row: ORM 对象或查询结果行
+        fields: 输出的字段名
+
+    Returns:
+        字段名到值的字典
+    """
+    return {field: getattr(row, field) for field in fields}
+
+
+def rows_payload(rows: Iterable[Any], schema: Type[BaseModel]) -> List[Dict[str, Any]]:
+    """
+    按响应 Schema 的字段把一组 ORM 对象转换为字典列表（不做校验）
+
+    Args:
+        rows: ORM 对象或查询结果行
+        schema: 响应 Schema，例如 ItemResponse
+
+    Returns:
+        字典列表
+    """
+    fields = schema_fields(schema)
+    return [row_dict(row, fields) for row in rows]
@@ -0,0 +1,116 @@
+"""
+Item 响应序列化基准测试脚本
+
+对比列表接口三种序列化方式的耗时：
+- 原路径：逐个 ItemResponse.model_validate，FastAPI 再按 response_model 校验一次，
+  jsonable 后由 JSONResponse（json.dumps）编码
+- TypeAdapter：缓存的 TypeAdapter(List[ItemResponse]) 校验一次后 dump_json
+- 快速路径：直接读取 ORM 属性，orjson 编码（当前 /items 路由使用的方式）
+
+无需数据库，使用内存中构造的 Item 对象。
+
+用法：
+    python scripts/bench_item_serialization.py --rows 100 --repeat 2000
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.models.item import Item  # noqa: E402
+from app.schemas.item import ItemListResponse, ItemResponse  # noqa: E402
+from app.utils.serialization import dumps, rows_payload  # noqa: E402
+
+LIST_ADAPTER = TypeAdapter(List[ItemResponse])
+RESPONSE_ADAPTER = TypeAdapter(ItemListResponse)
+
+
+def make_items(rows: int) -> List[Item]:
+    """构造测试用的 Item 对象"""
+    start = datetime(2024, 1, 1)
+    return [
+        Item(
+            id=n + 1,
+            title=f"测试条目 {n}",
+            description="描述内容 " * 20,
+            status=("active", "pending", "done")[n % 3],
+            is_active=n % 7 != 0,
+            created_at=start + timedelta(seconds=n),
+            updated_at=start + timedelta(seconds=n, microseconds=123),
+        )
+        for n in range(rows)
+    ]
+
+
+def envelope(items) -> dict:
+    """分页响应的外层结构"""
+    return {
+        "total": len(items),
+        "items": items,
+        "skip": 0,
+        "limit": len(items),
+        "next_cursor": None,
+    }
+
+
+def current_path(items: List[Item]) -> bytes:
+    """原路径：手动校验 + response_model 二次校验 + json.dumps"""
+    response = ItemListResponse(**envelope([ItemResponse.model_validate(item) for item in items]))
+    validated = RESPONSE_ADAPTER.validate_python(response, from_attributes=True)
+    content = RESPONSE_ADAPTER.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def type_adapter_path(items: List[Item]) -> bytes:
+    """缓存的 TypeAdapter：校验一次后直接输出 JSON"""
+    validated = LIST_ADAPTER.validate_python(items, from_attributes=True)
+    return dumps(envelope(LIST_ADAPTER.dump_python(validated, mode="json")))
+
+
+def fast_path(items: List[Item]) -> bytes:
+    """快速路径：ORM 属性直接编码"""
+    return dumps(envelope(rows_payload(items, ItemResponse)))
+
+
+def measure(func, items: List[Item], repeat: int) -> float:
+    """返回多次执行的耗时中位数（微秒）"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(items)
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    return statistics.median(timings)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Item 响应序列化基准测试")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 20, 100], help="每页行数")
+    parser.add_argument("--repeat", type=int, default=2000, help="每种方式的执行次数")
+    args = parser.parse_args()
+
+    paths = [("原路径", current_path), ("TypeAdapter", type_adapter_path), ("快速路径", fast_path)]
+    print(f"{'行数':>6}" + "".join(f"{name:>16}" for name, _ in paths) + f"{'加速比':>10}")
+    for rows in args.rows:
+        items = make_items(rows)
+        # 三种方式输出的 JSON 内容必须一致
+        expected = json.loads(current_path(items))
+        for name, func in paths:
+            assert json.loads(func(items)) == expected, f"{name} 输出与原路径不一致"
+        timings = [measure(func, items, args.repeat) for _, func in paths]
+        speedup = timings[0] / timings[-1]
+        print(f"{rows:>6}" + "".join(f"{t:>14.1f}µs" for t in timings) + f"{speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
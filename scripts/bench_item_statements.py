@@ -0,0 +1,150 @@
+"""
+Item 热点查询语句构建基准测试脚本
+
+对比分页接口每次请求在 Python 侧准备查询语句的开销：
+- 逐次构建：每次调用重新拼装 select().where().order_by().offset().limit()，
+  条件值直接写入语句（每个值生成一个新的绑定参数，原先分页接口的写法），
+  SQLAlchemy 每次都要重新计算缓存键
+- 预构建模板：item_statements 中按条件组合缓存的语句，以参数字典执行，
+  缓存键只计算一次
+
+分别统计"构建 + 计算缓存键"的耗时，以及在内存 SQLite 上端到端执行的耗时。
+
+用法：
+    python scripts/bench_item_statements.py --rows 1000 --repeat 5000
+"""
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import and_, asc, create_engine, desc, insert, or_, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.models.item import Item  # noqa: E402
+from app.services import item_statements  # noqa: E402
+
+
+def build_per_call(status, is_active, order, after, skip, limit):
+    """逐次构建：与改造前的 filtered_query 一致"""
+    stmt = select(Item)
+    if status is not None:
+        stmt = stmt.where(Item.status == status)
+    if is_active is not None:
+        stmt = stmt.where(Item.is_active == is_active)
+    if after is not None:
+        created_at, item_id = after
+        if order == "asc":
+            stmt = stmt.where(
+                or_(
+                    Item.created_at > created_at,
+                    and_(Item.created_at == created_at, Item.id > item_id),
+                )
+            )
+        else:
+            stmt = stmt.where(
+                or_(
+                    Item.created_at < created_at,
+                    and_(Item.created_at == created_at, Item.id < item_id),
+                )
+            )
+    if order == "asc":
+        stmt = stmt.order_by(asc(Item.created_at), asc(Item.id))
+    else:
+        stmt = stmt.order_by(desc(Item.created_at), desc(Item.id))
+    if after is None:
+        stmt = stmt.offset(skip)
+    return stmt.limit(limit), None
+
+
+def prebuilt(status, is_active, order, after, skip, limit):
+    """预构建模板：取缓存的语句，生成参数字典"""
+    stmt = item_statements.page_statement(
+        status is not None, is_active is not None, order, after is not None
+    )
+    params = item_statements.filter_params(status, is_active, after)
+    if after is None:
+        params["offset"] = skip
+    params["limit"] = limit
+    return stmt, params
+
+
+def cases(middle: datetime):
+    """与分页接口一致的几种调用形态"""
+    return [
+        ("偏移分页 status+is_active", ("pending", True, "desc", None, 40, 20)),
+        ("偏移分页 无过滤", (None, None, "desc", None, 0, 20)),
+        ("游标分页 status", ("active", None, "desc", (middle, 10**9), 0, 21)),
+        ("游标分页 升序", (None, True, "asc", (middle, 0), 0, 21)),
+    ]
+
+
+def measure(func, repeat: int) -> float:
+    """返回多次执行的耗时中位数（微秒）"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    return statistics.median(timings)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Item 热点查询语句构建基准测试")
+    parser.add_argument("--rows", type=int, default=1000, help="测试数据行数")
+    parser.add_argument("--repeat", type=int, default=5000, help="每种方式的执行次数")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Item.__table__.create(engine)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Item),
+            [
+                {
+                    "title": f"item {n}",
+                    "status": ("active", "pending", "done")[n % 3],
+                    "is_active": n % 7 != 0,
+                    "created_at": start + timedelta(seconds=n),
+                    "updated_at": start + timedelta(seconds=n),
+                }
+                for n in range(args.rows)
+            ],
+        )
+    middle = start + timedelta(seconds=args.rows // 2)
+
+    print(f"{'调用形态':<24}{'构建(逐次)':>12}{'构建(模板)':>12}{'执行(逐次)':>12}{'执行(模板)':>12}")
+    with Session(engine) as db:
+        for name, call in cases(middle):
+            # 两种方式返回的结果必须一致
+            expected = [item.id for item in db.scalars(*build_per_call(*call))]
+            assert [item.id for item in db.scalars(*prebuilt(*call))] == expected, name
+
+            def build_only(builder):
+                stmt, _ = builder(*call)
+                stmt._generate_cache_key()
+
+            def execute(builder):
+                db.scalars(*builder(*call)).all()
+                db.expunge_all()
+
+            timings = [
+                measure(lambda: build_only(build_per_call), args.repeat),
+                measure(lambda: build_only(prebuilt), args.repeat),
+                measure(lambda: execute(build_per_call), args.repeat // 10 or 1),
+                measure(lambda: execute(prebuilt), args.repeat // 10 or 1),
+            ]
+            print(f"{name:<24}" + "".join(f"{t:>10.1f}µs" for t in timings))
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
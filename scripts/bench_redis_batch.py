@@ -0,0 +1,139 @@
+"""
+Redis 批量操作基准测试脚本
+
+对比逐键操作与批量操作在 10 / 100 / 1000 个键时的耗时：
+- 写入：逐键 set_cache 与 mset_cache（统一过期时间，一个 pipeline）
+- 读取：逐键 get_cache 与 mget_cache（一次 MGET）
+- 删除：逐键 delete_cache 与 delete_many（一次 DEL）
+- 混合：逐条执行与 pipeline 上下文管理器（读取 + 计数 + 续期）
+
+逐键操作每个键一次往返，批量操作无论键数多少都只有一次往返。
+不指定 --url 时使用进程内的 fakeredis（需 pip install fakeredis），只能体现客户端侧的开销；
+指定 --url 连接真实 Redis 时，差距会随网络往返时间成倍放大。
+
+用法：
+    python scripts/bench_redis_batch.py --sizes 10 100 1000
+    python scripts/bench_redis_batch.py --url redis://localhost:6379/15
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.utils.redis_client import RedisClient  # noqa: E402
+
+KEY_PREFIX = "bench:batch:"
+
+
+async def connect(url):
+    """连接真实 Redis 或创建 fakeredis 客户端"""
+    client = RedisClient()
+    if url:
+        await client.connect(url)
+        client.client  # 连接失败时抛出 ConnectionError
+    else:
+        import fakeredis
+
+        client._redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    return client
+
+
+async def measure(func, repeat: int) -> float:
+    """返回多次执行的耗时中位数（毫秒）"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def bench_size(client: RedisClient, size: int, repeat: int):
+    """测试一种键数，返回 [(操作, 逐键耗时, 批量耗时)]"""
+    keys = [f"{KEY_PREFIX}{n}" for n in range(size)]
+    values = {
+        key: {"id": n, "title": f"item {n}", "status": "active"} for n, key in enumerate(keys)
+    }
+
+    async def set_each():
+        for key, value in values.items():
+            await client.set_cache(key, value, ex=60)
+
+    async def set_batch():
+        await client.mset_cache(values, ex=60)
+
+    async def get_each():
+        for key in keys:
+            await client.get_cache(key)
+
+    async def get_batch():
+        await client.mget_cache(keys)
+
+    async def mixed_each():
+        for key in keys:
+            await client.get_cache(key)
+            await client.client.incr(f"{KEY_PREFIX}hits")
+            await client.client.expire(key, 60)
+
+    async def mixed_batch():
+        async with client.pipeline() as pipe:
+            for key in keys:
+                pipe.get_cache(key).incr(f"{KEY_PREFIX}hits").expire(key, 60)
+
+    async def delete_each():
+        await client.mset_cache(values)
+        for key in keys:
+            await client.delete_cache(key)
+
+    async def delete_batch():
+        await client.mset_cache(values)
+        await client.delete_many(keys)
+
+    # 两种方式读取的结果必须一致
+    await set_batch()
+    assert [await client.get_cache(key) for key in keys] == await client.mget_cache(keys)
+
+    rows = []
+    for name, each, batch in [
+        ("写入", set_each, set_batch),
+        ("读取", get_each, get_batch),
+        ("混合", mixed_each, mixed_batch),
+        ("删除", delete_each, delete_batch),
+    ]:
+        rows.append((name, await measure(each, repeat), await measure(batch, repeat)))
+    await client.delete_many(keys + [f"{KEY_PREFIX}hits"])
+    return rows
+
+
+async def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Redis 批量操作基准测试")
+    parser.add_argument("--url", help="Redis 连接字符串，不提供则使用 fakeredis")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="键数")
+    parser.add_argument("--repeat", type=int, default=5, help="每种方式的执行次数")
+    args = parser.parse_args()
+
+    client = await connect(args.url)
+    print(f"后端: {args.url or 'fakeredis'}")
+    print(f"{'键数':>6}{'操作':>6}{'往返(逐键)':>12}{'往返(批量)':>12}{'逐键':>12}{'批量':>12}{'倍数':>8}")
+    try:
+        for size in args.sizes:
+            for name, each, batch in await bench_size(client, size, args.repeat):
+                # 混合操作逐键时每个键 3 次往返
+                trips = size * 3 if name == "混合" else size
+                print(
+                    f"{size:>8}{name:>6}{trips:>14}{1:>14}"
+                    f"{each:>12.2f}ms{batch:>10.2f}ms{each / batch:>9.1f}x"
+                )
+    finally:
+        await client.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,24 @@
+"""
+测试公共夹具
+"""
+import fakeredis
+import pytest
+import pytest_asyncio
+
+from app.utils.redis_client import redis_client as global_redis_client
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest_asyncio.fixture
+async def redis(server):
+    """将全局 redis_client 连接到 fakeredis，返回底层客户端"""
+    global_redis_client._factory = lambda: fakeredis.aioredis.FakeRedis(
+        server=server, decode_responses=True
+    )
+    assert await global_redis_client._reconnect()
+    yield global_redis_client.client
+    await global_redis_client.disconnect()
@@ -0,0 +1,124 @@
+"""
+缓存值编解码测试：各序列化 / 压缩方式的往返、旧版本 JSON 兼容与可选依赖缺失时的行为
+"""
+import json
+from datetime import datetime
+
+import orjson
+import pytest
+
+from app.utils import cache_codec as codec_module
+from app.utils.cache_codec import HEADER_FLAG, CacheCodec
+
+VALUE = {"id": 1, "title": "标题", "tags": ["a", "b"], "price": 1.5, "active": True, "none": None}
+LARGE_VALUE = {"items": [{"id": n, "title": f"item {n}", "status": "active"} for n in range(200)]}
+
+
+@pytest.mark.parametrize("serializer", ["json", "orjson", "msgpack"])
+def test_round_trip(serializer):
+    if serializer == "msgpack":
+        pytest.importorskip("msgpack")
+    codec = CacheCodec(serializer=serializer)
+
+    assert codec.decode(codec.encode(VALUE)) == VALUE
+
+
+@pytest.mark.parametrize("compression, module", [("zstd", "zstandard"), ("lz4", "lz4.frame")])
+@pytest.mark.parametrize("serializer", ["json", "orjson", "msgpack"])
+def test_compressed_round_trip(serializer, compression, module):
+    pytest.importorskip(module)
+    if serializer == "msgpack":
+        pytest.importorskip("msgpack")
+    codec = CacheCodec(serializer=serializer, compression=compression, min_bytes=64)
+
+    data = codec.encode(LARGE_VALUE)
+
+    assert data[0] & HEADER_FLAG
+    assert (data[0] >> 4) & 0x07 != 0
+    assert len(data) < len(orjson.dumps(LARGE_VALUE))
+    assert codec.decode(data) == LARGE_VALUE
+
+
+def test_small_values_are_not_compressed():
+    pytest.importorskip("zstandard")
+    codec = CacheCodec(compression="zstd", min_bytes=1024)
+
+    data = codec.encode(VALUE)
+
+    assert (data[0] >> 4) & 0x07 == 0
+    assert codec.decode(data) == VALUE
+
+
+def test_json_without_compression_writes_no_header():
+    data = CacheCodec(serializer="json").encode(VALUE)
+
+    # 与旧版本写入的格式一致，旧 worker 可以直接 json.loads
+    assert not data[0] & HEADER_FLAG
+    assert json.loads(data) == VALUE
+
+
+@pytest.mark.parametrize("serializer", ["json", "orjson", "msgpack"])
+def test_decodes_legacy_json(serializer):
+    if serializer == "msgpack":
+        pytest.importorskip("msgpack")
+    codec = CacheCodec(serializer=serializer)
+    legacy = json.dumps(VALUE)
+
+    assert codec.decode(legacy.encode()) == VALUE
+    # decode_responses=True 的连接读到的是 str
+    assert codec.decode(legacy) == VALUE
+
+
+def test_decodes_format_written_by_other_config():
+    pytest.importorskip("msgpack")
+    writer = CacheCodec(serializer="msgpack")
+    reader = CacheCodec(serializer="json")
+
+    assert reader.decode(writer.encode(VALUE)) == VALUE
+
+
+def test_datetime_values_are_encoded_as_iso_strings():
+    value = {"created_at": datetime(2024, 1, 2, 3, 4, 5)}
+
+    for serializer in ("json", "orjson"):
+        codec = CacheCodec(serializer=serializer)
+        assert codec.decode(codec.encode(value)) == {"created_at": "2024-01-02T03:04:05"}
+
+
+def test_empty_value_decodes_to_none():
+    codec = CacheCodec()
+
+    assert codec.decode(None) is None
+    assert codec.decode(b"") is None
+
+
+def test_unknown_header_raises():
+    with pytest.raises(ValueError):
+        CacheCodec().decode(bytes((HEADER_FLAG | 0x0F,)) + b"{}")
+
+
+def test_missing_decompressor_raises(monkeypatch):
+    pytest.importorskip("zstandard")
+    data = CacheCodec(compression="zstd", min_bytes=64).encode(LARGE_VALUE)
+    monkeypatch.setattr(codec_module, "zstandard", None)
+
+    with pytest.raises(ValueError):
+        CacheCodec().decode(data)
+
+
+def test_missing_serializer_falls_back_to_orjson(monkeypatch):
+    monkeypatch.setattr(codec_module, "msgpack", None)
+
+    codec = CacheCodec(serializer="msgpack")
+
+    assert codec.serializer == "orjson"
+    assert codec.decode(codec.encode(VALUE)) == VALUE
+
+
+def test_missing_compressor_falls_back_to_none(monkeypatch):
+    monkeypatch.setattr(codec_module, "lz4_frame", None)
+
+    codec = CacheCodec(compression="lz4", min_bytes=64)
+
+    assert codec.compression == "none"
+    assert (codec.encode(LARGE_VALUE)[0] >> 4) & 0x07 == 0
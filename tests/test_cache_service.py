@@ -0,0 +1,209 @@
+"""
+CacheService 测试（使用 fakeredis）
+"""
+import asyncio
+import random
+
+import pytest
+
+from app.core.config import settings
+from app.services.cache_service import INVALIDATION_CHANNEL, CacheService, item_list_tags
+from app.services.item_events import ItemChange
+from app.utils.redis_client import redis_client
+
+KEY = "item:1"
+VALUE = {"id": 1, "title": "标题"}
+
+
+class CountingLoader:
+    """记录调用次数的回源函数，等待 release 后返回 value 或抛出 error"""
+
+    def __init__(self, value=VALUE, error=None):
+        self.value = value
+        self.error = error
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self):
+        self.calls += 1
+        self.started.set()
+        await self.release.wait()
+        await asyncio.sleep(0.01)
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+@pytest.fixture
+def fast_wait(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_LOAD_WAIT_MS", 5)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_load_once(redis):
+    cache = CacheService()
+    loader = CountingLoader()
+
+    results = await asyncio.gather(*(cache.get_or_load(KEY, loader) for _ in range(10)))
+
+    assert results == [VALUE] * 10
+    assert loader.calls == 1
+    assert cache.coalesced == 9
+    assert await redis_client.get_cache(KEY) == VALUE
+    assert not await redis.exists(f"lock:{KEY}")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_across_workers_load_once(redis, fast_wait):
+    workers = [CacheService(), CacheService()]
+    loader = CountingLoader()
+
+    results = await asyncio.gather(*(cache.get_or_load(KEY, loader) for cache in workers))
+
+    assert results == [VALUE, VALUE]
+    assert loader.calls == 1
+    # 未持锁的 worker 轮询等待持锁 worker 写入的缓存
+    assert sum(cache.load_waits for cache in workers) == 1
+
+
+@pytest.mark.asyncio
+async def test_loader_error_reaches_all_waiters(redis):
+    cache = CacheService()
+    loader = CountingLoader(error=RuntimeError("数据库不可用"))
+
+    results = await asyncio.gather(
+        *(cache.get_or_load(KEY, loader) for _ in range(5)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert loader.calls == 1
+    assert cache._inflight == {}
+    assert not await redis.exists(KEY, f"lock:{KEY}")
+
+
+@pytest.mark.asyncio
+async def test_failed_early_refresh_returns_stale_value(redis, monkeypatch):
+    cache = CacheService()
+    loader = CountingLoader(value={"id": 1, "title": "新标题"}, error=RuntimeError("超时"))
+    await redis_client.set_cache(KEY, VALUE, ex=10)
+    await redis.set(f"{KEY}:delta", 100)
+    # 上次回源耗时 100 秒，剩余 10 秒时必然提前刷新
+    monkeypatch.setattr(random, "random", lambda: 0.99)
+
+    assert await cache.get_or_load(KEY, loader) == VALUE
+
+    assert loader.calls == 1
+    assert cache.early_refreshes == 1
+    assert await redis_client.get_cache(KEY) == VALUE
+
+
+@pytest.mark.asyncio
+async def test_early_refresh_by_other_worker_returns_stale_value(redis, monkeypatch):
+    cache = CacheService()
+    loader = CountingLoader()
+    await redis_client.set_cache(KEY, VALUE, ex=10)
+    await redis.set(f"{KEY}:delta", 100)
+    await redis.set(f"lock:{KEY}", "other-worker")
+    monkeypatch.setattr(random, "random", lambda: 0.99)
+
+    assert await cache.get_or_load(KEY, loader) == VALUE
+
+    assert loader.calls == 0
+    assert cache.load_waits == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_load(redis):
+    cache = CacheService()
+    loader = CountingLoader()
+    loader.release.clear()
+
+    first = asyncio.create_task(cache.get_or_load(KEY, loader))
+    await loader.started.wait()
+    second = asyncio.create_task(cache.get_or_load(KEY, loader))
+    for _ in range(100):
+        if cache.coalesced:
+            break
+        await asyncio.sleep(0.001)
+    assert cache.coalesced == 1
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    loader.release.set()
+
+    assert await second == VALUE
+    assert loader.calls == 1
+    assert await redis_client.get_cache(KEY) == VALUE
+    assert not await redis.exists(f"lock:{KEY}")
+
+
+async def wait_for(condition):
+    for _ in range(200):
+        if await condition():
+            return
+        await asyncio.sleep(0.005)
+    raise AssertionError("等待超时")
+
+
+@pytest.mark.asyncio
+async def test_write_drops_l1_on_other_workers(redis):
+    writer, reader = CacheService(), CacheService()
+    reader.start()
+    try:
+
+        async def subscribed():
+            return (await redis.pubsub_numsub(INVALIDATION_CHANNEL))[0][1] == 1
+
+        await wait_for(subscribed)
+        await writer.set_item_cache(1, VALUE)
+
+        async def received():
+            return reader.invalidations_received == 1
+
+        # 等待第一次写入的通知处理完，避免它淘汰下面读取时回填的 L1
+        await wait_for(received)
+        assert await reader.get_item_cache(1) == VALUE
+        assert reader.local.get(KEY) == VALUE
+
+        await writer.set_item_cache(1, {"id": 1, "title": "新标题"})
+
+        async def dropped():
+            return reader.local.get(KEY) is None
+
+        await wait_for(dropped)
+        assert reader.invalidations_received == 2
+        assert await reader.get_item_cache(1) == {"id": 1, "title": "新标题"}
+    finally:
+        await reader.stop()
+
+
+@pytest.mark.asyncio
+async def test_list_cache_invalidated_by_tags(redis):
+    cache = CacheService()
+    active = {"status": "active", "skip": 0, "limit": 10}
+    draft = {"status": "draft", "skip": 0, "limit": 10}
+    await cache.set_item_list_cache(active, [VALUE])
+    await cache.set_item_list_cache(draft, [])
+    assert (await cache.get_item_list_cache(active))[0] == [VALUE]
+
+    await cache.invalidate_item_list_tags(item_list_tags(active))
+
+    assert (await cache.get_item_list_cache(active))[0] is None
+    assert (await cache.get_item_list_cache(draft))[0] == []
+
+
+@pytest.mark.asyncio
+async def test_list_cache_invalidated_by_item_change(redis):
+    cache = CacheService()
+    draft = {"status": "draft"}
+    inactive = {"is_active": False}
+    await cache.set_item_list_cache(draft, [])
+    await cache.set_item_list_cache(inactive, [])
+
+    await cache.apply([ItemChange(1, old_key=("active", True), new_key=("draft", True))])
+
+    assert (await cache.get_item_list_cache(draft))[0] is None
+    assert (await cache.get_item_list_cache(inactive))[0] == []
@@ -0,0 +1,49 @@
+"""
+熔断器测试
+"""
+from app.utils.circuit_breaker import CircuitBreaker
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=5)
+
+    assert breaker.record_failure() is False
+    assert breaker.record_failure() is False
+    assert breaker.record_failure() is True
+    assert breaker.is_open
+    # 已经打开时不会重复计为一次熔断
+    assert breaker.record_failure() is False
+    assert breaker.trips == 1
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=5)
+
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.record_failure() is False
+    assert not breaker.is_open
+
+
+def test_close_resets_state():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=5)
+    breaker.record_failure()
+
+    breaker.close()
+
+    assert not breaker.is_open
+    assert breaker.failures == 0
+    assert breaker.snapshot()["state"] == "closed"
+    assert breaker.snapshot()["open_seconds"] is None
+
+
+def test_open_is_idempotent():
+    breaker = CircuitBreaker(failure_threshold=5, reset_seconds=5)
+
+    breaker.open()
+    breaker.open()
+
+    snapshot = breaker.snapshot()
+    assert snapshot["state"] == "open"
+    assert snapshot["trips"] == 1
+    assert snapshot["open_seconds"] >= 0
@@ -0,0 +1,60 @@
+"""
+HTTP 条件请求工具测试
+"""
+from datetime import datetime, timedelta, timezone
+
+from app.utils.http_cache import body_etag, http_date, is_not_modified, validator_headers
+
+ETAG = '"12-5f0a3c2b1d000"'
+LAST_MODIFIED = datetime(2024, 1, 2, 3, 4, 5, 678901)
+
+
+def test_matching_etag():
+    assert is_not_modified(ETAG, LAST_MODIFIED, ETAG, None)
+    assert is_not_modified(ETAG, LAST_MODIFIED, f'"other", W/{ETAG}', None)
+    assert is_not_modified(ETAG, LAST_MODIFIED, "*", None)
+
+
+def test_different_etag():
+    assert not is_not_modified(ETAG, LAST_MODIFIED, '"other"', None)
+
+
+def test_if_none_match_takes_precedence():
+    since = http_date(LAST_MODIFIED)
+
+    assert not is_not_modified(ETAG, LAST_MODIFIED, '"other"', since)
+
+
+def test_if_modified_since_uses_second_precision():
+    since = http_date(LAST_MODIFIED)
+
+    assert is_not_modified(ETAG, LAST_MODIFIED, None, since)
+    assert not is_not_modified(ETAG, LAST_MODIFIED + timedelta(seconds=1), None, since)
+
+
+def test_if_modified_since_with_aware_datetime():
+    aware = LAST_MODIFIED.replace(tzinfo=timezone.utc)
+
+    assert is_not_modified(ETAG, aware, None, http_date(LAST_MODIFIED))
+
+
+def test_invalid_or_missing_conditions():
+    assert not is_not_modified(ETAG, LAST_MODIFIED, None, "not a date")
+    assert not is_not_modified(ETAG, None, None, http_date(LAST_MODIFIED))
+    assert not is_not_modified(ETAG, LAST_MODIFIED, None, None)
+
+
+def test_validator_headers():
+    headers = validator_headers(ETAG, LAST_MODIFIED)
+
+    assert headers == {
+        "ETag": ETAG,
+        "Cache-Control": "no-cache",
+        "Last-Modified": "Tue, 02 Jan 2024 03:04:05 GMT",
+    }
+    assert "Last-Modified" not in validator_headers(ETAG)
+
+
+def test_body_etag_is_stable():
+    assert body_etag(b"[]") == body_etag(b"[]")
+    assert body_etag(b"[]") != body_etag(b"[1]")
@@ -0,0 +1,71 @@
+"""
+ItemCounterService 对账测试（使用 fakeredis，数据库快照由测试提供）
+"""
+import pytest
+
+from app.services.item_counter_service import (
+    COUNTER_KEY,
+    PENDING_KEYS,
+    READY_FIELD,
+    ItemCounterService,
+    bucket_field,
+    utc_naive,
+)
+from app.services.item_events import ItemChange
+
+NOW = utc_naive()
+HOUR = bucket_field("hour", NOW)
+COUNTS = {("active", True): 3, ("draft", False): 1}
+
+
+def created(item_id: int) -> ItemChange:
+    return ItemChange(item_id, new_key=("active", True), created_at=NOW)
+
+
+def snapshot(service: ItemCounterService, during=None):
+    """返回固定快照的 _snapshot，during 中的变更在读取快照之后、替换计数器之前写入"""
+
+    async def fake_snapshot():
+        if during:
+            await service.apply(during)
+        return dict(COUNTS), {HOUR: sum(COUNTS.values())}
+
+    return fake_snapshot
+
+
+@pytest.mark.asyncio
+async def test_reconcile_rebuilds_counters(redis, monkeypatch):
+    service = ItemCounterService()
+    await service.apply([created(100)])
+    monkeypatch.setattr(service, "_snapshot", snapshot(service))
+
+    assert await service.reconcile()
+
+    # 快照之前的增量已被快照覆盖，不会重复计入
+    assert await service.get_count() == 4
+    assert await service.get_count("active", True) == 3
+    assert await service.get_count("draft") == 1
+
+
+@pytest.mark.asyncio
+async def test_delta_during_reconcile_survives(redis, monkeypatch):
+    service = ItemCounterService()
+    monkeypatch.setattr(service, "_snapshot", snapshot(service, during=[created(10)]))
+
+    assert await service.reconcile()
+
+    assert await service.get_count() == 5
+    assert await service.get_count("active", True) == 4
+    stats = await service.get_stats("hour", NOW, NOW)
+    assert [row["count"] for row in stats["created"]] == [5]
+    assert not await redis.exists(*PENDING_KEYS.values())
+
+
+@pytest.mark.asyncio
+async def test_reconcile_skipped_while_locked(redis, monkeypatch):
+    service = ItemCounterService()
+    monkeypatch.setattr(service, "_snapshot", snapshot(service))
+
+    assert await service.reconcile()
+    assert not await service.reconcile()
+    assert await redis.hget(COUNTER_KEY, READY_FIELD) == "1"
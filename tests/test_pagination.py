@@ -0,0 +1,36 @@
+"""
+游标分页工具测试
+"""
+from datetime import datetime
+
+import pytest
+
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def test_round_trip():
+    created_at = datetime(2024, 1, 2, 3, 4, 5, 678901)
+
+    cursor = encode_cursor(created_at, 42, "desc")
+
+    assert decode_cursor(cursor, 3) == [created_at.isoformat(), 42, "desc"]
+    assert datetime.fromisoformat(decode_cursor(cursor, 3)[0]) == created_at
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor("??>>", 1)
+
+    assert "=" not in cursor
+    assert "+" not in cursor and "/" not in cursor
+    assert decode_cursor(cursor, 2) == ["??>>", 1]
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor!", "", "e30"])
+def test_invalid_cursor_raises(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 2)
+
+
+def test_wrong_size_raises():
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(1, 2), 3)
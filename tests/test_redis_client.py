@@ -0,0 +1,127 @@
+"""
+RedisClient 熔断与重连测试（使用 fakeredis，FakeServer.connected=False 模拟 Redis 不可用）
+"""
+import asyncio
+
+import fakeredis
+import pytest
+import pytest_asyncio
+
+from app.core.config import settings
+from app.utils.redis_client import RedisClient
+
+
+@pytest_asyncio.fixture
+async def client(server):
+    redis_client = RedisClient()
+    redis_client.breaker.failure_threshold = 3
+    redis_client._factory = lambda: fakeredis.aioredis.FakeRedis(
+        server=server, decode_responses=True
+    )
+    assert await redis_client._reconnect()
+    yield redis_client
+    server.connected = True
+    await redis_client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_cache_errors_open_breaker(client, server):
+    await client.set_cache("key", {"a": 1})
+    server.connected = False
+
+    for _ in range(3):
+        assert await client.get_cache("key") is None
+
+    assert client.breaker.is_open
+    assert not client.available
+    with pytest.raises(ConnectionError):
+        client.client
+
+
+@pytest.mark.asyncio
+async def test_guarded_counts_failures(client, server):
+    server.connected = False
+
+    for _ in range(3):
+        with pytest.raises(Exception):
+            async with client.guarded() as redis:
+                await redis.get("key")
+
+    assert client.breaker.is_open
+    # 熔断打开后立即失败，不再访问 Redis
+    with pytest.raises(ConnectionError):
+        async with client.guarded():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_guarded_success_resets_failures(client, server):
+    server.connected = False
+    with pytest.raises(Exception):
+        async with client.guarded() as redis:
+            await redis.get("key")
+    server.connected = True
+
+    async with client.guarded() as redis:
+        await redis.set("key", "1")
+
+    assert client.breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_pipeline_errors_open_breaker(client, server):
+    server.connected = False
+
+    for _ in range(3):
+        with pytest.raises(Exception):
+            async with client.pipeline() as pipe:
+                pipe.incr("counter")
+
+    assert client.breaker.is_open
+
+
+@pytest.mark.asyncio
+async def test_cache_methods_skip_redis_while_open(client):
+    client.breaker.open()
+
+    assert await client.set_cache("key", 1) is False
+    assert await client.get_cache("key") is None
+    assert await client.mget_cache(["a", "b"]) == [None, None]
+    assert await client.delete_many(["a"]) == 0
+    assert client.breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_reconnect_closes_breaker(client, server):
+    server.connected = False
+    assert not await client._reconnect()
+    assert client.breaker.is_open
+    assert client.status()["available"] is False
+
+    server.connected = True
+    assert await client._reconnect()
+
+    assert client.available
+    assert await client.set_cache("key", {"a": 1})
+    assert await client.get_cache("key") == {"a": 1}
+
+
+@pytest.mark.asyncio
+async def test_monitor_loop_recovers(client, server, monkeypatch):
+    monkeypatch.setattr(settings, "REDIS_CIRCUIT_RESET_SECONDS", 0.01)
+    server.connected = False
+    assert not await client._reconnect()
+
+    task = asyncio.create_task(client._monitor_loop())
+    try:
+        await asyncio.sleep(0.05)
+        assert client.breaker.is_open
+        server.connected = True
+        for _ in range(50):
+            if client.available:
+                break
+            await asyncio.sleep(0.01)
+        assert client.available
+        assert client.breaker.snapshot()["trips"] == 1
+    finally:
+        task.cancel()